@@ -1,12 +1,12 @@
 # app.py
 
-from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 import logging
 import time
 
 import streamlit as st
 from utils.config import APP_TITLE
+from utils.fetch_engine import run_fetch_graph
 from utils.state import init_state
 from utils.spc import (
     get_spc_location_percents_cached as get_spc_location_percents,
@@ -46,10 +46,17 @@ def _load_top_of_page_data(lat: float, lon: float, year: int) -> tuple[
     dict,
 ]:
     start_time = time.perf_counter()
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        glance_future = executor.submit(get_location_glance, lat, lon)
-        counts_future = executor.submit(get_warning_counts_bundle, year)
-        spc_future = executor.submit(get_spc_location_percents_with_status, lat, lon)
+    futures = run_fetch_graph(
+        {
+            "glance": lambda: get_location_glance(lat, lon),
+            "counts": lambda: get_warning_counts_bundle(year),
+            "spc": lambda: get_spc_location_percents_with_status(lat, lon),
+        },
+        lanes={"glance": "nws", "counts": "iem", "spc": "spc"},
+    )
+    glance_future = futures["glance"]
+    counts_future = futures["counts"]
+    spc_future = futures["spc"]
 
     try:
         temp_f, dew_f, wind_text, conditions_text = glance_future.result()
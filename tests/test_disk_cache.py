@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from utils import disk_cache
+from utils.disk_cache import DiskCacheStore
+from utils.resilience import _freeze
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Keep the background writer out of the way; tests flush explicitly.
+    monkeypatch.setattr(disk_cache, "DISK_CACHE_WRITE_DELAY_SECONDS", 60)
+    return DiskCacheStore(str(tmp_path / "cache.sqlite"), "test")
+
+
+def _corrupt(store: DiskCacheStore, key: str) -> None:
+    conn = sqlite3.connect(store.path)
+    with conn:
+        conn.execute(f"UPDATE {store.table} SET value = ? WHERE key = ?", ('{"features": [', key))
+    conn.close()
+
+
+def test_queued_writes_are_readable_and_persist_on_flush(store, tmp_path):
+    store.set("plain", {"a": [1, 2]}, ttl_seconds=60, meta={"source": "test"})
+    store.set("frozen", _freeze({"b": [3]}), ttl_seconds=60)
+    assert store.get("plain")[:2] == ({"a": [1, 2]}, {"source": "test"})
+    assert store.get("frozen")[0] == {"b": [3]}
+
+    store.flush()
+    reopened = DiskCacheStore(str(tmp_path / "cache.sqlite"), "test")
+    assert reopened.get("plain")[0] == {"a": [1, 2]}
+    assert reopened.get("frozen")[0] == {"b": [3]}
+
+
+def test_plain_values_are_snapshotted_when_queued(store):
+    value = {"status": "live"}
+    store.set("key", value, ttl_seconds=60)
+    value["status"] = "changed"
+    store.flush()
+    assert store.get("key")[0] == {"status": "live"}
+
+
+def test_corrupt_row_is_dropped_on_get(store):
+    store.set("key", {"ok": True}, ttl_seconds=60)
+    store.flush()
+    _corrupt(store, "key")
+
+    assert store.get("key") is None
+    assert store.get("key") is None
+    assert list(store.iter_live()) == []
+
+
+def test_corrupt_row_is_skipped_and_dropped_on_warm(store):
+    store.set("good", {"ok": True}, ttl_seconds=60)
+    store.set("bad", {"ok": False}, ttl_seconds=60)
+    store.flush()
+    _corrupt(store, "bad")
+
+    assert [row[0] for row in store.iter_live()] == ["good"]
+    conn = sqlite3.connect(store.path)
+    assert conn.execute(f"SELECT key FROM {store.table}").fetchall() == [("good",)]
+    conn.close()
+
+
+def test_delete_drops_queued_write(store):
+    store.set("key", {"ok": True}, ttl_seconds=60)
+    store.delete("key")
+    store.flush()
+    assert store.get("key") is None
+
+
+def test_warm_up_honours_the_disk_warm_limit(store, monkeypatch):
+    from utils import resilience
+
+    for index in range(4):
+        store.set(f"warm-limit:{index}", {"index": index}, ttl_seconds=60, meta={"source": "test"})
+    store.flush()
+    monkeypatch.setattr(disk_cache, "DISK_CACHE_WARM_LIMIT", 2)
+    monkeypatch.setattr(resilience, "_STALE_DISK_STORE", store)
+    warmed = resilience._STALE_CACHE_STATS["disk_warm_count"]
+
+    resilience._warm_stale_cache_from_disk()
+    assert resilience._STALE_CACHE_STATS["disk_warm_count"] - warmed == 2
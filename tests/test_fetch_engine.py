@@ -0,0 +1,58 @@
+import itertools
+import time
+
+import pytest
+
+from utils import fetch_engine
+
+
+_LANES = itertools.count()
+
+
+@pytest.fixture
+def single_slot_lane(monkeypatch):
+    name = f"test.lane{next(_LANES)}"
+    monkeypatch.setitem(fetch_engine.LANE_LIMITS, name, 1)
+    return name
+
+
+def _settled_metrics(lane, **expected):
+    # Lane counters are updated on the engine loop just after futures resolve.
+    deadline = time.monotonic() + 2
+    while True:
+        metrics = fetch_engine.get_executor_metrics()[lane]
+        if all(metrics[key] == value for key, value in expected.items()) or time.monotonic() > deadline:
+            return metrics
+        time.sleep(0.01)
+
+
+def test_inline_children_leave_the_lane_queue(single_slot_lane):
+    lane = single_slot_lane
+    ran = []
+
+    def parent():
+        # The parent holds the lane's only slot, so every child runs inline.
+        fetch_engine.run_fetch_graph(
+            {f"child{index}": (lambda index=index: ran.append(index)) for index in range(20)},
+            lane=lane,
+        )
+        return _settled_metrics(lane, queue_depth=0)
+
+    during = fetch_engine.run_fetch_graph({"parent": parent}, lane=lane)["parent"].result()
+    assert sorted(ran) == list(range(20))
+    assert during["queue_depth"] == 0
+    assert during["inline_runs"] == 20
+
+    after = _settled_metrics(lane, active=0, completed=1)
+    assert after["queue_depth"] == 0
+    # Only the parent went through the lane and was timed.
+    assert after["completed"] == 1
+
+
+def test_graph_tasks_go_through_the_lane(single_slot_lane):
+    futures = fetch_engine.run_fetch_graph({"a": lambda: 1, "b": lambda: 2}, lane=single_slot_lane)
+    assert {name: future.result() for name, future in futures.items()} == {"a": 1, "b": 2}
+    metrics = _settled_metrics(single_slot_lane, active=0, completed=2)
+    assert metrics["queue_depth"] == 0
+    assert metrics["completed"] == 2
+    assert metrics["inline_runs"] == 0
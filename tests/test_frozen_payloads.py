@@ -0,0 +1,135 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from utils import resilience
+from utils.resilience import FrozenDict, FrozenList, _freeze
+
+
+def _payload() -> dict:
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "MultiPolygon",
+                    "coordinates": [[[[-97.5, 35.2], [-97.1, 35.9], [-96.8, 35.1], [-97.5, 35.2]]]],
+                },
+                "properties": {"dn": 2, "label": "SLGT", "label2": "Slight Risk", "stroke": None},
+            }
+        ],
+        "bbox": (-97.5, 35.1, -96.8, 35.9),
+        "tags": {"spc"},
+    }
+
+
+def test_freeze_matches_deepcopy():
+    payload = _payload()
+    frozen = _freeze(payload)
+    assert frozen == payload
+    assert frozen == copy.deepcopy(payload)
+    assert isinstance(frozen, dict)
+    assert isinstance(frozen["features"][0]["geometry"]["coordinates"][0][0][0], list)
+
+
+def test_freeze_does_not_alias_the_loaded_value():
+    payload = _payload()
+    frozen = _freeze(payload)
+    payload["features"][0]["properties"]["dn"] = 8
+    payload["features"].append({})
+    assert frozen["features"][0]["properties"]["dn"] == 2
+    assert len(frozen["features"]) == 1
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda value: value.__setitem__("type", "Feature"),
+        lambda value: value.pop("type"),
+        lambda value: value.update(extra=1),
+        lambda value: value.setdefault("extra", 1),
+        lambda value: value.clear(),
+        lambda value: value.__delitem__("features"),
+        lambda value: value["features"].append({}),
+        lambda value: value["features"].__setitem__(0, {}),
+        lambda value: value["features"].sort(),
+        lambda value: value["features"][0]["properties"].__setitem__("dn", 8),
+        lambda value: value["features"][0]["geometry"]["coordinates"][0][0][0].__setitem__(0, 0.0),
+    ],
+)
+def test_frozen_payload_is_read_only(mutate):
+    frozen = _freeze(_payload())
+    with pytest.raises(TypeError):
+        mutate(frozen)
+    assert frozen == _payload()
+
+
+def test_in_place_operators_are_read_only():
+    frozen = _freeze({"items": [1, 2]})
+    items = frozen["items"]
+    with pytest.raises(TypeError):
+        items += [3]
+    with pytest.raises(TypeError):
+        frozen |= {"extra": 1}
+    assert frozen == {"items": [1, 2]}
+
+
+def test_json_round_trip_matches_deepcopy():
+    payload = _payload()
+    payload.pop("tags")
+    frozen = _freeze(payload)
+    assert json.dumps(frozen, sort_keys=True) == json.dumps(copy.deepcopy(payload), sort_keys=True)
+    assert json.loads(json.dumps(frozen)) == json.loads(json.dumps(payload))
+
+
+def test_copies_and_pickles_thaw_to_mutable_containers():
+    frozen = _freeze(_payload())
+    for thawed in (copy.deepcopy(frozen), pickle.loads(pickle.dumps(frozen))):
+        assert thawed == _payload()
+        assert type(thawed) is dict
+        assert type(thawed["features"]) is list
+        assert type(thawed["features"][0]["properties"]) is dict
+        thawed["features"][0]["properties"]["dn"] = 8
+    shallow = copy.copy(frozen)
+    assert type(shallow) is dict
+    shallow["type"] = "Feature"
+    assert frozen["type"] == "FeatureCollection"
+
+
+def test_freeze_is_idempotent_and_keeps_identity():
+    frozen = _freeze(_payload())
+    assert _freeze(frozen) is frozen
+    assert isinstance(frozen, FrozenDict)
+    assert isinstance(frozen["features"], FrozenList)
+    assert frozen["tags"] == frozenset({"spc"})
+
+
+def test_cached_reads_share_one_frozen_payload():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _payload()
+
+    first, status = resilience.execute_with_stale_fallback(
+        endpoint="test.frozen", source="test", cache_key="test:frozen", loader=loader, default_factory=dict
+    )
+    assert status["status"] == "live"
+
+    def failing_loader():
+        raise ValueError("upstream returned garbage")
+
+    second, status = resilience.execute_with_stale_fallback(
+        endpoint="test.frozen",
+        source="test",
+        cache_key="test:frozen",
+        loader=failing_loader,
+        default_factory=dict,
+        attempts=1,
+    )
+    assert status["status"] == "stale"
+    assert second is first
+    assert second == _payload()
@@ -0,0 +1,137 @@
+import json
+
+import numpy as np
+import pytest
+
+from utils.geojson_stream import _synthetic_layer, parse_coordinates, parse_feature_collection
+
+
+def _plain(value):
+    # Rings come back as read-only float arrays; compare them as json would decode them.
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _chunks(payload: bytes, size: int):
+    return [payload[offset : offset + size] for offset in range(0, len(payload), size)]
+
+
+SQUARE = [[-100.0, 30.0], [-90.0, 30.0], [-90.0, 40.0], [-100.0, 40.0], [-100.0, 30.0]]
+HOLE = [[-97.5, 33.25], [-93, 33.25], [-93, 37], [-97.5, 33.25]]
+
+COLLECTIONS = {
+    "polygons": {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": 1,
+                "geometry": {"type": "Polygon", "coordinates": [SQUARE, HOLE]},
+                "properties": {"dn": 4, "label": "SLGT", "label2": "Slight Risk", "fill": "#F6F67F"},
+            },
+            {
+                "type": "Feature",
+                "id": 2,
+                "geometry": {"type": "MultiPolygon", "coordinates": [[SQUARE], [HOLE, HOLE]]},
+                "properties": {"dn": 5, "label": "0.05", "label2": "5% Tornado Risk"},
+            },
+        ],
+    },
+    "escaped_and_unicode_strings": {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Polygon", "coordinates": [SQUARE]},
+                "properties": {
+                    "quote": 'a "quoted" label with \\ backslash',
+                    "brackets": "not [structure] {at} all",
+                    "fake_key": '"coordinates": [[1, 2]]',
+                    "unicode": "Tornado ⚠ Ω — 15 % — 東京",
+                    "escaped": "é☃\t\n",
+                },
+            }
+        ],
+    },
+    "nulls_points_and_3d": {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": None, "properties": {"label": None}},
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [-97.5, 35.25]}, "properties": {}},
+            {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": [[-97, 35], [-96, 36]]},
+                "properties": None,
+            },
+            {
+                "type": "Feature",
+                "geometry": {"type": "Polygon", "coordinates": [[[-97, 35, 0], [-96, 35, 1.5], [-96, 36, 2e2], [-97, 35, 0]]]},
+                "properties": {"coordinates": "a property, not geometry"},
+            },
+            {"type": "Feature", "geometry": {"type": "MultiPolygon", "coordinates": []}, "properties": {}},
+        ],
+    },
+    "empty_features": {"type": "FeatureCollection", "features": [], "exceededTransferLimit": False},
+    "members_after_features": {
+        "features": [{"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [SQUARE]}, "properties": {}}],
+        "type": "FeatureCollection",
+        "crs": {"type": "name", "properties": {"name": "EPSG:4326"}},
+    },
+    "arcgis_error": {"error": {"code": 400, "message": "Invalid or missing input parameters.", "details": []}},
+}
+
+
+STYLES = {
+    "compact": {"ensure_ascii": False},
+    "indented": {"indent": 2, "ensure_ascii": False},
+    # \uXXXX escapes instead of raw multi-byte UTF-8.
+    "ascii": {"ensure_ascii": True},
+}
+
+
+@pytest.mark.parametrize("style", sorted(STYLES))
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("name", sorted(COLLECTIONS))
+def test_matches_json_loads(name, chunk_size, style):
+    payload = json.dumps(COLLECTIONS[name], **STYLES[style]).encode("utf-8")
+    assert _plain(parse_feature_collection(_chunks(payload, chunk_size))) == json.loads(payload)
+
+
+def test_matches_json_loads_on_a_large_layer():
+    payload = _synthetic_layer(features=3, vertices=2_000)
+    assert _plain(parse_feature_collection(_chunks(payload, 1021))) == json.loads(payload)
+
+
+def test_rings_are_read_only_float_arrays():
+    payload = json.dumps(COLLECTIONS["polygons"]).encode("utf-8")
+    parsed = parse_feature_collection(_chunks(payload, 5))
+    rings = parsed["features"][0]["geometry"]["coordinates"]
+    assert [ring.shape for ring in rings] == [(5, 2), (4, 2)]
+    assert all(ring.dtype == np.float64 and not ring.flags.writeable for ring in rings)
+
+
+@pytest.mark.parametrize(
+    "coordinates",
+    [
+        [SQUARE, HOLE],
+        [[SQUARE], [HOLE, HOLE]],
+        [[[-97, 35, 0], [-96, 35, 1], [-97, 35, 0]]],
+        [[]],
+        [-97.5, 35.25],
+        [[1e-3, -2.5E+2], [3, 4]],
+    ],
+)
+def test_parse_coordinates_matches_json(coordinates):
+    text = json.dumps(coordinates)
+    assert _plain(parse_coordinates(text)) == json.loads(text)
+
+
+def test_truncated_stream_raises():
+    payload = json.dumps(COLLECTIONS["polygons"]).encode("utf-8")
+    with pytest.raises(ValueError):
+        parse_feature_collection(_chunks(payload[: len(payload) // 2], 16))
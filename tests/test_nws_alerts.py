@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from utils import nws_alerts
+
+
+@pytest.fixture
+def poller(monkeypatch):
+    monkeypatch.setattr(nws_alerts, "_fetch_severe_alert_features", lambda: ([], False))
+    poller = nws_alerts._AlertFeedPoller(interval=0.05)
+    yield poller
+    # Park the daemon thread in a long sleep while the fetch is still stubbed,
+    # so it never polls the real feed after the test.
+    poller.interval = 3600
+    time.sleep(0.1)
+
+
+def test_apply_failure_publishes_error_snapshot(monkeypatch, poller):
+    def broken_apply(features):
+        raise ValueError("bad payload")
+
+    monkeypatch.setattr(poller, "_apply", broken_apply)
+    snapshot = poller.snapshot()
+    assert snapshot.had_error
+    assert snapshot.alerts == ()
+    assert poller._thread.is_alive()
+
+
+def test_first_fetch_failure_does_not_block_other_readers(monkeypatch, poller):
+    started = threading.Event()
+
+    def failing_fetch():
+        started.set()
+        time.sleep(0.02)
+        raise RuntimeError("feed down")
+
+    monkeypatch.setattr(nws_alerts, "_fetch_severe_alert_features", failing_fetch)
+    first = threading.Thread(target=poller.snapshot)
+    first.start()
+    started.wait(1)
+    snapshot = poller.snapshot()
+    first.join(1)
+    assert snapshot.had_error
+
+
+def test_readers_stop_waiting_when_no_snapshot_arrives(poller):
+    # Another caller claimed the first fetch but never published.
+    poller._thread = threading.Thread(target=lambda: None)
+    started = time.monotonic()
+    snapshot = poller.snapshot()
+    assert time.monotonic() - started < 1
+    assert snapshot.had_error and snapshot.alerts == ()
+
+
+def test_poll_loop_survives_refresh_errors(monkeypatch, poller):
+    poller.snapshot()
+    calls = []
+
+    def flaky_refresh():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("unexpected")
+
+    monkeypatch.setattr(poller, "_refresh", flaky_refresh)
+    deadline = time.monotonic() + 2
+    while len(calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(calls) >= 2
+    assert poller._thread.is_alive()
@@ -0,0 +1,155 @@
+import functools
+import itertools
+import threading
+import time
+
+import pytest
+import requests
+
+from utils import resilience
+
+
+_ENDPOINTS = itertools.count()
+
+
+@pytest.fixture
+def endpoint() -> str:
+    # Metrics and breakers are process-wide per endpoint; keep tests apart.
+    return f"test.endpoint{next(_ENDPOINTS)}"
+
+
+def _http_error(status_code: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"HTTP {status_code}", response=response)
+
+
+def _fail_with(endpoint: str, error: Exception) -> dict:
+    def loader():
+        raise error
+
+    _value, status = resilience.execute_with_stale_fallback(
+        endpoint=endpoint,
+        source="test",
+        cache_key=None,
+        loader=loader,
+        default_factory=dict,
+        attempts=1,
+    )
+    return status
+
+
+def _metric(endpoint: str) -> dict:
+    return resilience.get_metrics_snapshot()[endpoint]
+
+
+def test_client_errors_do_not_open_breaker(endpoint):
+    for _ in range(resilience.BREAKER_FAILURE_THRESHOLD * 2):
+        status = _fail_with(endpoint, _http_error(404))
+        assert status["status"] == "unavailable"
+
+    metric = _metric(endpoint)
+    assert metric["failure_count"] == resilience.BREAKER_FAILURE_THRESHOLD * 2
+    assert metric["consecutive_failures"] == 0
+    assert metric["breaker_state"] == resilience.BREAKER_CLOSED
+    assert metric["breaker_short_circuit_count"] == 0
+
+
+def test_validator_errors_do_not_open_breaker(endpoint):
+    def reject(_value):
+        raise ValueError("unexpected payload")
+
+    for _ in range(resilience.BREAKER_FAILURE_THRESHOLD * 2):
+        resilience.execute_with_stale_fallback(
+            endpoint=endpoint,
+            source="test",
+            cache_key=None,
+            loader=lambda: {"bad": True},
+            default_factory=dict,
+            validator=reject,
+            attempts=1,
+        )
+
+    metric = _metric(endpoint)
+    assert metric["failure_count"] == resilience.BREAKER_FAILURE_THRESHOLD * 2
+    assert metric["breaker_state"] == resilience.BREAKER_CLOSED
+
+
+@pytest.mark.parametrize(
+    "error",
+    [requests.Timeout("slow"), requests.ConnectionError("refused"), _http_error(503), _http_error(429)],
+)
+def test_transient_errors_open_breaker(endpoint, error):
+    for _ in range(resilience.BREAKER_FAILURE_THRESHOLD):
+        _fail_with(endpoint, error)
+    assert _metric(endpoint)["breaker_state"] == resilience.BREAKER_OPEN
+
+    status = _fail_with(endpoint, error)
+    assert status["error_message"] == "Upstream service is paused after repeated failures."
+    assert _metric(endpoint)["breaker_short_circuit_count"] == 1
+
+
+def test_client_errors_do_not_reset_transient_streak(endpoint):
+    for _ in range(resilience.BREAKER_FAILURE_THRESHOLD - 1):
+        _fail_with(endpoint, requests.Timeout("slow"))
+    _fail_with(endpoint, _http_error(404))
+    assert _metric(endpoint)["consecutive_failures"] == resilience.BREAKER_FAILURE_THRESHOLD - 1
+
+    _fail_with(endpoint, requests.Timeout("slow"))
+    assert _metric(endpoint)["breaker_state"] == resilience.BREAKER_OPEN
+
+
+def test_refreshing_results_are_not_memoized_and_the_memo_refills(endpoint):
+    cache_key = f"test:{endpoint}"
+    resilience._cache_set(cache_key, {"version": 1}, source="test")
+    fetches = []
+
+    def loader():
+        fetches.append(None)
+        return {"version": 2}
+
+    @functools.lru_cache(maxsize=None)
+    def cached_fetch():
+        # Stands in for a st.cache_data wrapper: neither memoizes a raised call.
+        value, status = resilience.execute_with_stale_fallback(
+            endpoint=endpoint,
+            source="test",
+            cache_key=cache_key,
+            loader=loader,
+            default_factory=dict,
+            max_stale_seconds=60,
+            fresh_seconds=0.3,
+        )
+        return resilience.unless_refreshing(value, status)
+
+    time.sleep(0.35)
+    value, status = resilience.call_with_status(cached_fetch)
+    assert status["status"] == "refreshing"
+    assert value == {"version": 1}
+    assert cached_fetch.cache_info().currsize == 0
+
+    deadline = time.monotonic() + 5
+    while (not fetches or cache_key in resilience._REFRESHING) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert resilience._cache_peek(cache_key)["value"] == {"version": 2}
+
+    # The refreshed value is fresh: served live without another fetch, and memoized.
+    for _ in range(5):
+        value, status = resilience.call_with_status(cached_fetch)
+        assert status["status"] == "live"
+        assert value == {"version": 2}
+    assert cached_fetch.cache_info().currsize == 1
+    assert len(fetches) == 1
+
+
+def test_swr_windows_outlast_the_page_caches_in_front_of_them():
+    from utils import spc_outlooks
+
+    assert resilience._swr_max_stale("spc.outlook.image_probe") > spc_outlooks.CACHE_TTL_SECONDS
+    assert resilience._swr_max_stale("spc.outlook.text") > spc_outlooks.CACHE_TTL_SECONDS
+    # An expired wrapper has to find its value past the fresh window, or it
+    # would re-memoize the same value without ever revalidating it.
+    assert 0 < resilience._swr_fresh("spc.outlook.image_probe") < spc_outlooks.CACHE_TTL_SECONDS
+    # The IEM count wrappers drop the status, so they must never see "refreshing".
+    assert resilience._swr_max_stale("iem.cow.severe_ytd") == 0
+    assert resilience._swr_max_stale("iem.watchwarn.tornado_ytd") == 0
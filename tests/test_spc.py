@@ -0,0 +1,210 @@
+import pytest
+
+from utils import spc
+
+
+@pytest.fixture
+def issuance(monkeypatch):
+    polls = []
+
+    def layer_issuance(layer_id):
+        polls.append(layer_id)
+        return f"token{layer_id}"
+
+    monkeypatch.setattr(spc, "_issuance_layer_ids", lambda days: [3, 7])
+    monkeypatch.setattr(spc, "layer_issuance", layer_issuance)
+    monkeypatch.setattr(spc, "_issuance_keys", {})
+    return polls
+
+
+def test_issuance_key_is_reused_within_the_poll_interval(issuance):
+    assert spc.spc_issuance_key() == "3:token3|7:token7"
+    assert spc.spc_issuance_key() == "3:token3|7:token7"
+    assert issuance == [3, 7]
+    spc.spc_issuance_key(("Day 1",))
+    assert issuance == [3, 7, 3, 7]
+
+
+def test_issuance_key_is_rebuilt_after_the_poll_interval(monkeypatch, issuance):
+    spc.spc_issuance_key()
+    monkeypatch.setattr(spc, "SPC_ISSUANCE_POLL_SECONDS", 0)
+    spc.spc_issuance_key()
+    assert issuance == [3, 7, 3, 7]
+
+
+def test_layer_health_change_rebuilds_issuance_keys(monkeypatch, issuance):
+    monkeypatch.setattr(spc, "_layer_healthy", {})
+    monkeypatch.setattr(spc, "_layer_geojson_for_issuance", lambda layer_id, issuance: ({}, False))
+    spc.spc_issuance_key()
+    spc.layer_geojson(3)
+    spc.spc_issuance_key()
+    assert issuance == [3, 7, 3, 3, 7]
+
+
+def test_failed_download_is_not_memoized_under_the_healthy_token(monkeypatch):
+    layer_id = 9001
+    good = {"type": "FeatureCollection", "features": [{"properties": {"label": "SLGT"}, "geometry": None}]}
+    answers = [({}, "unavailable"), (good, "live")]
+    fetches = []
+
+    def get_json_with_status(url, params=None, endpoint="spc.json", **kwargs):
+        fetches.append(endpoint)
+        payload, status = answers.pop(0) if answers else (good, "live")
+        return payload, {"status": status}
+
+    monkeypatch.setattr(spc, "_get_json_with_status", get_json_with_status)
+    monkeypatch.setattr(spc, "_polled_layer", lambda layer: (0.0, "token", []))
+    monkeypatch.setattr(spc, "_layer_healthy", {})
+    spc._layer_geojson_for_issuance.clear()
+
+    assert spc.layer_geojson(layer_id) == {}
+    assert spc._layer_healthy[layer_id] is False
+    # The retry-bucket key fetches again and recovers...
+    assert spc.layer_geojson(layer_id) == good
+    assert spc._layer_healthy[layer_id] is True
+    # ...and the healthy token never replays the failed download.
+    for _ in range(3):
+        assert spc.layer_geojson(layer_id) == good
+        assert spc._layer_healthy[layer_id] is True
+    assert len(fetches) == 3
+
+
+LAYERS = {
+    "layers": [
+        {"id": 0, "name": "Day 1 Convective Outlook"},
+        {"id": 1, "name": "Day 1 Categorical Outlook"},
+        {"id": 3, "name": "Day 1 Probabilistic Tornado Outlook"},
+    ]
+}
+
+
+@pytest.fixture
+def service_info(monkeypatch):
+    calls = []
+    answers = []
+
+    def get_json_with_status(url, params=None, endpoint="spc.json", max_stale_seconds=None, **kwargs):
+        calls.append(max_stale_seconds)
+        return LAYERS, {"status": answers.pop(0) if answers else "live"}
+
+    monkeypatch.setattr(spc, "_get_json_with_status", get_json_with_status)
+    monkeypatch.setattr(spc, "SPC_CATALOG_MIN_REFRESH_SECONDS", 0)
+    return calls, answers
+
+
+def test_catalog_refresh_after_invalidate_clears_stale(service_info):
+    calls, _answers = service_info
+    catalog = spc.SpcLayerCatalog()
+    assert catalog.layer("Day 1", "probabilistic", "tornado") == 3
+    catalog.invalidate()
+    assert catalog.layer("Day 1", "probabilistic", "tornado") == 3
+    assert not catalog._stale
+    # Refreshes bypass serve-while-revalidating, so they always see the live list.
+    assert calls == [0, 0]
+    catalog.layer("Day 1", "probabilistic", "tornado")
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    ("status", "stale"),
+    [("live", False), ("refreshing", False), ("stale", True), ("unavailable", True)],
+)
+def test_catalog_stale_only_after_failed_fetch(service_info, status, stale):
+    _calls, answers = service_info
+    answers.append(status)
+    catalog = spc.SpcLayerCatalog()
+    assert catalog.layer("Day 1", "categorical") == 1
+    assert catalog._stale is stale
+
+
+@pytest.mark.parametrize(
+    ("name", "parsed"),
+    [
+        ("Day 1 Categorical Outlook", ("Day 1", "categorical", None)),
+        ("Day 1 Probabilistic Tornado Outlook", ("Day 1", "probabilistic", "tornado")),
+        ("Day 1 Significant Tornado Outlook", ("Day 1", "significant", "tornado")),
+        ("Day 2 Probabilistic Hail Outlook", ("Day 2", "probabilistic", "hail")),
+        ("Day 2 Significant Wind Outlook", ("Day 2", "significant", "wind")),
+        ("Day 3 Probabilistic Outlook", ("Day 3", "probabilistic", None)),
+        ("Day 3 Significant Severe Outlook", ("Day 3", "significant", None)),
+        ("Day 4 Probabilistic Outlook", ("Day 4", "probabilistic", None)),
+        ("Day 4-8 Probabilistic Outlook", ("Day 4-8", "probabilistic", None)),
+        # Group layers and unrelated names are not indexed.
+        ("Day 1 Convective Outlook", None),
+        ("Day 4-8 Convective Outlook", None),
+        ("Outlook Boundaries", None),
+    ],
+)
+def test_parse_layer_name_handles_spc_layer_names(name, parsed):
+    assert spc._parse_layer_name(name) == parsed
+
+
+# Attribute rows in the SPC_wx_outlks MapServer formats.
+ISSUED = {"valid": "202405061300", "expire": "202405071200", "issue": "202405061238", "idp_filedate": 1715000000000}
+CATEGORICAL = [
+    {"objectid": 1, "dn": 2, "label": "TSTM", "label2": "General Thunderstorms Risk", **ISSUED},
+    {"objectid": 2, "dn": 3, "label": "MRGL", "label2": "Marginal Risk", **ISSUED},
+    {"objectid": 3, "dn": 4, "label": "SLGT", "label2": "Slight Risk", **ISSUED},
+    {"objectid": 4, "dn": 5, "label": "ENH", "label2": "Enhanced Risk", **ISSUED},
+    {"objectid": 5, "dn": 6, "label": "MDT", "label2": "Moderate Risk", **ISSUED},
+    {"objectid": 6, "dn": 8, "label": "HIGH", "label2": "High Risk", **ISSUED},
+]
+PROBABILISTIC = [
+    {"objectid": 1, "dn": 2, "label": "0.02", "label2": "2% Tornado Risk", **ISSUED},
+    {"objectid": 2, "dn": 30, "label": "0.30", "label2": "30% Any Severe Risk", **ISSUED},
+    {"objectid": 3, "dn": 60, "label": ".60", "label2": "60% Wind Risk", **ISSUED},
+    {"objectid": 4, "dn": 15, "label": "15 %", "label2": "15% Hail Risk", **ISSUED},
+]
+SIGNIFICANT = [
+    {"objectid": 1, "dn": 1, "label": "CIG1", "label2": "Conditional Intensity Group 1", **ISSUED},
+    {"objectid": 2, "dn": 3, "label": "CIG3", "label2": "Conditional Intensity Group 3", **ISSUED},
+    {"objectid": 3, "dn": 10, "label": "SIGN", "label2": "10% Significant Tornado Risk", **ISSUED},
+]
+
+
+def test_feature_columns_read_spc_label_formats():
+    columns = spc._feature_columns(CATEGORICAL + PROBABILISTIC + SIGNIFICANT + [{}, None])
+    assert columns["rank"].tolist()[:6] == [1, 2, 3, 4, 5, 6]
+    assert columns["hazard_percent"].tolist()[6:10] == [2, 30, 60, 15]
+    assert columns["percent"].tolist()[6:10] == [2, 30, 60, 15]
+    assert columns["cig"].tolist()[10:] == [1, 3, 0, 0, 0]
+    # CIG polygons carry no probability; empty rows carry nothing.
+    assert columns["hazard_percent"].tolist()[10:12] == [-1, -1]
+    assert columns["rank"].tolist()[-2:] == [0, 0]
+    assert columns["percent"].tolist()[-2:] == [-1, -1]
+
+
+@pytest.mark.parametrize("rows", [CATEGORICAL, PROBABILISTIC, SIGNIFICANT], ids=["cat", "prob", "sig"])
+def test_feature_columns_match_per_feature_parsers(rows):
+    columns = spc._feature_columns(rows)
+    for index, props in enumerate(rows):
+        hazard_props = spc._select_fields(props, spc._HAZARD_FIELDS)
+        percent = spc._extract_percent(props)
+        hazard_percent = spc._extract_percent(hazard_props)
+        cig = spc._extract_cig(hazard_props)
+        assert columns["rank"][index] == spc._CAT_RANK.get(spc._extract_label(props).upper(), 0)
+        assert columns["percent"][index] == (-1 if percent is None else percent)
+        assert columns["hazard_percent"][index] == (-1 if hazard_percent is None else hazard_percent)
+        assert columns["cig"][index] == (int(cig[-1]) if cig else 0)
+
+
+def test_point_summary_is_not_memoized_when_the_key_changes(monkeypatch):
+    state = {"key": "K", "computed": 0}
+    degraded, good = {"d1_tor": None}, {"d1_tor": 5}
+
+    def get_spc_location_percents(lat, lon):
+        state["computed"] += 1
+        if state["key"] == "K" and state["computed"] == 1:
+            # A layer download fails mid-evaluation: its key moves to a retry bucket.
+            state["key"] = "K~1"
+            return degraded
+        state["key"] = "K"
+        return good
+
+    monkeypatch.setattr(spc, "spc_issuance_key", lambda days=None: state["key"])
+    monkeypatch.setattr(spc, "get_spc_location_percents", get_spc_location_percents)
+    spc._get_spc_location_percents_for_issuance.clear()
+
+    results = [spc.get_spc_location_percents_cached(35.25, -97.5) for _ in range(4)]
+    assert results == [degraded, good, good, good]
+    assert state["computed"] == 3
@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+from utils.spc import point_in_geometry
+from utils.spc_geometry import LayerRaster, PreparedLayer, _synthetic_outlook
+
+
+def _square(x0, y0, size):
+    return [[x0, y0], [x0 + size, y0], [x0 + size, y0 + size], [x0, y0 + size], [x0, y0]]
+
+
+HANDCRAFTED = [
+    {"geometry": {"type": "Polygon", "coordinates": [_square(-100, 30, 10)]}},
+    # Polygon with a hole, and a MultiPolygon whose second part sits in the hole.
+    {"geometry": {"type": "Polygon", "coordinates": [_square(-100, 30, 10), _square(-97, 33, 4)]}},
+    {
+        "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [[_square(-96.5, 33.5, 3)], [_square(-80, 40, 2), _square(-79.5, 40.5, 1)]],
+        }
+    },
+    # Concave (U-shaped) ring, unclosed ring and degenerate shapes.
+    {
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[-90, 30], [-84, 30], [-84, 38], [-86, 38], [-86, 32], [-88, 32], [-88, 38], [-90, 38]]],
+        }
+    },
+    {"geometry": {"type": "Polygon", "coordinates": [[[-95, 45], [-93, 45]]]}},
+    {"geometry": {"type": "Point", "coordinates": [-95, 35]}},
+    {"geometry": {"type": "MultiPolygon", "coordinates": []}},
+    {"geometry": None},
+    {},
+]
+
+
+def _reference(features, lon, lat):
+    return np.array([point_in_geometry(lon, lat, feature.get("geometry")) for feature in features], dtype=bool)
+
+
+def _points(features, count=1_200, seed=7):
+    rng = np.random.default_rng(seed)
+    lons = rng.uniform(-110, -75, count)
+    lats = rng.uniform(25, 50, count)
+    # Vertices and edge midpoints exercise the on-boundary crossing rule.
+    vertices = []
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") not in ("Polygon", "MultiPolygon"):
+            continue
+        polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+        for polygon in polygons:
+            for ring in polygon:
+                ring = np.asarray(ring, dtype=np.float64)
+                vertices.extend(ring[::37].tolist())
+                if len(ring) > 1:
+                    vertices.extend(((ring[:-1] + ring[1:]) / 2)[::53].tolist())
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    return np.concatenate([lons, vertices[:, 0]]), np.concatenate([lats, vertices[:, 1]])
+
+
+@pytest.fixture(params=["handcrafted", "outlook"])
+def features(request):
+    if request.param == "handcrafted":
+        return HANDCRAFTED
+    return _synthetic_outlook(features=6, vertices=160)["features"]
+
+
+def test_contains_matches_point_in_geometry(features):
+    layer = PreparedLayer(features)
+    lons, lats = _points(features)
+    mismatches = [
+        (lon, lat)
+        for lon, lat in zip(lons, lats)
+        if not np.array_equal(layer.contains(lon, lat), _reference(features, lon, lat))
+    ]
+    assert mismatches == []
+
+
+def test_contains_reports_hits(features):
+    # Guard against a parity test that passes because nothing is ever inside.
+    layer = PreparedLayer(features)
+    lons, lats = _points(features)
+    assert sum(layer.contains(lon, lat).any() for lon, lat in zip(lons, lats)) > 100
+
+
+def test_hole_and_part_inside_hole():
+    layer = PreparedLayer(HANDCRAFTED)
+    assert layer.contains(-95, 35).tolist()[:3] == [True, False, True]
+    assert layer.contains(-96.8, 33.2).tolist()[:3] == [True, False, False]
+
+
+def test_features_containing_returns_features():
+    layer = PreparedLayer(HANDCRAFTED)
+    assert layer.features_containing(-87, 37) == []
+    assert layer.features_containing(-89, 37) == [HANDCRAFTED[3]]
+
+
+def test_contains_many_matches_point_in_geometry(features):
+    layer = PreparedLayer(features)
+    lons, lats = _points(features)
+    expected = np.array([_reference(features, lon, lat) for lon, lat in zip(lons, lats)]).reshape(len(lons), len(features))
+    assert np.array_equal(layer.contains_many(lons, lats), expected)
+
+
+def test_contains_many_chunks_large_batches(monkeypatch, features):
+    from utils import spc_geometry
+
+    layer = PreparedLayer(features)
+    lons, lats = _points(features)
+    expected = layer.contains_many(lons, lats)
+    # Force many small chunks; answers must not depend on chunking.
+    monkeypatch.setattr(spc_geometry, "_BATCH_CELLS", 500)
+    assert np.array_equal(layer.contains_many(lons, lats), expected)
+
+
+def test_contains_many_empty_inputs():
+    layer = PreparedLayer(HANDCRAFTED)
+    assert layer.contains_many(np.array([]), np.array([])).shape == (0, len(HANDCRAFTED))
+    assert PreparedLayer([]).contains_many(np.array([-95.0]), np.array([35.0])).shape == (1, 0)
+
+
+def _raster(features, resolution=0.25):
+    layer = PreparedLayer(features)
+    return layer, LayerRaster(layer, {"level": list(range(1, len(features) + 1))}, resolution=resolution)
+
+
+def test_raster_matches_contains_away_from_boundaries(features):
+    layer, raster = _raster(features)
+    lons, lats = np.meshgrid(raster.col_x, raster.row_y)
+    inside = layer.contains_many(lons.ravel(), lats.ravel())
+    expected = (inside * np.arange(1, len(features) + 1)).max(axis=1, initial=0).reshape(raster.rows, raster.cols)
+    interior = ~raster.boundary
+    assert interior.any()
+    assert np.array_equal(raster.grids["level"][interior], expected[interior])
+
+
+def test_raster_does_not_depend_on_batching(monkeypatch, features):
+    from utils import spc_geometry
+
+    _, raster = _raster(features)
+    monkeypatch.setattr(spc_geometry, "_BATCH_CELLS", 300)
+    _, batched = _raster(features)
+    assert np.array_equal(batched.grids["level"], raster.grids["level"])
+    assert np.array_equal(batched.boundary, raster.boundary)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Optional second tier for in-process caches. Empty disables it, so a plain
+# deploy keeps today's memory-only behaviour.
+DISK_CACHE_PATH = os.getenv("STALE_CACHE_DISK_PATH", "").strip()
+DISK_CACHE_WARM_LIMIT = int(os.getenv("STALE_CACHE_DISK_WARM_LIMIT", "512"))
+# Writes are queued and flushed by a background thread in one transaction per
+# batch; this is how long the writer waits for more writes to join a batch.
+DISK_CACHE_WRITE_DELAY_SECONDS = float(os.getenv("STALE_CACHE_DISK_WRITE_DELAY_SECONDS", "0.5"))
+
+
+def _is_frozen(value: Any) -> bool:
+    # Imported lazily: resilience builds on this module.
+    from utils.resilience import FrozenDict, FrozenList
+
+    return isinstance(value, (FrozenDict, FrozenList))
+
+
+def _encode_array(value: Any) -> Any:
+    # NumPy coordinate arrays from streamed GeoJSON round-trip as plain lists.
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class DiskCacheStore:
+    """SQLite-backed key/value store with per-entry expiry, one table per namespace.
+
+    Values are stored as JSON; payloads that cannot be encoded are skipped and
+    rows that no longer decode are dropped. set() only queues the entry: a
+    background writer flushes queued entries in one transaction per batch, so
+    request threads never wait on SQLite and a crash mid-write never leaves a
+    partial entry behind. Reads see queued entries before they reach disk.
+    """
+
+    def __init__(self, path: str, namespace: str) -> None:
+        self.path = path
+        self.table = "cache_" + "".join(ch if ch.isalnum() else "_" for ch in namespace)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        # key -> (value, encoded or None, meta, stored_at, expires_at); frozen
+        # cache payloads are immutable, so their encoding waits for the writer.
+        self._pending: dict[str, tuple[Any, str | None, dict[str, Any], float, float]] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer: threading.Thread | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, meta TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> tuple[Any, dict[str, Any], float, float] | None:
+        """Return (value, meta, stored_at, expires_at) for a live entry, or None."""
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            value, encoded, meta, stored_at, expires_at = pending
+            if expires_at <= time.time():
+                return None
+            return (json.loads(encoded) if encoded is not None else value), dict(meta), stored_at, expires_at
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    f"SELECT value, meta, stored_at, expires_at FROM {self.table} WHERE key = ?",
+                    (key,),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            LOGGER.warning("disk_cache_read_failed table=%s error=%s", self.table, exc)
+            return None
+        if row is None or row[3] <= time.time():
+            return None
+        try:
+            return json.loads(row[0]), json.loads(row[1]), row[2], row[3]
+        except ValueError as exc:
+            LOGGER.warning("disk_cache_corrupt_row table=%s error=%s", self.table, exc)
+            self._delete_row(key)
+            return None
+
+    @staticmethod
+    def _encode(value: Any) -> str | None:
+        try:
+            return json.dumps(value, separators=(",", ":"), default=_encode_array)
+        except (TypeError, ValueError):
+            return None
+
+    def set(self, key: str, value: Any, *, ttl_seconds: float, meta: dict[str, Any] | None = None) -> None:
+        encoded = None
+        if not _is_frozen(value):
+            # Callers may keep mutating a plain value, so snapshot it now.
+            encoded = self._encode(value)
+            if encoded is None:
+                return
+        now = time.time()
+        with self._pending_lock:
+            self._pending[key] = (value, encoded, dict(meta or {}), now, now + max(ttl_seconds, 1))
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name=f"disk-cache-{self.table}", daemon=True
+                )
+                self._writer.start()
+        self._wake.set()
+
+    def _write_loop(self) -> None:
+        while True:
+            self._wake.wait()
+            time.sleep(DISK_CACHE_WRITE_DELAY_SECONDS)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every queued entry now, in one transaction."""
+        with self._pending_lock:
+            batch = list(self._pending.items())
+        if not batch:
+            return
+        rows = []
+        for key, (value, encoded, meta, stored_at, expires_at) in batch:
+            encoded = encoded if encoded is not None else self._encode(value)
+            if encoded is not None:
+                rows.append((key, encoded, json.dumps(meta), stored_at, expires_at))
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {self.table} (key, value, meta, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+        except sqlite3.Error as exc:
+            LOGGER.warning("disk_cache_write_failed table=%s error=%s", self.table, exc)
+        finally:
+            with self._pending_lock:
+                for key, entry in batch:
+                    # Keep entries that were replaced while this batch was written.
+                    if self._pending.get(key) is entry:
+                        del self._pending[key]
+
+    def delete(self, key: str) -> None:
+        with self._pending_lock:
+            self._pending.pop(key, None)
+        self._delete_row(key)
+
+    def _delete_row(self, key: str) -> None:
+        try:
+            with self._lock:
+                self._connect().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        except sqlite3.Error as exc:
+            LOGGER.warning("disk_cache_delete_failed table=%s error=%s", self.table, exc)
+
+    def iter_live(self, limit: int | None = None) -> Iterator[tuple[str, Any, dict[str, Any], float, float]]:
+        """Yield (key, value, meta, stored_at, expires_at), newest first, dropping expired and corrupt rows.
+
+        At most ``limit`` rows, STALE_CACHE_DISK_WARM_LIMIT by default.
+        """
+        if limit is None:
+            limit = DISK_CACHE_WARM_LIMIT
+        self.flush()
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+                rows = conn.execute(
+                    f"SELECT key, value, meta, stored_at, expires_at FROM {self.table} ORDER BY stored_at DESC LIMIT ?",
+                    (limit,),
+                ).fetchall()
+        except sqlite3.Error as exc:
+            LOGGER.warning("disk_cache_warm_failed table=%s error=%s", self.table, exc)
+            return
+        for key, value, meta, stored_at, expires_at in rows:
+            try:
+                decoded = json.loads(value), json.loads(meta)
+            except ValueError as exc:
+                LOGGER.warning("disk_cache_corrupt_row table=%s error=%s", self.table, exc)
+                self._delete_row(key)
+                continue
+            yield key, decoded[0], decoded[1], stored_at, expires_at
+
+
+def get_disk_store(namespace: str) -> DiskCacheStore | None:
+    if not DISK_CACHE_PATH:
+        return None
+    store = DiskCacheStore(DISK_CACHE_PATH, namespace)
+    # Queued writes would otherwise be lost on a clean shutdown.
+    atexit.register(store.flush)
+    return store
@@ -5,13 +5,14 @@ import logging
 import os
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import Any, Callable
 
+from utils.disk_cache import get_disk_store
+from utils.fetch_engine import run_fetch_graph
 from utils.nws import HEADERS as NWS_HEADERS
 from utils.nws import get_nws_point_properties
-from utils.nws_alerts import _parse_dt
+from utils.nws_alerts import _parse_dt, alerts_at_point, get_alert_snapshot
 from utils.resilience import request_json
 from utils.spc import get_day1_location_risk_summary, get_spc_location_percents_cached
 
@@ -27,10 +28,16 @@ DEFAULT_SOURCE_TTLS = {
 }
 REQUEST_TIMEOUT_SECONDS = int(os.getenv("EXTERNAL_CONTEXT_TIMEOUT_SECONDS", "12"))
 MAX_ALERT_ITEMS = int(os.getenv("EXTERNAL_CONTEXT_MAX_ALERT_ITEMS", "5"))
+# "point" asks api.weather.gov (?point=) and covers every alert type (flood,
+# winter, heat, ...). "local" answers from the in-memory national feed without
+# a request, but that feed only carries tornado and severe thunderstorm
+# watches and warnings, so it is opt-in.
+ALERTS_SOURCE = os.getenv("EXTERNAL_CONTEXT_ALERTS_SOURCE", "point").strip().lower()
 MAX_FORECAST_PERIODS = int(os.getenv("EXTERNAL_CONTEXT_MAX_FORECAST_PERIODS", "3"))
 
 _CACHE_LOCK = threading.Lock()
 _CACHE: dict[str, tuple[float, Any]] = {}
+_DISK_STORE = get_disk_store("external_context")
 
 
 def _utc_now_iso() -> str:
@@ -103,21 +110,41 @@ def _get_cached(key: str) -> Any | None:
     now = time.time()
     with _CACHE_LOCK:
         entry = _CACHE.get(key)
-        if entry is None:
-            return None
-        expires_at, value = entry
-        if expires_at <= now:
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                return value
             _CACHE.pop(key, None)
-            return None
-        return value
+
+    disk_entry = _DISK_STORE.get(key) if _DISK_STORE is not None else None
+    if disk_entry is None:
+        return None
+    value, _meta, _stored_at, expires_at = disk_entry
+    with _CACHE_LOCK:
+        _CACHE[key] = (expires_at, value)
+    return value
 
 
 def _set_cached(key: str, value: Any, ttl_seconds: int) -> Any:
+    expires_at = time.time() + max(ttl_seconds, 1)
     with _CACHE_LOCK:
-        _CACHE[key] = (time.time() + max(ttl_seconds, 1), value)
+        _CACHE[key] = (expires_at, value)
+    if _DISK_STORE is not None:
+        _DISK_STORE.set(key, value, ttl_seconds=max(ttl_seconds, 1))
     return value
 
 
+def _warm_cache_from_disk() -> None:
+    if _DISK_STORE is None:
+        return
+    with _CACHE_LOCK:
+        for key, value, _meta, _stored_at, expires_at in _DISK_STORE.iter_live():
+            _CACHE.setdefault(key, (expires_at, value))
+
+
+_warm_cache_from_disk()
+
+
 def _remember(source_name: str, lat: float | None, lon: float | None, ttl_seconds: int, builder: Callable[[], dict[str, Any]], extra: dict[str, Any] | None = None) -> dict[str, Any]:
     key = _cache_key(source_name, lat, lon, extra)
     cached = _get_cached(key)
@@ -156,13 +183,30 @@ def _failure_payload(source_name: str, error: Exception, *, caveat: str) -> dict
     }
 
 
+def _local_alert_features(lat: float, lon: float) -> list[dict[str, Any]]:
+    # Shape feed alerts like ?point= features so both sources share one builder.
+    features = []
+    for alert in alerts_at_point(lat, lon):
+        props = dict(alert)
+        ends = props.pop("ends_dt", None)
+        props["ends"] = ends.isoformat() if ends else None
+        props.pop("geometry", None)
+        features.append({"properties": props})
+    return features
+
+
 def get_nws_alert_context(lat: float, lon: float) -> dict[str, Any]:
+    local = ALERTS_SOURCE == "local" and not get_alert_snapshot().had_error
+
     def _build() -> dict[str, Any]:
-        payload = _request_json(
-            "https://api.weather.gov/alerts/active",
-            params={"point": f"{lat:.4f},{lon:.4f}"},
-        )
-        features = payload.get("features") or []
+        if local:
+            features = _local_alert_features(lat, lon)
+        else:
+            payload = _request_json(
+                "https://api.weather.gov/alerts/active",
+                params={"point": f"{lat:.4f},{lon:.4f}"},
+            )
+            features = payload.get("features") or []
         features = sorted(
             features,
             key=lambda feature: (
@@ -203,14 +247,24 @@ def get_nws_alert_context(lat: float, lon: float) -> dict[str, Any]:
             if latest_timestamp:
                 break
 
-        if alerts:
-            top_events = ", ".join(f"{name} ({count})" for name, count in sorted(counts_by_event.items()))
+        top_events = ", ".join(f"{name} ({count})" for name, count in sorted(counts_by_event.items()))
+        if local and alerts:
+            summary = (
+                f"Active tornado or severe thunderstorm watches and warnings covering the selected point: "
+                f"{len(alerts)} ({top_events}). Other alert types were not checked."
+            )
+        elif local:
+            summary = (
+                "No active tornado or severe thunderstorm watches or warnings cover the selected point. "
+                "Other alert types (flood, winter, heat, marine) were not checked."
+            )
+        elif alerts:
             summary = f"{len(alerts)} active NWS alerts near the selected point. Top alert types: {top_events}."
         else:
             summary = "No active NWS alerts were returned for the selected point."
 
         return {
-            "source": "NOAA/NWS api.weather.gov alerts",
+            "source": "NOAA/NWS national severe alert feed" if local else "NOAA/NWS api.weather.gov alerts",
             "loaded": True,
             "timestamp": latest_timestamp or _utc_now_iso(),
             "key_values": {
@@ -222,10 +276,19 @@ def get_nws_alert_context(lat: float, lon: float) -> dict[str, Any]:
             "caveats": [
                 "Alerts are filtered to the selected point and can change between assistant turns.",
                 "A quiet alert response does not replace official warning reception methods.",
-            ],
+            ]
+            + (
+                ["Only tornado and severe thunderstorm watches and warnings from the national feed are checked."]
+                if local
+                else []
+            ),
         }
 
     try:
+        if local:
+            # The feed is already in memory and refreshed by its poller; caching
+            # the lookup would only delay new warnings.
+            return {**_build(), "cache_status": "local"}
         return _remember("alerts", lat, lon, DEFAULT_SOURCE_TTLS["alerts"], _build)
     except Exception as exc:
         LOGGER.warning("External alerts context failed lat=%s lon=%s error=%s", lat, lon, exc)
@@ -619,26 +682,24 @@ def get_external_weather_context(lat: float | None, lon: float | None, session_s
     loaded_sources: list[str] = []
     failed_sources: list[str] = []
 
-    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
-        futures = {executor.submit(task): name for name, task in tasks.items()}
-        for future in as_completed(futures):
-            section_name = futures[future]
-            try:
-                section = future.result()
-                results[section_name] = section
-                if section.get("loaded"):
-                    loaded_sources.append(section_name)
-                else:
-                    failed_sources.append(section_name)
-            except Exception as exc:
+    futures = run_fetch_graph(tasks, lane="nws", lanes={"external_spc": "spc"})
+    for section_name, future in futures.items():
+        try:
+            section = future.result()
+            results[section_name] = section
+            if section.get("loaded"):
+                loaded_sources.append(section_name)
+            else:
                 failed_sources.append(section_name)
-                source_label = section_name.replace("external_", "").replace("_", " ")
-                results[section_name] = _failure_payload(
-                    source_label,
-                    exc,
-                    caveat="The assistant should continue using the remaining external sources and internal site context.",
-                )
-                LOGGER.warning("External context source failed: %s error=%s", section_name, exc)
+        except Exception as exc:
+            failed_sources.append(section_name)
+            source_label = section_name.replace("external_", "").replace("_", " ")
+            results[section_name] = _failure_payload(
+                source_label,
+                exc,
+                caveat="The assistant should continue using the remaining external sources and internal site context.",
+            )
+            LOGGER.warning("External context source failed: %s error=%s", section_name, exc)
 
     LOGGER.info(
         "External context pipeline completed loaded=%s failed=%s location=%s",
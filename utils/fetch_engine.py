@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Mapping
+
+from utils.resilience import probe_url, request_json, request_text
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Blocking callables hold a pool thread for the whole upstream round trip, so
+# the pool must not be a tighter limit than the lanes. 0 (the default) sizes it
+# to the lane limits when the engine starts, with a floor of 32.
+MAX_BLOCKING_WORKERS = int(os.getenv("FETCH_ENGINE_MAX_WORKERS", "0"))
+DEFAULT_LANE = "default"
+DEFAULT_LANE_LIMITS = {
+    "default": 8,
+    "nws": 8,
+    "spc": 8,
+    "iem": 2,
+}
+
+
+def _parse_lane_limits(raw: str) -> dict[str, int]:
+    limits = dict(DEFAULT_LANE_LIMITS)
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip().isdigit():
+            limits[name.strip()] = max(int(value.strip()), 1)
+    return limits
+
+
+LANE_LIMITS = _parse_lane_limits(os.getenv("FETCH_ENGINE_LANE_LIMITS", ""))
+
+_ENGINE_LOCK = threading.Lock()
+_LOOP: asyncio.AbstractEventLoop | None = None
+_BLOCKING_POOL: ThreadPoolExecutor | None = None
+_WORKER_STATE = threading.local()
+
+_LANES_LOCK = threading.Lock()
+_LANES: dict[str, "_Lane"] = {}
+
+
+class _Lane:
+    """Concurrency limit and queue/wait accounting for one named upstream lane."""
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.inline_runs = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        dispatched = self.completed + self.active
+        return {
+            "limit": self.limit,
+            "queue_depth": self.queued,
+            "active": self.active,
+            "completed": self.completed,
+            "inline_runs": self.inline_runs,
+            "avg_wait_ms": round(self.total_wait_ms / dispatched, 1) if dispatched else None,
+            "max_wait_ms": round(self.max_wait_ms, 1),
+        }
+
+
+class _GraphTask:
+    """One node of a fetch graph; runs exactly once, on whichever thread claims it first."""
+
+    def __init__(self, name: str, fn: Callable[[], Any], lane: str) -> None:
+        self.name = name
+        self.fn = fn
+        self.lane = lane
+        self.future: Future = Future()
+        self._claim_lock = threading.Lock()
+        self._claimed = False
+
+    @property
+    def claimed(self) -> bool:
+        return self._claimed
+
+    def _claim(self) -> bool:
+        with self._claim_lock:
+            if self._claimed:
+                return False
+            self._claimed = True
+            return self.future.set_running_or_notify_cancel()
+
+    def run(self) -> bool:
+        if not self._claim():
+            return False
+        previous = getattr(_WORKER_STATE, "lane", None)
+        _WORKER_STATE.lane = self.lane
+        try:
+            self.future.set_result(self.fn())
+        except BaseException as exc:
+            self.future.set_exception(exc)
+        finally:
+            _WORKER_STATE.lane = previous
+        return True
+
+    async def run_async(self) -> None:
+        if not self._claim():
+            return
+        try:
+            self.future.set_result(await self.fn())
+        except BaseException as exc:
+            self.future.set_exception(exc)
+
+
+def _get_loop() -> tuple[asyncio.AbstractEventLoop, ThreadPoolExecutor]:
+    global _LOOP, _BLOCKING_POOL
+    with _ENGINE_LOCK:
+        if _LOOP is None or _LOOP.is_closed() or _BLOCKING_POOL is None:
+            loop = asyncio.new_event_loop()
+            workers = MAX_BLOCKING_WORKERS or max(32, sum(LANE_LIMITS.values()))
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch-engine")
+            loop.set_default_executor(pool)
+            threading.Thread(target=loop.run_forever, name="fetch-engine-loop", daemon=True).start()
+            _LOOP, _BLOCKING_POOL = loop, pool
+        return _LOOP, _BLOCKING_POOL
+
+
+def _get_lane(name: str) -> _Lane:
+    # Lanes are only created from coroutines running on the engine loop, so
+    # their asyncio semaphores are bound to that loop.
+    with _LANES_LOCK:
+        lane = _LANES.get(name)
+        if lane is None:
+            lane = _Lane(name, LANE_LIMITS.get(name, LANE_LIMITS[DEFAULT_LANE]))
+            _LANES[name] = lane
+        return lane
+
+
+def get_executor_metrics() -> dict[str, dict[str, Any]]:
+    with _LANES_LOCK:
+        return {name: lane.snapshot() for name, lane in _LANES.items()}
+
+
+# The *_async mirrors are executor offload, not async I/O: each call still
+# runs the blocking requests client and holds one pool thread until the
+# response arrives. They let coroutine tasks await the resilience API; they do
+# not make fetches cheaper than blocking callables, so graphs keep using those.
+async def _run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+async def request_json_async(**kwargs: Any) -> tuple[Any, dict[str, Any]]:
+    return await _run_blocking(request_json, **kwargs)
+
+
+async def request_text_async(**kwargs: Any) -> tuple[str, dict[str, Any]]:
+    return await _run_blocking(request_text, **kwargs)
+
+
+async def probe_url_async(**kwargs: Any) -> tuple[bool, dict[str, Any]]:
+    return await _run_blocking(probe_url, **kwargs)
+
+
+async def _dispatch(task: _GraphTask) -> None:
+    if task.claimed:
+        return
+    lane = _get_lane(task.lane)
+    enqueued_at = time.perf_counter()
+    lane.queued += 1
+    # A nested caller may run the task inline while it waits for the lane; stop
+    # waiting as soon as its future resolves so it leaves the queue at once and
+    # adds no wait sample.
+    acquire = asyncio.ensure_future(lane.semaphore.acquire())
+    try:
+        await asyncio.wait({acquire, asyncio.wrap_future(task.future)}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        lane.queued -= 1
+        if not acquire.done():
+            acquire.cancel()
+    if acquire.cancelled() or not acquire.done():
+        return
+    try:
+        if task.claimed:
+            return
+        wait_ms = (time.perf_counter() - enqueued_at) * 1000
+        lane.total_wait_ms += wait_ms
+        lane.max_wait_ms = max(lane.max_wait_ms, wait_ms)
+        lane.active += 1
+        try:
+            if asyncio.iscoroutinefunction(task.fn):
+                await task.run_async()
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, task.run)
+        finally:
+            lane.active -= 1
+            lane.completed += 1
+    finally:
+        lane.semaphore.release()
+
+
+async def _drive_graph(tasks: list[_GraphTask]) -> None:
+    await asyncio.gather(*(_dispatch(task) for task in tasks), return_exceptions=True)
+
+
+def _is_engine_worker() -> bool:
+    return getattr(_WORKER_STATE, "lane", None) is not None
+
+
+def submit(fn: Callable[[], Any], *, lane: str = DEFAULT_LANE) -> Future:
+    """Queue one callable on the shared executor service without waiting for it."""
+    task = _GraphTask(getattr(fn, "__name__", "task"), fn, lane)
+    loop, _pool = _get_loop()
+    asyncio.run_coroutine_threadsafe(_drive_graph([task]), loop)
+    return task.future
+
+
+def run_fetch_graph(
+    tasks: Mapping[str, Callable[[], Any]],
+    *,
+    lane: str = DEFAULT_LANE,
+    lanes: Mapping[str, str] | None = None,
+) -> dict[str, Future]:
+    """Run a page's independent fetches concurrently on the shared event loop.
+
+    Each task is queued on a named lane (``lanes`` overrides ``lane`` per task)
+    so upstreams get a bounded number of concurrent requests. Blocking callables
+    run on the engine's long-lived worker pool and coroutine functions are
+    awaited on the loop. The call returns once every task has finished,
+    mirroring the old ``with ThreadPoolExecutor()`` blocks, and each returned
+    future is already resolved.
+    """
+    lanes = lanes or {}
+    graph = [_GraphTask(name, fn, lanes.get(name, lane)) for name, fn in tasks.items()]
+    if not graph:
+        return {}
+
+    loop, _pool = _get_loop()
+    asyncio.run_coroutine_threadsafe(_drive_graph(graph), loop)
+
+    # A graph submitted from inside another graph task would otherwise hold a
+    # worker while its children wait for one. The nested caller runs any child
+    # the lanes have not started yet, so a saturated pool or lane cannot deadlock.
+    if _is_engine_worker():
+        for task in graph:
+            if not asyncio.iscoroutinefunction(task.fn) and task.run():
+                with _LANES_LOCK:
+                    inline_lane = _LANES.get(task.lane)
+                    if inline_lane is not None:
+                        inline_lane.inline_runs += 1
+
+    wait([task.future for task in graph])
+    return {task.name: task.future for task in graph}
+
+
+def benchmark(
+    sessions: tuple[int, ...] = (1, 10, 50),
+    *,
+    fetches: int = 9,
+    latency_seconds: float = 0.2,
+    repeat: int = 3,
+) -> dict[int, dict[str, dict[str, float]]]:
+    """
+    Compare per-render thread pools against the shared engine for concurrent sessions.
+
+    Each session renders one page: a graph of ``fetches`` calls that each wait
+    ``latency_seconds`` (stand-ins for upstream round trips, so no network is
+    used). "threads" is the old ``with ThreadPoolExecutor()`` block per render,
+    "engine" is run_fetch_graph with blocking callables (how the pages fetch),
+    "engine_offload" awaits the fetch through the executor like
+    request_json_async, and "engine_native" awaits a real coroutine with no
+    worker thread, the ceiling an async HTTP client could reach. Reports the
+    best wall time for all sessions to finish and how many distinct threads ran
+    fetches. Run it in a fresh process: the pool is sized when the engine starts.
+    """
+
+    fetch_threads: set[threading.Thread] = set()
+
+    def blocking_fetch() -> None:
+        fetch_threads.add(threading.current_thread())
+        time.sleep(latency_seconds)
+
+    async def offload_fetch() -> None:
+        await _run_blocking(blocking_fetch)
+
+    async def native_fetch() -> None:
+        fetch_threads.add(threading.current_thread())
+        await asyncio.sleep(latency_seconds)
+
+    def render_threads() -> None:
+        with ThreadPoolExecutor(max_workers=fetches) as executor:
+            for future in [executor.submit(blocking_fetch) for _ in range(fetches)]:
+                future.result()
+
+    def render_engine() -> None:
+        run_fetch_graph({f"fetch{index}": blocking_fetch for index in range(fetches)}, lane="benchmark")
+
+    def render_engine_offload() -> None:
+        run_fetch_graph({f"fetch{index}": offload_fetch for index in range(fetches)}, lane="benchmark")
+
+    def render_engine_native() -> None:
+        run_fetch_graph({f"fetch{index}": native_fetch for index in range(fetches)}, lane="benchmark")
+
+    renders = {
+        "threads": render_threads,
+        "engine": render_engine,
+        "engine_offload": render_engine_offload,
+        "engine_native": render_engine_native,
+    }
+    # The benchmark lane is unthrottled so the engine is measured, not the lane limit.
+    LANE_LIMITS["benchmark"] = fetches * max(sessions)
+
+    results: dict[int, dict[str, dict[str, float]]] = {}
+    for session_count in sessions:
+        results[session_count] = {}
+        for name, render in renders.items():
+            best = float("inf")
+            fetch_threads.clear()
+            for _ in range(repeat):
+                users = [threading.Thread(target=render) for _ in range(session_count)]
+                started = time.perf_counter()
+                for user in users:
+                    user.start()
+                for user in users:
+                    user.join()
+                best = min(best, time.perf_counter() - started)
+            # Distinct threads that ran a fetch across all repeats.
+            results[session_count][name] = {"seconds": best, "fetch_threads": len(fetch_threads)}
+    return results
+
+
+if __name__ == "__main__":
+    # python -m utils.fetch_engine
+    for session_count, by_engine in benchmark().items():
+        for label, stats in by_engine.items():
+            print(
+                f"{session_count:>3} sessions {label:>14}: {stats['seconds'] * 1000:8.1f} ms"
+                f"  fetch threads {stats['fetch_threads']:>5}"
+            )
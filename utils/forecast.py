@@ -11,7 +11,8 @@ import streamlit as st
 from utils.ai_context import update_page_ai_context
 
 from utils.nws import get_nws_point_properties
-from utils.resilience import request_json
+from utils.resilience import call_with_status, request_json, unless_refreshing
+from utils.ui import summarize_freshness
 
 HEADERS = {
     "User-Agent": "Antonio Severe Dashboard (contact: mcelfreshantonio@ou.edu)",
@@ -20,8 +21,8 @@ HEADERS = {
 
 
 @st.cache_data(ttl=900, show_spinner=False)
-def _get_json(url: str, timeout: int = 20) -> dict[str, Any]:
-    payload, _status = request_json(
+def _get_json_with_status(url: str, timeout: int = 20) -> tuple[dict[str, Any], dict[str, Any]]:
+    payload, status = request_json(
         url=url,
         headers=HEADERS,
         timeout=min(timeout, 8),
@@ -30,11 +31,19 @@ def _get_json(url: str, timeout: int = 20) -> dict[str, Any]:
         cache_key=f"nws:forecast:{url}",
         validator=lambda value: value if isinstance(value, dict) else {},
     )
-    return payload
+    return unless_refreshing(payload, status)
+
+
+def _least_fresh(statuses: list[dict[str, Any]]) -> dict[str, Any]:
+    for state in ("unavailable", "stale", "refreshing"):
+        for status in statuses:
+            if status.get("status") == state:
+                return status
+    return statuses[0]
 
 
 @st.cache_data(ttl=900, show_spinner=False)
-def get_location_forecast(lat: float, lon: float) -> dict[str, list[dict[str, Any]]]:
+def get_location_forecast_with_status(lat: float, lon: float) -> tuple[dict[str, list[dict[str, Any]]], dict[str, Any]]:
     props = get_nws_point_properties(lat, lon)
 
     forecast_url = props.get("forecast")
@@ -43,13 +52,19 @@ def get_location_forecast(lat: float, lon: float) -> dict[str, list[dict[str, An
     if not forecast_url or not hourly_url:
         raise ValueError("Forecast endpoints were unavailable for this location.")
 
-    forecast = _get_json(forecast_url)
-    hourly = _get_json(hourly_url)
+    forecast, forecast_status = call_with_status(_get_json_with_status, forecast_url)
+    hourly, hourly_status = call_with_status(_get_json_with_status, hourly_url)
 
-    return {
+    payload = {
         "daily_periods": ((forecast.get("properties") or {}).get("periods") or []),
         "hourly_periods": ((hourly.get("properties") or {}).get("periods") or []),
     }
+    return unless_refreshing(payload, _least_fresh([forecast_status, hourly_status]))
+
+
+def get_location_forecast(lat: float, lon: float) -> dict[str, list[dict[str, Any]]]:
+    forecast, _status = call_with_status(get_location_forecast_with_status, lat, lon)
+    return forecast
 
 
 def _parse_time(value: str | None) -> datetime | None:
@@ -794,7 +809,7 @@ def render() -> None:
     lon = float(st.session_state.lon)
 
     try:
-        forecast = get_location_forecast(lat, lon)
+        forecast, forecast_status = call_with_status(get_location_forecast_with_status, lat, lon)
     except Exception:
         st.warning("The location forecast could not be loaded right now. Please try again in a moment.")
         return
@@ -814,6 +829,8 @@ def render() -> None:
         selected_forecast_hour=None,
     )
 
+    if forecast_status.get("status") in {"refreshing", "stale"}:
+        st.caption(summarize_freshness(forecast_status, fallback="Forecast freshness unavailable."))
     _render_hourly(hourly_periods)
     st.markdown("<div style='height: 0.35rem;'></div>", unsafe_allow_html=True)
     _render_daily(daily_periods)
@@ -0,0 +1,264 @@
+# utils/geojson_stream.py
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Iterable
+
+import numpy as np
+
+
+_FEATURES_KEY_RE = re.compile(r'"features"\s*:\s*\[')
+_SEPARATOR_RE = re.compile(r"[\s,]*")
+# "coordinates" keys (followed by an array), strings ("closed" is missing when
+# the chunk ends mid-string) and structural brackets.
+_TOKEN_RE = re.compile(
+    r'(?P<coords>"coordinates"\s*:\s*(?=\[))|(?P<string>"(?:[^"\\]|\\.)*(?P<closed>")?)|[{}\[\]]'
+)
+_PENDING_KEY_RE = re.compile(r"\s*:?\s*\Z")
+# A coordinates array only ever holds numbers, commas, brackets and whitespace.
+_NUMERIC_RUN_RE = re.compile(r"[\[\]0-9\s,.eE+\-]*")
+_RING_RE = re.compile(r"\[((?:\[\])*)\]")
+_POLYGON_RE = re.compile(r"\[((?:\[(?:\[\])*\])*)\]")
+_FIRST_POINT_RE = re.compile(r"\[([^\[\]]*)\]")
+_BRACKETS_ONLY = {ord(ch): None for ch in "0123456789.eE+-, \t\r\n"}
+_NUMBERS_ONLY = {ord("["): " ", ord("]"): " ", ord(","): " "}
+
+
+def _ring_arrays(text: str, ring_points: list[int]) -> list[np.ndarray] | None:
+    total = sum(ring_points)
+    if total == 0:
+        return [np.empty((0, 2), dtype=np.float64) for _ in ring_points]
+    try:
+        values = np.fromstring(text.translate(_NUMBERS_ONLY), dtype=np.float64, sep=" ")
+    except ValueError:
+        return None
+    first = _FIRST_POINT_RE.search(text)
+    dims = first.group(1).count(",") + 1 if first else 0
+    if dims < 2 or values.size != total * dims:
+        return None
+    points = values.reshape(total, dims)
+    points.flags.writeable = False
+    return np.split(points, np.cumsum(ring_points)[:-1])
+
+
+def parse_coordinates(text: str) -> Any:
+    """
+    Parse a GeoJSON coordinates array, returning each ring as an (N, 2+) float64 array.
+
+    Polygon coordinates become a list of rings and MultiPolygon coordinates a
+    list of polygons (lists of rings); read-only array views replace the usual
+    list of [lon, lat] lists. Other geometry types are small and go through json.
+    """
+    skeleton = text.translate(_BRACKETS_ONLY)
+    depth = len(skeleton) - len(skeleton.lstrip("["))
+    if depth == 3:
+        ring_points = [len(ring) // 2 for ring in _RING_RE.findall(skeleton[1:-1])]
+        rings = _ring_arrays(text, ring_points)
+        if rings is not None:
+            return rings
+    elif depth == 4:
+        polygons = _POLYGON_RE.findall(skeleton[1:-1])
+        ring_points = [[len(ring) // 2 for ring in _RING_RE.findall(polygon)] for polygon in polygons]
+        rings = _ring_arrays(text, [count for counts in ring_points for count in counts])
+        if rings is not None:
+            nested = []
+            offset = 0
+            for counts in ring_points:
+                nested.append(rings[offset : offset + len(counts)])
+                offset += len(counts)
+            return nested
+    return json.loads(text)
+
+
+class FeatureCollectionParser:
+    """
+    Incremental parser for a GeoJSON FeatureCollection.
+
+    Text is fed in chunks; each feature is decoded as soon as its closing brace
+    arrives and its text is dropped, so only one feature's text is buffered at a
+    time. Coordinates never go through json: the numeric run is sliced out and
+    handed to parse_coordinates. Everything outside the "features" array
+    (including ArcGIS error bodies) is decoded with json at the end.
+    """
+
+    def __init__(self) -> None:
+        self.features: list[dict] = []
+        self._buf = ""
+        self._state = "head"
+        self._head = ""
+        self._tail = ""
+        self._reset_feature()
+
+    def _reset_feature(self) -> None:
+        self._pos = 0
+        self._depth = 0
+        self._coords: list[tuple[int, int]] = []
+        self._coords_start: int | None = None
+
+    def feed(self, text: str) -> None:
+        if self._state == "tail":
+            self._tail += text
+            return
+        self._buf += text
+        self._drain()
+
+    def _drain(self) -> None:
+        while True:
+            if self._state == "head":
+                match = _FEATURES_KEY_RE.search(self._buf)
+                if match is None:
+                    return
+                self._head = self._buf[: match.end() - 1]
+                self._buf = self._buf[match.end() :]
+                self._state = "between"
+            if self._state == "between":
+                start = _SEPARATOR_RE.match(self._buf).end()
+                if start == len(self._buf):
+                    self._buf = ""
+                    return
+                if self._buf[start] == "]":
+                    self._tail = self._buf[start + 1 :]
+                    self._buf = ""
+                    self._state = "tail"
+                    return
+                self._buf = self._buf[start:]
+                self._reset_feature()
+                self._state = "feature"
+            if self._state == "feature":
+                end = self._scan_feature()
+                if end is None:
+                    return
+                self.features.append(self._decode_feature(end))
+                self._buf = self._buf[end:]
+                self._state = "between"
+            if self._state == "tail":
+                return
+
+    def _scan_feature(self) -> int | None:
+        buf = self._buf
+        while True:
+            if self._coords_start is not None:
+                run_end = _NUMERIC_RUN_RE.match(buf, self._pos).end()
+                if run_end == len(buf):
+                    self._pos = run_end
+                    return None
+                coords_end = buf.rindex("]", self._coords_start, run_end) + 1
+                self._coords.append((self._coords_start, coords_end))
+                self._coords_start = None
+                self._pos = coords_end
+            match = _TOKEN_RE.search(buf, self._pos)
+            if match is None:
+                self._pos = len(buf)
+                return None
+            if match.group("coords") is not None:
+                # The array itself is scanned as a numeric run, not token by token.
+                self._coords_start = self._pos = match.end()
+                continue
+            if match.group("string") is not None:
+                incomplete = match.group("closed") is None or (
+                    match.group() == '"coordinates"' and _PENDING_KEY_RE.match(buf, match.end()) is not None
+                )
+                if incomplete:
+                    self._pos = match.start()
+                    return None
+                self._pos = match.end()
+                continue
+            self._pos = match.end()
+            self._depth += 1 if match.group() in "{[" else -1
+            if self._depth == 0:
+                return match.end()
+
+    def _decode_feature(self, end: int) -> dict:
+        text = self._buf[:end]
+        if len(self._coords) != 1:
+            return json.loads(text)
+        start, stop = self._coords[0]
+        feature = json.loads(text[:start] + "null" + text[stop:])
+        geometry = feature.get("geometry") if isinstance(feature, dict) else None
+        if not isinstance(geometry, dict) or "coordinates" not in geometry:
+            return json.loads(text)
+        geometry["coordinates"] = parse_coordinates(text[start:stop])
+        return feature
+
+    def close(self) -> Any:
+        """Finish the stream and return the decoded collection."""
+        if self._state == "head":
+            return json.loads(self._buf)
+        if self._state != "tail":
+            raise ValueError("GeoJSON stream ended inside the features array.")
+        collection = json.loads(self._head + "[]" + self._tail)
+        if isinstance(collection, dict):
+            collection["features"] = self.features
+        return collection
+
+
+def parse_feature_collection(chunks: Iterable[bytes]) -> Any:
+    """Decode a UTF-8 GeoJSON FeatureCollection from an iterable of byte chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parser = FeatureCollectionParser()
+    for chunk in chunks:
+        if chunk:
+            parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b"", final=True))
+    return parser.close()
+
+
+def _synthetic_layer(features: int = 8, vertices: int = 40_000) -> bytes:
+    # Outbreak-day sized layer: a handful of features with long jagged rings.
+    rng = np.random.default_rng(0)
+    collection = {"type": "FeatureCollection", "features": []}
+    for index in range(features):
+        angles = np.linspace(0, 2 * np.pi, vertices)
+        radius = 4 + rng.random(vertices)
+        ring = np.round(np.column_stack((-97 + radius * np.cos(angles), 37 + radius * np.sin(angles))), 6)
+        collection["features"].append(
+            {
+                "type": "Feature",
+                "geometry": {"type": "MultiPolygon", "coordinates": [[ring.tolist()]]},
+                "properties": {"dn": index, "label": "SLGT", "label2": "Slight Risk"},
+            }
+        )
+    return json.dumps(collection).encode("utf-8")
+
+
+def benchmark(payload: bytes, chunk_bytes: int = 256 * 1024, repeat: int = 3) -> dict[str, dict[str, float]]:
+    """Compare json.loads against parse_feature_collection: best wall time and peak traced memory."""
+    import time
+    import tracemalloc
+
+    chunks = [payload[offset : offset + chunk_bytes] for offset in range(0, len(payload), chunk_bytes)]
+    candidates = {
+        "json.loads": lambda: json.loads(b"".join(chunks)),
+        "parse_feature_collection": lambda: parse_feature_collection(chunks),
+    }
+    results: dict[str, dict[str, float]] = {}
+    for name, parse in candidates.items():
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            parse()
+            best = min(best, time.perf_counter() - started)
+        tracemalloc.start()
+        parsed = parse()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del parsed
+        results[name] = {"seconds": best, "peak_mb": peak / 1e6}
+    return results
+
+
+if __name__ == "__main__":
+    # python -m utils.geojson_stream [saved_layer.geojson]
+    import sys
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as handle:
+            sample = handle.read()
+    else:
+        sample = _synthetic_layer()
+    print(f"payload: {len(sample) / 1e6:.1f} MB")
+    for label, stats in benchmark(sample).items():
+        print(f"{label:>26}: {stats['seconds'] * 1000:8.1f} ms  peak {stats['peak_mb']:7.1f} MB")
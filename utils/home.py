@@ -1,18 +1,17 @@
-from concurrent.futures import ThreadPoolExecutor
 import html
 
 import streamlit as st
 
+from utils.fetch_engine import run_fetch_graph
 from utils.severe_thunderstorm_warning_counter import fetch_svr_warning_count_ytd
 from utils.spc import get_day1_location_risk_summary
 from utils.spc_outlooks import (
+    get_day1_3_categorical_image_with_status,
     get_day1_3_detail_payload,
-    get_day1_categorical_image_url,
-    get_day2_categorical_image_url,
-    get_day3_categorical_image_url,
-    get_day4_8_prob_image_url,
+    get_day4_8_prob_image_with_status,
 )
 from utils.tornado_warning_counter import fetch_tor_warning_count_ytd
+from utils.ui import summarize_freshness
 
 
 @st.cache_data(ttl=900)
@@ -711,49 +710,56 @@ def render(get_spc_location_percents):
     lat = float(st.session_state.lat)
     lon = float(st.session_state.lon)
 
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        image_futures = {
-            "day1": executor.submit(get_day1_categorical_image_url),
-            "day2": executor.submit(get_day2_categorical_image_url),
-            "day3": executor.submit(get_day3_categorical_image_url),
-            "day4": executor.submit(get_day4_8_prob_image_url, 4),
-            "day5": executor.submit(get_day4_8_prob_image_url, 5),
-            "day6": executor.submit(get_day4_8_prob_image_url, 6),
-            "day7": executor.submit(get_day4_8_prob_image_url, 7),
-            "day8": executor.submit(get_day4_8_prob_image_url, 8),
-            "location": executor.submit(get_spc_location_percents, lat, lon),
-        }
+    image_futures = run_fetch_graph(
+        {
+            "day1": lambda: get_day1_3_categorical_image_with_status(1),
+            "day2": lambda: get_day1_3_categorical_image_with_status(2),
+            "day3": lambda: get_day1_3_categorical_image_with_status(3),
+            "day4": lambda: get_day4_8_prob_image_with_status(4),
+            "day5": lambda: get_day4_8_prob_image_with_status(5),
+            "day6": lambda: get_day4_8_prob_image_with_status(6),
+            "day7": lambda: get_day4_8_prob_image_with_status(7),
+            "day8": lambda: get_day4_8_prob_image_with_status(8),
+            "location": lambda: get_spc_location_percents(lat, lon),
+        },
+        lane="spc",
+    )
     def _future_or_default(name: str, default):
         try:
             return image_futures[name].result()
         except Exception:
             return default
 
+    def _image_with_note(name: str, note: str) -> dict:
+        # Swap the card's standing note for the freshness text while the image
+        # check is served from cache (background refresh or upstream failure).
+        image_url, status = _future_or_default(name, (None, None))
+        if status and status.get("status") in {"refreshing", "stale"}:
+            note = summarize_freshness(status, fallback=note)
+        return {"image_url": image_url, "status_note": note}
+
     nums = _future_or_default("location", {})
 
     primary_cards = [
         {
             "title": "Day 1 Categorical",
             "subtitle": "Current-day severe thunderstorm risk areas and categorical highlights.",
-            "image_url": _future_or_default("day1", None),
             "warning_text": "Could not load the latest SPC Day 1 categorical outlook image.",
-            "status_note": "SPC imagery may be delayed during upstream outages.",
+            **_image_with_note("day1", "SPC imagery may be delayed during upstream outages."),
             "detail_day": 1,
         },
         {
             "title": "Day 2 Categorical",
             "subtitle": "Tomorrow's organized severe potential with updated corridor placement.",
-            "image_url": _future_or_default("day2", None),
             "warning_text": "Could not load the latest SPC Day 2 categorical outlook image.",
-            "status_note": "Last successful image is used when the live image check fails.",
+            **_image_with_note("day2", "Last successful image is used when the live image check fails."),
             "detail_day": 2,
         },
         {
             "title": "Day 3 Categorical",
             "subtitle": "Short-range extended outlook for evolving severe weather setup confidence.",
-            "image_url": _future_or_default("day3", None),
             "warning_text": "Could not load the latest SPC Day 3 categorical outlook image.",
-            "status_note": "Source imagery updates on SPC's schedule and may lag brief outages.",
+            **_image_with_note("day3", "Source imagery updates on SPC's schedule and may lag brief outages."),
             "detail_day": 3,
         },
     ]
@@ -770,37 +776,32 @@ def render(get_spc_location_percents):
         {
             "title": "Day 4 Probability",
             "subtitle": "Longer-range probability guidance for emerging severe risk.",
-            "image_url": _future_or_default("day4", None),
             "warning_text": "Could not load the SPC Day 4 probability outlook image.",
-            "status_note": "Experimental long-range imagery can be unavailable between SPC updates.",
+            **_image_with_note("day4", "Experimental long-range imagery can be unavailable between SPC updates."),
         },
         {
             "title": "Day 5 Probability",
             "subtitle": "Early look at possible severe corridors and broad pattern support.",
-            "image_url": _future_or_default("day5", None),
             "warning_text": "Could not load the SPC Day 5 probability outlook image.",
-            "status_note": "Experimental long-range imagery can be unavailable between SPC updates.",
+            **_image_with_note("day5", "Experimental long-range imagery can be unavailable between SPC updates."),
         },
         {
             "title": "Day 6 Probability",
             "subtitle": "Experimental probabilistic signal as forecast spread begins to widen.",
-            "image_url": _future_or_default("day6", None),
             "warning_text": "Could not load the SPC Day 6 probability outlook image.",
-            "status_note": "Experimental long-range imagery can be unavailable between SPC updates.",
+            **_image_with_note("day6", "Experimental long-range imagery can be unavailable between SPC updates."),
         },
         {
             "title": "Day 7 Probability",
             "subtitle": "Farthest-range SPC outlook in this view, best used for trend awareness.",
-            "image_url": _future_or_default("day7", None),
             "warning_text": "Could not load the SPC Day 7 probability outlook image.",
-            "status_note": "Experimental long-range imagery can be unavailable between SPC updates.",
+            **_image_with_note("day7", "Experimental long-range imagery can be unavailable between SPC updates."),
         },
         {
             "title": "Day 8 Probability",
             "subtitle": "Final long-range SPC probability panel for broad severe pattern awareness.",
-            "image_url": _future_or_default("day8", None),
             "warning_text": "Could not load the SPC Day 8 probability outlook image.",
-            "status_note": "Experimental long-range imagery can be unavailable between SPC updates.",
+            **_image_with_note("day8", "Experimental long-range imagery can be unavailable between SPC updates."),
         },
     ]
     _render_outlook_group(
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 import streamlit as st
-from utils.resilience import request_json
+from utils.resilience import call_with_status, request_json, unless_refreshing
 
 
 HEADERS = {
@@ -23,6 +23,7 @@ def _validate_point_payload(payload: Any) -> dict[str, Any]:
 
 @st.cache_data(ttl=1800, show_spinner=False)
 def get_nws_point_properties_with_status(lat: float, lon: float, timeout: int = 8) -> tuple[dict[str, Any], dict[str, Any]]:
+    # Raises RefreshingResult for stale-while-revalidate results; use call_with_status.
     properties, status = request_json(
         url=f"https://api.weather.gov/points/{lat:.4f},{lon:.4f}",
         headers=HEADERS,
@@ -32,10 +33,9 @@ def get_nws_point_properties_with_status(lat: float, lon: float, timeout: int =
         cache_key=f"nws:points:{lat:.4f}:{lon:.4f}",
         validator=_validate_point_payload,
     )
-    return properties, status
+    return unless_refreshing(properties, status)
 
 
-@st.cache_data(ttl=1800, show_spinner=False)
 def get_nws_point_properties(lat: float, lon: float, timeout: int = 8) -> dict[str, Any]:
-    properties, _status = get_nws_point_properties_with_status(lat, lon, timeout=timeout)
+    properties, _status = call_with_status(get_nws_point_properties_with_status, lat, lon, timeout=timeout)
     return properties
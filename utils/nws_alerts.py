@@ -1,14 +1,34 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import streamlit as st
-from utils.resilience import request_json
+from utils.resilience import FrozenDict, request_json
+from utils.spc_geometry import PreparedLayer
+
+LOGGER = logging.getLogger(__name__)
 
 NWS_ALERTS_URL = "https://api.weather.gov/alerts/active"
 CHICAGO_TZ = ZoneInfo("America/Chicago")
+# One process-wide thread refreshes the national feed on this cadence; every
+# session reads the published snapshot instead of fetching.
+ALERT_POLL_SECONDS = float(os.getenv("NWS_ALERT_POLL_SECONDS", "60"))
+ALERT_FETCH_TIMEOUT = (3, 6)
+# Number of per-poll deltas kept for get_alert_changes().
+ALERT_DELTA_HISTORY = int(os.getenv("NWS_ALERT_DELTA_HISTORY", "64"))
+# Ask api.weather.gov for only the severe event types (event=, status=actual)
+# instead of every active alert in the country (nws.alerts.severe). Set to 0
+# to fetch the full feed (nws.alerts.active). Read once at import, so a process
+# only ever fetches one of the two endpoints.
+ALERT_SERVER_FILTER = os.getenv("NWS_ALERT_SERVER_FILTER", "1").strip().lower() not in {"0", "false", "no"}
 
 SEVERE_EVENTS = {
     "Tornado Warning",
@@ -65,8 +85,10 @@ def _build_display_text(event: str, area_desc: str, ends_dt: Optional[datetime])
     return f"{event_txt} - {area_txt} - {tail} {time_txt}"
 
 
-def _parse_features(features: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
+def _severe_alert_props(
+    features: List[Dict[str, Any]],
+) -> Iterator[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """Yield (alert_id, properties, geometry) for Actual severe alerts, first occurrence of each id."""
     seen_ids: set[str] = set()
 
     for feat in features:
@@ -85,25 +107,50 @@ def _parse_features(features: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if alert_id:
             seen_ids.add(alert_id)
 
-        area_desc = str(props.get("areaDesc") or "").strip()
-        end_raw = (
-            str(props.get("ends") or "").strip()
-            or str(props.get("expires") or "").strip()
-        )
-        ends_dt = _parse_dt(end_raw)
+        yield alert_id, props, (feat or {}).get("geometry")
 
-        results.append(
-            {
-                "event": event,
-                "areaDesc": area_desc,
-                "ends": ends_dt,
-                "ends_dt": ends_dt,
-                "id": alert_id,
-                "display_text": _build_display_text(event, area_desc, ends_dt),
-            }
-        )
 
-    return results
+# CAP text fields kept verbatim so point lookups can answer like ?point= queries.
+_ALERT_DETAIL_FIELDS = ("headline", "severity", "urgency", "certainty", "onset", "effective", "expires", "description")
+
+
+def _alert_fingerprint(props: Dict[str, Any]) -> Tuple[str, ...]:
+    # Display fields plus "sent": NWS reissues changed alerts under new ids,
+    # and an in-place correction always carries a new sent time.
+    return (
+        str(props.get("event") or "").strip(),
+        str(props.get("areaDesc") or "").strip(),
+        str(props.get("ends") or "").strip() or str(props.get("expires") or "").strip(),
+        str(props.get("sent") or ""),
+    )
+
+
+def _alert_ugc_codes(props: Dict[str, Any]) -> Tuple[str, ...]:
+    codes = ((props.get("geocode") or {}).get("UGC") or []) if isinstance(props.get("geocode"), dict) else []
+    if not codes:
+        codes = [str(zone).rstrip("/").rsplit("/", 1)[-1] for zone in props.get("affectedZones") or []]
+    return tuple(sorted({str(code).upper() for code in codes if code}))
+
+
+def _parse_alert(alert_id: str, props: Dict[str, Any], geometry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    event, area_desc, end_raw, _sent = _alert_fingerprint(props)
+    ends_dt = _parse_dt(end_raw)
+    alert = {
+        "event": event,
+        "areaDesc": area_desc,
+        "ends": ends_dt,
+        "ends_dt": ends_dt,
+        "id": alert_id,
+        "display_text": _build_display_text(event, area_desc, ends_dt),
+        "ugc": _alert_ugc_codes(props),
+        "geometry": geometry if isinstance(geometry, dict) and geometry.get("coordinates") else None,
+    }
+    alert.update({field: props.get(field) for field in _ALERT_DETAIL_FIELDS})
+    return alert
+
+
+def _parse_features(features: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [_parse_alert(*item) for item in _severe_alert_props(features)]
 
 
 def _mock_snapshot(seed_time: datetime, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -284,8 +331,8 @@ def get_severe_alerts(source: str, mode: str) -> List[Dict[str, Any]]:
     return fetch_us_severe_alerts()
 
 
-def fetch_us_severe_alerts(timeout: Tuple[int, int] = (3, 6)) -> List[Dict[str, Any]]:
-    """Fetch active nationwide severe watch/warning alerts.
+def _fetch_severe_alert_features() -> Tuple[List[Dict[str, Any]], bool]:
+    """Fetch active nationwide severe watch/warning features; returns (features, had_error).
 
     Keeps only exact event matches:
     - Tornado Warning
@@ -293,33 +340,294 @@ def fetch_us_severe_alerts(timeout: Tuple[int, int] = (3, 6)) -> List[Dict[str,
     - Tornado Watch
     - Severe Thunderstorm Watch
     """
+    if ALERT_SERVER_FILTER:
+        # api.weather.gov has no field projection, so filtering rows is the
+        # whole saving; _parse_features still re-checks event and status.
+        params = {"event": ",".join(sorted(SEVERE_EVENTS)), "status": "actual"}
+        endpoint, cache_key = "nws.alerts.severe", "nws:alerts:severe"
+    else:
+        params = None
+        endpoint, cache_key = "nws.alerts.active", "nws:alerts:active"
     data, status = request_json(
         url=NWS_ALERTS_URL,
         headers=HEADERS,
-        timeout=timeout,
-        endpoint="nws.alerts.active",
+        params=params,
+        timeout=ALERT_FETCH_TIMEOUT,
+        endpoint=endpoint,
         source="NOAA/NWS alerts",
-        cache_key="nws:alerts:active",
+        cache_key=cache_key,
         validator=lambda payload: payload if isinstance(payload, dict) else {},
     )
-    if status.get("status") == "unavailable":
-        return []
-    features = data.get("features", []) or []
+    return data.get("features", []) or [], status.get("status") == "unavailable"
+
 
-    return _parse_features(features)
+class AlertSpatialIndex:
+    """Point lookups over one alert snapshot.
+
+    Alerts with a polygon (storm-based warnings) match points inside it; alerts
+    without one (most watches) match through their UGC zone codes, compared
+    against the county and forecast zone of the queried point.
+    """
+
+    def __init__(self, alerts: Tuple[FrozenDict, ...], *, version: int = 0) -> None:
+        self.alerts = alerts
+        self.version = version
+        polygon_alerts = [index for index, alert in enumerate(alerts) if alert.get("geometry")]
+        self._polygon_alerts = np.asarray(polygon_alerts, dtype=np.int64)
+        self._polygons = PreparedLayer({"geometry": alerts[index]["geometry"]} for index in polygon_alerts)
+        self._by_zone: Dict[str, List[int]] = {}
+        for index, alert in enumerate(alerts):
+            if alert.get("geometry"):
+                continue
+            for code in alert.get("ugc") or ():
+                self._by_zone.setdefault(code, []).append(index)
+
+    @property
+    def has_zone_alerts(self) -> bool:
+        """True when some alert can only be matched by zone (callers then need point zones)."""
+        return bool(self._by_zone)
+
+    def _matches(self, inside: np.ndarray, zones: Iterable[str]) -> List[FrozenDict]:
+        matched = set(self._polygon_alerts[inside].tolist())
+        for code in zones:
+            matched.update(self._by_zone.get(str(code).upper(), ()))
+        return [self.alerts[index] for index in sorted(matched)]
+
+    def at_point(self, lat: float, lon: float, zones: Iterable[str] = ()) -> List[FrozenDict]:
+        """Alerts covering (lat, lon); ``zones`` are the point's UGC codes."""
+        return self._matches(self._polygons.contains(lon, lat), zones)
+
+    def at_points(
+        self,
+        points: Sequence[Tuple[float, float]],
+        zones: Optional[Sequence[Iterable[str]]] = None,
+    ) -> List[List[FrozenDict]]:
+        """at_point for many (lat, lon) points in one vectorized polygon pass."""
+        lats = np.array([float(lat) for lat, _lon in points], dtype=np.float64)
+        lons = np.array([float(lon) for _lat, lon in points], dtype=np.float64)
+        inside = self._polygons.contains_many(lons, lats)
+        zones = zones if zones is not None else [()] * len(points)
+        return [self._matches(inside[row], zones[row]) for row in range(len(points))]
+
+
+class AlertSnapshot(NamedTuple):
+    """Immutable view of the national severe-alert feed as of one poll."""
+
+    version: int
+    alerts: Tuple[FrozenDict, ...]
+    had_error: bool
+    fetched_at: Optional[datetime]
+
+
+class AlertDelta(NamedTuple):
+    """What changed between snapshot ``version - 1`` and ``version``."""
+
+    version: int
+    added: Tuple[FrozenDict, ...]
+    updated: Tuple[FrozenDict, ...]
+    expired: Tuple[FrozenDict, ...]
+
+
+class _AlertFeedPoller:
+    """Background thread that owns the national alert feed.
+
+    The first reader fetches synchronously and starts the thread; after that
+    readers only take the current snapshot. Each poll is applied to an index
+    keyed by NWS alert id: only new or changed alerts are re-parsed, and the
+    resulting added/updated/expired delta is kept for get_alert_changes().
+    ``version`` changes only when the alert list or the error state does. A
+    failed poll keeps the index and previous alerts (flagged by had_error) so
+    recovery does not replay every alert as new.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._snapshot: Optional[AlertSnapshot] = None
+        self._thread: Optional[threading.Thread] = None
+        self._index: Dict[str, Tuple[Tuple[str, ...], FrozenDict]] = {}
+        self._spatial: Optional[AlertSpatialIndex] = None
+        self._deltas: Deque[AlertDelta] = deque(maxlen=ALERT_DELTA_HISTORY)
+
+    def _apply(
+        self, features: List[Dict[str, Any]]
+    ) -> Tuple[Tuple[FrozenDict, ...], List[FrozenDict], List[FrozenDict], List[FrozenDict]]:
+        index: Dict[str, Tuple[Tuple[str, ...], FrozenDict]] = {}
+        alerts: List[FrozenDict] = []
+        added: List[FrozenDict] = []
+        updated: List[FrozenDict] = []
+        for alert_id, props, geometry in _severe_alert_props(features):
+            fingerprint = _alert_fingerprint(props)
+            # Alerts without an id are keyed by content, so a change shows up
+            # as expired + added.
+            key = alert_id or f"~{fingerprint}"
+            if key in index:
+                continue
+            known = self._index.get(key)
+            if known is not None and known[0] == fingerprint:
+                alert = known[1]
+            else:
+                alert = FrozenDict(_parse_alert(alert_id, props, geometry))
+                (added if known is None else updated).append(alert)
+            index[key] = (fingerprint, alert)
+            alerts.append(alert)
+        expired = [alert for key, (_fingerprint, alert) in self._index.items() if key not in index]
+        self._index = index
+        return tuple(alerts), added, updated, expired
+
+    def _refresh(self) -> None:
+        with self._refresh_lock:
+            try:
+                features, had_error = _fetch_severe_alert_features()
+            except Exception as exc:
+                LOGGER.warning("nws_alert_poll_failed error=%s", exc)
+                features, had_error = [], True
+            try:
+                self._publish(features, had_error)
+            except Exception:
+                # A payload the index cannot apply still has to produce a
+                # snapshot, or first readers would wait on nothing.
+                LOGGER.exception("nws_alert_apply_failed")
+                self._publish([], True)
+
+    def _publish(self, features: List[Dict[str, Any]], had_error: bool) -> None:
+        previous = self._snapshot
+        if had_error:
+            alerts = previous.alerts if previous is not None else ()
+            added, updated, expired = [], [], []
+        else:
+            alerts, added, updated, expired = self._apply(features)
+        changed = previous is None or bool(added or updated or expired) or previous.had_error != had_error
+        with self._lock:
+            version = (previous.version if previous is not None else 0) + int(changed)
+            if changed:
+                self._deltas.append(AlertDelta(version, tuple(added), tuple(updated), tuple(expired)))
+            self._snapshot = AlertSnapshot(version, alerts, had_error, datetime.now(timezone.utc))
+            self._changed.notify_all()
+
+    def spatial_index(self) -> AlertSpatialIndex:
+        snapshot = self.snapshot()
+        spatial = self._spatial
+        if spatial is None or spatial.version != snapshot.version:
+            alerts = () if snapshot.had_error else snapshot.alerts
+            spatial = AlertSpatialIndex(alerts, version=snapshot.version)
+            self._spatial = spatial
+        return spatial
+
+    def changes_since(self, version: int) -> Optional[List[AlertDelta]]:
+        with self._lock:
+            current = self._snapshot.version if self._snapshot is not None else 0
+            if version >= current:
+                return []
+            if not self._deltas or self._deltas[0].version > version + 1:
+                return None
+            return [delta for delta in self._deltas if delta.version > version]
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self._refresh()
+            except Exception:
+                LOGGER.exception("nws_alert_poller_failed")
+
+    def snapshot(self) -> AlertSnapshot:
+        if self._snapshot is None:
+            with self._lock:
+                first = self._snapshot is None and self._thread is None
+                if first:
+                    self._thread = threading.Thread(target=self._run, name="nws-alert-poller", daemon=True)
+            if first:
+                try:
+                    self._refresh()
+                finally:
+                    self._thread.start()
+            else:
+                with self._lock:
+                    # Bounded: if the first fetch never publishes, report the
+                    # feed as unavailable rather than block the page.
+                    if self._snapshot is None:
+                        self._changed.wait_for(lambda: self._snapshot is not None, timeout=self.interval)
+                    if self._snapshot is None:
+                        return AlertSnapshot(0, (), True, None)
+        return self._snapshot
+
+
+_POLLER = _AlertFeedPoller(ALERT_POLL_SECONDS)
+
+
+def get_alert_snapshot() -> AlertSnapshot:
+    """Current national severe-alert snapshot, maintained by the background poller."""
+    return _POLLER.snapshot()
+
+
+def get_alert_changes(since_version: int) -> Optional[List[AlertDelta]]:
+    """Deltas after ``since_version``, oldest first.
+
+    Returns [] when nothing changed and None when ``since_version`` is older
+    than the kept history, in which case the caller should resync from
+    get_alert_snapshot().
+    """
+    get_alert_snapshot()
+    return _POLLER.changes_since(since_version)
+
+
+def fetch_us_severe_alerts() -> List[Dict[str, Any]]:
+    """Active nationwide severe watches/warnings from the in-memory feed snapshot."""
+    snapshot = get_alert_snapshot()
+    return [] if snapshot.had_error else list(snapshot.alerts)
 
 
-@st.cache_data(ttl=90, show_spinner=False)
 def get_cached_severe_alerts_payload() -> Tuple[List[Dict[str, Any]], bool]:
     """Return (alerts, had_error)."""
-    data, status = request_json(
-        url=NWS_ALERTS_URL,
-        headers=HEADERS,
-        timeout=(3, 6),
-        endpoint="nws.alerts.active.cached",
-        source="NOAA/NWS alerts",
-        cache_key="nws:alerts:active:cached",
-        validator=lambda payload: payload if isinstance(payload, dict) else {},
-    )
-    features = data.get("features", []) or []
-    return _parse_features(features), status.get("status") == "unavailable"
+    snapshot = get_alert_snapshot()
+    return ([] if snapshot.had_error else list(snapshot.alerts)), snapshot.had_error
+
+
+def _point_zones(lat: float, lon: float) -> Tuple[str, ...]:
+    # UGC county and forecast zone of a point; /points is cached for 30 minutes,
+    # so repeat lookups for the same place stay off the network.
+    from utils.nws import get_nws_point_properties
+
+    properties = get_nws_point_properties(round(float(lat), 4), round(float(lon), 4)) or {}
+    zones = [properties.get("county"), properties.get("forecastZone")]
+    return tuple(str(zone).rstrip("/").rsplit("/", 1)[-1].upper() for zone in zones if zone)
+
+
+def alerts_at_point(lat: float, lon: float) -> List[Dict[str, Any]]:
+    """Active severe alerts covering (lat, lon), answered from the in-memory feed."""
+    index = _POLLER.spatial_index()
+    zones = _point_zones(lat, lon) if index.has_zone_alerts else ()
+    return list(index.at_point(lat, lon, zones))
+
+
+def alerts_at_points(
+    points: Mapping[str, Tuple[float, float]] | Iterable[Tuple[float, float]],
+) -> Dict[Any, List[Dict[str, Any]]] | List[List[Dict[str, Any]]]:
+    """
+    Active severe alerts for many points against one feed snapshot.
+
+    A mapping such as CITY_PRESETS returns {name: alerts}; an iterable of
+    (lat, lon) pairs returns a list in the same order. Polygon matches run in
+    one vectorized pass; the zone lookups for watches fan out on the nws lane.
+    """
+    from utils.fetch_engine import run_fetch_graph
+
+    names = list(points) if isinstance(points, Mapping) else None
+    coords = [tuple(points[name]) for name in names] if names is not None else [tuple(point) for point in points]
+    index = _POLLER.spatial_index()
+    zones: List[Tuple[str, ...]] = [()] * len(coords)
+    if index.has_zone_alerts and coords:
+        futures = run_fetch_graph(
+            {str(row): (lambda lat=lat, lon=lon: _point_zones(lat, lon)) for row, (lat, lon) in enumerate(coords)},
+            lane="nws",
+        )
+        for row in range(len(coords)):
+            try:
+                zones[row] = futures[str(row)].result()
+            except Exception as exc:
+                LOGGER.warning("Zone lookup failed for %s: %s", coords[row], exc)
+    matches = [list(alerts) for alerts in index.at_points(coords, zones)] if coords else []
+    return dict(zip(names, matches)) if names is not None else matches
@@ -3,13 +3,19 @@ from __future__ import annotations
 import copy
 import logging
 import os
+import sys
 import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from typing import Any, Callable, Mapping
+from typing import Any, Callable, Iterable, Iterator, Mapping
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from utils.disk_cache import get_disk_store
 
 
 LOGGER = logging.getLogger(__name__)
@@ -20,9 +26,102 @@ DEFAULT_TIMEOUT = (
 )
 DEFAULT_ATTEMPTS = int(os.getenv("UPSTREAM_RETRY_ATTEMPTS", "3"))
 TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+POOL_CONNECTIONS = int(os.getenv("UPSTREAM_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("UPSTREAM_POOL_MAXSIZE", "16"))
+# Read size for responses decoded incrementally by a stream_parser.
+STREAM_CHUNK_BYTES = int(os.getenv("UPSTREAM_STREAM_CHUNK_BYTES", str(256 * 1024)))
+CONDITIONAL_GET_ENABLED = os.getenv("UPSTREAM_CONDITIONAL_GET", "1").strip().lower() not in {"0", "false", "no"}
+
+# Stale-while-revalidate: endpoints (matched by longest dotted prefix) whose
+# cached value may be served immediately while a background refresh runs, up
+# to this many seconds after it was fetched. Override or extend with
+# UPSTREAM_SWR_MAX_STALE="spc.outlook=600,nws.forecast=0"; 0 disables.
+# A window has to be longer than the st.cache_data TTL in front of the
+# endpoint: by the time that wrapper expires the cached value is already as
+# old as the TTL. Wrappers must not memoize "refreshing" results (see
+# RefreshingResult), so a window is also the most stale a viewer can see;
+# endpoints whose wrappers do not check the status (the IEM warning counts)
+# stay out of this table.
+DEFAULT_SWR_MAX_STALE_SECONDS = {
+    "spc.outlook": 1800,
+    "nws.forecast": 1800,
+    "nws.points": 3600,
+}
+# Within an endpoint's window, a value younger than this is simply current: it
+# is returned as "live" with no refresh, so a wrapper that skipped the memo
+# for a "refreshing" result fills it on the next call, once the background
+# refresh has landed. Keep it well below the wrapper TTL so an expired
+# wrapper still revalidates. Override with UPSTREAM_SWR_FRESH.
+DEFAULT_SWR_FRESH_SECONDS = {
+    "spc.outlook": 300,
+    "nws.forecast": 300,
+    "nws.points": 600,
+}
+
+
+def _parse_endpoint_seconds(raw: str, defaults: Mapping[str, float]) -> dict[str, float]:
+    values = dict(defaults)
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        try:
+            values[name.strip()] = max(float(value), 0.0)
+        except ValueError:
+            continue
+    return values
+
+
+SWR_MAX_STALE_SECONDS = _parse_endpoint_seconds(os.getenv("UPSTREAM_SWR_MAX_STALE", ""), DEFAULT_SWR_MAX_STALE_SECONDS)
+SWR_FRESH_SECONDS = _parse_endpoint_seconds(os.getenv("UPSTREAM_SWR_FRESH", ""), DEFAULT_SWR_FRESH_SECONDS)
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("UPSTREAM_BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("UPSTREAM_BREAKER_RESET_SECONDS", "30"))
+
+STALE_CACHE_MAX_ENTRIES = int(os.getenv("STALE_CACHE_MAX_ENTRIES", "2048"))
+STALE_CACHE_MAX_BYTES = int(os.getenv("STALE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+STALE_CACHE_MAX_AGE_SECONDS = float(os.getenv("STALE_CACHE_MAX_AGE_SECONDS", str(6 * 3600)))
+STALE_CACHE_DEFAULT_SOURCE_SHARE = float(os.getenv("STALE_CACHE_DEFAULT_SOURCE_SHARE", "0.5"))
+
+
+def _parse_source_quotas(raw: str) -> dict[str, int]:
+    quotas: dict[str, int] = {}
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip().isdigit():
+            quotas[name.strip()] = int(value.strip())
+    return quotas
+
+
+# Per-source byte quotas, e.g. "OpenStreetMap Nominatim=2000000,NOAA/SPC map service=32000000".
+# Sources without an explicit quota may use STALE_CACHE_DEFAULT_SOURCE_SHARE of the total budget.
+STALE_CACHE_SOURCE_QUOTAS = _parse_source_quotas(os.getenv("STALE_CACHE_SOURCE_QUOTAS", ""))
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+_SESSIONS_LOCK = threading.Lock()
+_SESSIONS: dict[str, requests.Session] = {}
 
 _STALE_CACHE_LOCK = threading.Lock()
-_STALE_CACHE: dict[str, dict[str, Any]] = {}
+_STALE_CACHE: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_STALE_CACHE_STATS: dict[str, int] = {
+    "hit_count": 0,
+    "miss_count": 0,
+    "expired_count": 0,
+    "eviction_count": 0,
+    "rejected_count": 0,
+    "disk_hit_count": 0,
+    "disk_warm_count": 0,
+}
+_STALE_CACHE_BYTES = 0
+_STALE_CACHE_SOURCE_BYTES: dict[str, int] = defaultdict(int)
+# Per-source LRU order of _STALE_CACHE keys, so quota eviction never scans other sources.
+_STALE_CACHE_SOURCE_KEYS: dict[str, OrderedDict[str, None]] = defaultdict(OrderedDict)
+_STALE_DISK_STORE = get_disk_store("resilience_stale")
+
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT: dict[str, Future] = {}
+_REFRESHING: set[str] = set()
 
 _METRICS_LOCK = threading.Lock()
 _METRICS: dict[str, dict[str, Any]] = defaultdict(
@@ -30,23 +129,185 @@ _METRICS: dict[str, dict[str, Any]] = defaultdict(
         "success_count": 0,
         "failure_count": 0,
         "stale_fallback_count": 0,
+        "coalesced_count": 0,
+        "not_modified_count": 0,
+        "bytes_saved": 0,
+        "bytes_received": 0,
+        "last_body_bytes": None,
+        "swr_served_count": 0,
+        "swr_refresh_count": 0,
+        "swr_fresh_count": 0,
         "last_latency_ms": None,
         "last_success_at": None,
         "last_failure_at": None,
         "last_error": None,
+        "consecutive_failures": 0,
+        "breaker_state": BREAKER_CLOSED,
+        "breaker_opened_at": None,
+        "breaker_short_circuit_count": 0,
+        "_breaker_opened_monotonic": None,
     }
 )
 
 
+class CircuitOpenError(RuntimeError):
+    """Raised internally when an endpoint's breaker rejects a live request."""
+
+
+class RefreshingResult(Exception):
+    """Carries a stale-while-revalidate result out of a st.cache_data function.
+
+    Streamlit never memoizes a call that raises, so the recent value reaches
+    this caller only and the next call asks the resilience layer again, by
+    which time the background refresh has usually landed.
+    """
+
+    def __init__(self, value: Any, status: dict[str, Any]) -> None:
+        super().__init__(status.get("endpoint"))
+        self.value = value
+        self.status = status
+
+
+def unless_refreshing(value: Any, status: dict[str, Any]) -> tuple[Any, dict[str, Any]]:
+    """Return (value, status) from a cached function, or raise RefreshingResult to skip the memo."""
+    if status.get("status") == "refreshing":
+        raise RefreshingResult(value, status)
+    return value, status
+
+
+def call_with_status(fn: Callable[..., tuple[Any, dict[str, Any]]], *args: Any, **kwargs: Any) -> tuple[Any, dict[str, Any]]:
+    """Call a cached (value, status) function, unwrapping a RefreshingResult."""
+    try:
+        return fn(*args, **kwargs)
+    except RefreshingResult as served:
+        return served.value, served.status
+
+
+class _NotModified:
+    """Loader result for a 304: the cached, already-validated value is still current."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _copy_value(value: Any) -> Any:
-    try:
-        return copy.deepcopy(value)
-    except Exception:
+def _readonly(self: Any, *args: Any, **kwargs: Any) -> Any:
+    raise TypeError("Cached upstream payloads are read-only; copy before modifying.")
+
+
+class FrozenDict(dict):
+    """Read-only dict shared between cache readers without copying.
+
+    Pickling and copying thaw back to plain containers, so st.cache_data
+    results and explicit copies stay mutable for their owners.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self) -> Any:
+        return dict, (dict(self),)
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return {copy.deepcopy(key, memo): copy.deepcopy(value, memo) for key, value in self.items()}
+
+
+class FrozenList(list):
+    """Read-only list counterpart of FrozenDict."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __reduce__(self) -> Any:
+        return list, (list(self),)
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return [copy.deepcopy(item, memo) for item in self]
+
+
+_ATOMIC_TYPES = (str, int, float, bool, type(None))
+
+
+def _freeze(value: Any) -> Any:
+    # One structural pass when a payload enters the cache; after that every
+    # reader, coalesced waiter and stale fallback shares the same object.
+    if isinstance(value, (FrozenDict, FrozenList)):
         return value
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        # GeoJSON coordinate pairs dominate SPC payloads; skip per-item recursion for them.
+        if all(isinstance(item, _ATOMIC_TYPES) for item in value):
+            return FrozenList(value)
+        return FrozenList([_freeze(item) for item in value])
+    if isinstance(value, tuple):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def get_session(url: str) -> requests.Session:
+    # One keep-alive session per upstream host so repeated NWS/SPC/IEM calls
+    # reuse pooled TCP/TLS connections instead of handshaking on every fetch.
+    host = _host_key(url)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSIONS[host] = session
+        return session
+
+
+def _pool_metrics() -> dict[str, dict[str, Any]]:
+    with _SESSIONS_LOCK:
+        sessions = dict(_SESSIONS)
+
+    snapshot: dict[str, dict[str, Any]] = {}
+    for host, session in sessions.items():
+        request_count = 0
+        connection_count = 0
+        adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+        for adapter in adapters.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for pool_key in pools.keys():
+                try:
+                    pool = pools[pool_key]
+                except KeyError:
+                    continue
+                request_count += getattr(pool, "num_requests", 0)
+                connection_count += getattr(pool, "num_connections", 0)
+        snapshot[f"pool:{host}"] = {
+            "request_count": request_count,
+            "new_connection_count": connection_count,
+            "reused_connection_count": max(request_count - connection_count, 0),
+            "pool_maxsize": POOL_MAXSIZE,
+        }
+    return snapshot
 
 
 def _normalize_timeout(timeout: float | tuple[float, float] | None) -> tuple[float, float]:
@@ -70,6 +331,8 @@ def _is_transient_error(exc: Exception) -> bool:
 
 
 def _friendly_error_message(exc: Exception) -> str:
+    if isinstance(exc, CircuitOpenError):
+        return "Upstream service is paused after repeated failures."
     if isinstance(exc, requests.Timeout):
         return "Upstream service timed out."
     if isinstance(exc, requests.ConnectionError):
@@ -85,29 +348,178 @@ def _friendly_error_message(exc: Exception) -> str:
     return "Upstream data is unavailable right now."
 
 
-def _record_metric(endpoint: str, *, ok: bool, latency_ms: float, error: str | None = None, used_stale: bool = False) -> None:
+def _record_metric(
+    endpoint: str,
+    *,
+    ok: bool,
+    latency_ms: float,
+    error: str | None = None,
+    used_stale: bool = False,
+    short_circuited: bool = False,
+    transient: bool = True,
+) -> None:
     with _METRICS_LOCK:
         metric = _METRICS[endpoint]
         metric["last_latency_ms"] = round(latency_ms, 1)
         if ok:
             metric["success_count"] += 1
             metric["last_success_at"] = utc_now_iso()
-        else:
+            metric["consecutive_failures"] = 0
+            _set_breaker_state(endpoint, metric, BREAKER_CLOSED)
+        elif not short_circuited:
             metric["failure_count"] += 1
             metric["last_failure_at"] = utc_now_iso()
             metric["last_error"] = error
+            # Only outages count toward the breaker. A 4xx or a payload the
+            # validator rejects is about the request (e.g. /points for an
+            # offshore point), and breakers are per endpoint, not per URL.
+            if transient:
+                metric["consecutive_failures"] += 1
+                if (
+                    metric["breaker_state"] == BREAKER_HALF_OPEN
+                    or metric["consecutive_failures"] >= BREAKER_FAILURE_THRESHOLD
+                ):
+                    _set_breaker_state(endpoint, metric, BREAKER_OPEN)
         if used_stale:
             metric["stale_fallback_count"] += 1
 
 
+def _set_breaker_state(endpoint: str, metric: dict[str, Any], state: str) -> None:
+    if state == BREAKER_OPEN:
+        metric["breaker_opened_at"] = utc_now_iso()
+        metric["_breaker_opened_monotonic"] = time.monotonic()
+    elif state == BREAKER_CLOSED:
+        metric["breaker_opened_at"] = None
+        metric["_breaker_opened_monotonic"] = None
+    if metric["breaker_state"] != state:
+        LOGGER.warning(
+            "upstream_breaker_%s endpoint=%s consecutive_failures=%s",
+            state,
+            endpoint,
+            metric["consecutive_failures"],
+        )
+    metric["breaker_state"] = state
+
+
+def _breaker_admit(endpoint: str) -> str | None:
+    """Return the breaker state a live call runs under, or None to short-circuit.
+
+    An open breaker rejects calls until BREAKER_RESET_SECONDS have passed, then
+    lets one half-open trial through; its outcome closes or reopens it. A trial
+    that never reports back is replaced after another reset window.
+    """
+    with _METRICS_LOCK:
+        metric = _METRICS[endpoint]
+        if metric["breaker_state"] == BREAKER_CLOSED:
+            return BREAKER_CLOSED
+        opened_at = metric["_breaker_opened_monotonic"] or 0.0
+        if time.monotonic() - opened_at >= BREAKER_RESET_SECONDS:
+            metric["breaker_state"] = BREAKER_HALF_OPEN
+            metric["_breaker_opened_monotonic"] = time.monotonic()
+            return BREAKER_HALF_OPEN
+        metric["breaker_short_circuit_count"] += 1
+        return None
+
+
+def _record_not_modified(endpoint: str, body_bytes: int) -> None:
+    with _METRICS_LOCK:
+        metric = _METRICS[endpoint]
+        metric["not_modified_count"] += 1
+        metric["bytes_saved"] += body_bytes
+
+
+def _record_body_bytes(endpoint: str, body_bytes: int) -> None:
+    with _METRICS_LOCK:
+        metric = _METRICS[endpoint]
+        metric["bytes_received"] += body_bytes
+        metric["last_body_bytes"] = body_bytes
+
+
+def _record_swr(endpoint: str, field: str) -> None:
+    with _METRICS_LOCK:
+        _METRICS[endpoint][field] += 1
+
+
+def _record_coalesced(endpoint: str) -> None:
+    with _METRICS_LOCK:
+        _METRICS[endpoint]["coalesced_count"] += 1
+
+
 def get_metrics_snapshot() -> dict[str, dict[str, Any]]:
     with _METRICS_LOCK:
-        return {name: dict(values) for name, values in _METRICS.items()}
+        snapshot = {
+            name: {key: value for key, value in values.items() if not key.startswith("_")}
+            for name, values in _METRICS.items()
+        }
+    snapshot.update(_pool_metrics())
+    snapshot["stale_cache"] = _stale_cache_metrics()
+    return snapshot
+
+
+def _estimate_bytes(value: Any) -> int:
+    # Rough shallow-plus-children size; good enough to keep the cache's memory
+    # budget honest without serialising every payload.
+    total = 0
+    seen: set[int] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item, 64)
+        if getattr(item, "base", None) is not None and isinstance(getattr(item, "nbytes", None), int):
+            # NumPy views (streamed GeoJSON rings) only report their header size.
+            total += item.nbytes
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+def _source_quota(source: str) -> int:
+    return STALE_CACHE_SOURCE_QUOTAS.get(source, int(STALE_CACHE_MAX_BYTES * STALE_CACHE_DEFAULT_SOURCE_SHARE))
+
+
+def _stale_cache_metrics() -> dict[str, Any]:
+    with _STALE_CACHE_LOCK:
+        return {
+            **_STALE_CACHE_STATS,
+            "entry_count": len(_STALE_CACHE),
+            "size_bytes": _STALE_CACHE_BYTES,
+            "max_entries": STALE_CACHE_MAX_ENTRIES,
+            "max_bytes": STALE_CACHE_MAX_BYTES,
+            "source_bytes": dict(_STALE_CACHE_SOURCE_BYTES),
+        }
 
 
 def get_stale_cache_snapshot() -> dict[str, dict[str, Any]]:
     with _STALE_CACHE_LOCK:
-        return {key: dict(value) for key, value in _STALE_CACHE.items()}
+        return {
+            key: {name: item for name, item in value.items() if not name.startswith("_")}
+            for key, value in _STALE_CACHE.items()
+        }
+
+
+def _cache_remove_locked(cache_key: str) -> None:
+    global _STALE_CACHE_BYTES
+    entry = _STALE_CACHE.pop(cache_key, None)
+    if entry is None:
+        return
+    _STALE_CACHE_BYTES -= entry["size_bytes"]
+    _STALE_CACHE_SOURCE_BYTES[entry["source"]] -= entry["size_bytes"]
+    if _STALE_CACHE_SOURCE_BYTES[entry["source"]] <= 0:
+        del _STALE_CACHE_SOURCE_BYTES[entry["source"]]
+    source_keys = _STALE_CACHE_SOURCE_KEYS[entry["source"]]
+    source_keys.pop(cache_key, None)
+    if not source_keys:
+        del _STALE_CACHE_SOURCE_KEYS[entry["source"]]
+
+
+def _cache_is_expired(entry: dict[str, Any]) -> bool:
+    return time.monotonic() - entry["_stored_monotonic"] > STALE_CACHE_MAX_AGE_SECONDS
 
 
 def _cache_get(cache_key: str | None) -> dict[str, Any] | None:
@@ -115,17 +527,155 @@ def _cache_get(cache_key: str | None) -> dict[str, Any] | None:
         return None
     with _STALE_CACHE_LOCK:
         entry = _STALE_CACHE.get(cache_key)
-        return dict(entry) if entry else None
+        if entry is not None and _cache_is_expired(entry):
+            _cache_remove_locked(cache_key)
+            _STALE_CACHE_STATS["expired_count"] += 1
+            entry = None
+        if entry is not None:
+            _STALE_CACHE.move_to_end(cache_key)
+            _STALE_CACHE_SOURCE_KEYS[entry["source"]].move_to_end(cache_key)
+            _STALE_CACHE_STATS["hit_count"] += 1
+            return dict(entry)
 
+    # Fall back to the disk tier, e.g. for a key this process has not fetched
+    # since a restart, and promote it into memory.
+    disk_entry = _STALE_DISK_STORE.get(cache_key) if _STALE_DISK_STORE is not None else None
+    if disk_entry is None:
+        with _STALE_CACHE_LOCK:
+            _STALE_CACHE_STATS["miss_count"] += 1
+        return None
+    value, meta, stored_at, _expires_at = disk_entry
+    stored = _freeze(value)
+    size_bytes = _estimate_bytes(stored)
+    with _STALE_CACHE_LOCK:
+        _STALE_CACHE_STATS["disk_hit_count"] += 1
+        entry = _cache_store_locked(
+            cache_key,
+            stored,
+            size_bytes=size_bytes,
+            source=meta.get("source", ""),
+            cached_at=meta.get("cached_at") or utc_now_iso(),
+            age_seconds=time.time() - stored_at,
+            meta=meta,
+        )
+        return dict(entry) if entry is not None else None
+
+
+def _cache_evict_locked(source: str) -> None:
+    # Expired entries at the cold end go first, then least-recently-used
+    # entries of the source that is over quota, then least-recently-used
+    # entries overall. Work is proportional to what is evicted; expired
+    # entries elsewhere are dropped when read or when they reach the cold end.
+    while _STALE_CACHE:
+        key, entry = next(iter(_STALE_CACHE.items()))
+        if not _cache_is_expired(entry):
+            break
+        _cache_remove_locked(key)
+        _STALE_CACHE_STATS["eviction_count"] += 1
+
+    quota = _source_quota(source)
+    while _STALE_CACHE_SOURCE_BYTES.get(source, 0) > quota:
+        _cache_remove_locked(next(iter(_STALE_CACHE_SOURCE_KEYS[source])))
+        _STALE_CACHE_STATS["eviction_count"] += 1
+
+    while _STALE_CACHE and (len(_STALE_CACHE) > STALE_CACHE_MAX_ENTRIES or _STALE_CACHE_BYTES > STALE_CACHE_MAX_BYTES):
+        _cache_remove_locked(next(iter(_STALE_CACHE)))
+        _STALE_CACHE_STATS["eviction_count"] += 1
 
-def _cache_set(cache_key: str | None, value: Any) -> None:
+
+def _cache_store_locked(
+    cache_key: str,
+    stored: Any,
+    *,
+    size_bytes: int,
+    source: str,
+    cached_at: str,
+    age_seconds: float = 0.0,
+    meta: Mapping[str, Any] | None = None,
+) -> dict[str, Any] | None:
+    # size_bytes comes from _estimate_bytes, computed by the caller before it
+    # takes the lock so large payloads never stall other cache readers.
+    global _STALE_CACHE_BYTES
+    _cache_remove_locked(cache_key)
+    if size_bytes > min(STALE_CACHE_MAX_BYTES, _source_quota(source)):
+        _STALE_CACHE_STATS["rejected_count"] += 1
+        return None
+    entry = {
+        "value": stored,
+        "cached_at": cached_at,
+        "source": source,
+        "size_bytes": size_bytes,
+        "validators": dict((meta or {}).get("validators") or {}),
+        "body_bytes": int((meta or {}).get("body_bytes") or 0),
+        "_stored_monotonic": time.monotonic() - max(age_seconds, 0.0),
+    }
+    _STALE_CACHE[cache_key] = entry
+    _STALE_CACHE_BYTES += size_bytes
+    _STALE_CACHE_SOURCE_BYTES[source] += size_bytes
+    _STALE_CACHE_SOURCE_KEYS[source][cache_key] = None
+    _cache_evict_locked(source)
+    return entry
+
+
+def _cache_set(cache_key: str | None, value: Any, *, source: str, meta: Mapping[str, Any] | None = None) -> None:
     if not cache_key:
         return
+    stored = _freeze(value)
+    size_bytes = _estimate_bytes(stored)
+    cached_at = utc_now_iso()
     with _STALE_CACHE_LOCK:
-        _STALE_CACHE[cache_key] = {
-            "value": _copy_value(value),
-            "cached_at": utc_now_iso(),
-        }
+        entry = _cache_store_locked(
+            cache_key, stored, size_bytes=size_bytes, source=source, cached_at=cached_at, meta=meta
+        )
+    if entry is not None and _STALE_DISK_STORE is not None:
+        _STALE_DISK_STORE.set(
+            cache_key,
+            stored,
+            ttl_seconds=STALE_CACHE_MAX_AGE_SECONDS,
+            meta={
+                "source": source,
+                "cached_at": cached_at,
+                "validators": entry["validators"],
+                "body_bytes": entry["body_bytes"],
+            },
+        )
+
+
+def _cache_peek(cache_key: str | None) -> dict[str, Any] | None:
+    # Read without touching LRU order or hit/miss counters; used to build
+    # conditional request headers.
+    if not cache_key:
+        return None
+    with _STALE_CACHE_LOCK:
+        entry = _STALE_CACHE.get(cache_key)
+        if entry is None or _cache_is_expired(entry):
+            return None
+        return dict(entry)
+
+
+def _warm_stale_cache_from_disk() -> None:
+    if _STALE_DISK_STORE is None:
+        return
+    rows = list(_STALE_DISK_STORE.iter_live())
+    now = time.time()
+    # Oldest first, so the newest rows end up most-recently-used.
+    for cache_key, value, meta, stored_at, _expires_at in reversed(rows):
+        stored = _freeze(value)
+        size_bytes = _estimate_bytes(stored)
+        with _STALE_CACHE_LOCK:
+            if _cache_store_locked(
+                cache_key,
+                stored,
+                size_bytes=size_bytes,
+                source=meta.get("source", ""),
+                cached_at=meta.get("cached_at") or utc_now_iso(),
+                age_seconds=now - stored_at,
+                meta=meta,
+            ) is not None:
+                _STALE_CACHE_STATS["disk_warm_count"] += 1
+
+
+_warm_stale_cache_from_disk()
 
 
 def build_data_status(
@@ -149,10 +699,87 @@ def build_data_status(
         "source_timestamp": source_timestamp,
         "latency_ms": round(latency_ms, 1) if latency_ms is not None else None,
         "checked_at": utc_now_iso(),
-        "degraded": status != "live",
+        "degraded": status not in {"live", "refreshing"},
     }
 
 
+def _endpoint_seconds(table: Mapping[str, float], endpoint: str) -> float:
+    parts = endpoint.split(".")
+    for length in range(len(parts), 0, -1):
+        prefix = ".".join(parts[:length])
+        if prefix in table:
+            return table[prefix]
+    return 0.0
+
+
+def _swr_max_stale(endpoint: str) -> float:
+    return _endpoint_seconds(SWR_MAX_STALE_SECONDS, endpoint)
+
+
+def _swr_fresh(endpoint: str) -> float:
+    return _endpoint_seconds(SWR_FRESH_SECONDS, endpoint)
+
+
+def _serve_while_revalidating(
+    *,
+    endpoint: str,
+    source: str,
+    cache_key: str,
+    max_stale_seconds: float,
+    fresh_seconds: float,
+    refresh: Callable[[], Any],
+) -> tuple[Any, dict[str, Any]] | None:
+    """Return a recent cached value at once, refreshing it in the background once it is past fresh_seconds.
+
+    Returns None (the caller fetches synchronously) when the endpoint has no
+    stale-while-revalidate window or the cached value is older than it.
+    """
+    if max_stale_seconds <= 0:
+        return None
+    entry = _cache_peek(cache_key)
+    if entry is None:
+        return None
+    age_seconds = time.monotonic() - entry["_stored_monotonic"]
+    if age_seconds > max_stale_seconds:
+        return None
+    if age_seconds <= fresh_seconds:
+        _record_swr(endpoint, "swr_fresh_count")
+        return entry["value"], build_data_status(
+            source=source,
+            endpoint=endpoint,
+            status="live",
+            summary="Live data loaded successfully.",
+            cached_at=entry.get("cached_at"),
+        )
+
+    with _INFLIGHT_LOCK:
+        start_refresh = cache_key not in _REFRESHING and cache_key not in _INFLIGHT
+        if start_refresh:
+            _REFRESHING.add(cache_key)
+    if start_refresh:
+        # Imported lazily: fetch_engine builds on this module.
+        from utils.fetch_engine import submit
+
+        def run_refresh() -> None:
+            try:
+                refresh()
+            finally:
+                with _INFLIGHT_LOCK:
+                    _REFRESHING.discard(cache_key)
+
+        _record_swr(endpoint, "swr_refresh_count")
+        submit(run_refresh, lane=endpoint.split(".", 1)[0])
+
+    _record_swr(endpoint, "swr_served_count")
+    return entry["value"], build_data_status(
+        source=source,
+        endpoint=endpoint,
+        status="refreshing",
+        summary="Showing recent data while a background refresh runs.",
+        cached_at=entry.get("cached_at"),
+    )
+
+
 def execute_with_stale_fallback(
     *,
     endpoint: str,
@@ -162,20 +789,110 @@ def execute_with_stale_fallback(
     default_factory: Callable[[], Any],
     validator: Callable[[Any], Any] | None = None,
     attempts: int = DEFAULT_ATTEMPTS,
+    cache_meta: Mapping[str, Any] | None = None,
+    max_stale_seconds: float | None = None,
+    fresh_seconds: float | None = None,
+) -> tuple[Any, dict[str, Any]]:
+    def run() -> tuple[Any, dict[str, Any]]:
+        return _execute_with_stale_fallback(
+            endpoint=endpoint,
+            source=source,
+            cache_key=cache_key,
+            loader=loader,
+            default_factory=default_factory,
+            validator=validator,
+            attempts=attempts,
+            cache_meta=cache_meta,
+        )
+
+    if not cache_key:
+        return run()
+
+    served = _serve_while_revalidating(
+        endpoint=endpoint,
+        source=source,
+        cache_key=cache_key,
+        max_stale_seconds=_swr_max_stale(endpoint) if max_stale_seconds is None else max_stale_seconds,
+        fresh_seconds=_swr_fresh(endpoint) if fresh_seconds is None else fresh_seconds,
+        refresh=lambda: execute_with_stale_fallback(
+            endpoint=endpoint,
+            source=source,
+            cache_key=cache_key,
+            loader=loader,
+            default_factory=default_factory,
+            validator=validator,
+            attempts=attempts,
+            cache_meta=cache_meta,
+            max_stale_seconds=0,
+        ),
+    )
+    if served is not None:
+        return served
+
+    # Single-flight: concurrent callers for the same cache key share one
+    # upstream request instead of each sending an identical fetch.
+    with _INFLIGHT_LOCK:
+        flight = _INFLIGHT.get(cache_key)
+        is_leader = flight is None
+        if is_leader:
+            flight = Future()
+            _INFLIGHT[cache_key] = flight
+
+    if not is_leader:
+        _record_coalesced(endpoint)
+        value, status = flight.result()
+        return value, dict(status)
+
+    try:
+        value, status = run()
+        flight.set_result((value, status))
+        return value, dict(status)
+    except BaseException as exc:
+        flight.set_exception(exc)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(cache_key, None)
+
+
+def _execute_with_stale_fallback(
+    *,
+    endpoint: str,
+    source: str,
+    cache_key: str | None,
+    loader: Callable[[], Any],
+    default_factory: Callable[[], Any],
+    validator: Callable[[Any], Any] | None = None,
+    attempts: int = DEFAULT_ATTEMPTS,
+    cache_meta: Mapping[str, Any] | None = None,
 ) -> tuple[Any, dict[str, Any]]:
     start_time = time.perf_counter()
     last_error: Exception | None = None
 
-    for attempt in range(1, max(attempts, 1) + 1):
+    # While the endpoint's breaker is open, skip the network (and its timeouts
+    # and backoff) entirely and fall through to the stale cache.
+    breaker_state = _breaker_admit(endpoint)
+    if breaker_state is None:
+        attempts = 0
+        last_error = CircuitOpenError(endpoint)
+    elif breaker_state == BREAKER_HALF_OPEN:
+        attempts = 1
+    else:
+        attempts = max(attempts, 1)
+
+    for attempt in range(1, attempts + 1):
         try:
             value = loader()
-            if validator is not None:
+            if isinstance(value, _NotModified):
+                value = value.value
+            elif validator is not None:
                 value = validator(value)
+            value = _freeze(value)
             latency_ms = (time.perf_counter() - start_time) * 1000
-            _cache_set(cache_key, value)
+            _cache_set(cache_key, value, source=source, meta=cache_meta)
             _record_metric(endpoint, ok=True, latency_ms=latency_ms)
             LOGGER.info("upstream_ok endpoint=%s latency_ms=%.1f attempt=%s", endpoint, latency_ms, attempt)
-            return _copy_value(value), build_data_status(
+            return value, build_data_status(
                 source=source,
                 endpoint=endpoint,
                 status="live",
@@ -185,23 +902,32 @@ def execute_with_stale_fallback(
         except Exception as exc:
             last_error = exc
             transient = _is_transient_error(exc)
-            if attempt >= max(attempts, 1) or not transient:
+            if attempt >= attempts or not transient:
                 break
             time.sleep(min(0.35 * (2 ** (attempt - 1)), 1.2))
 
     latency_ms = (time.perf_counter() - start_time) * 1000
     stale_entry = _cache_get(cache_key)
     error_message = _friendly_error_message(last_error or RuntimeError("Unknown upstream failure"))
+    transient = last_error is None or _is_transient_error(last_error)
 
     if stale_entry is not None:
-        _record_metric(endpoint, ok=False, latency_ms=latency_ms, error=error_message, used_stale=True)
+        _record_metric(
+            endpoint,
+            ok=False,
+            latency_ms=latency_ms,
+            error=error_message,
+            used_stale=True,
+            short_circuited=breaker_state is None,
+            transient=transient,
+        )
         LOGGER.warning(
             "upstream_stale_fallback endpoint=%s latency_ms=%.1f error=%s",
             endpoint,
             latency_ms,
             error_message,
         )
-        return _copy_value(stale_entry["value"]), build_data_status(
+        return stale_entry["value"], build_data_status(
             source=source,
             endpoint=endpoint,
             status="stale",
@@ -211,7 +937,14 @@ def execute_with_stale_fallback(
             latency_ms=latency_ms,
         )
 
-    _record_metric(endpoint, ok=False, latency_ms=latency_ms, error=error_message)
+    _record_metric(
+        endpoint,
+        ok=False,
+        latency_ms=latency_ms,
+        error=error_message,
+        short_circuited=breaker_state is None,
+        transient=transient,
+    )
     LOGGER.warning(
         "upstream_unavailable endpoint=%s latency_ms=%.1f error=%s",
         endpoint,
@@ -228,6 +961,93 @@ def execute_with_stale_fallback(
     )
 
 
+def _conditional_headers(headers: Mapping[str, str], cache_key: str | None, enabled: bool) -> dict[str, str]:
+    request_headers = dict(headers)
+    entry = _cache_peek(cache_key) if enabled else None
+    validators = (entry or {}).get("validators") or {}
+    if validators.get("etag"):
+        request_headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        request_headers["If-Modified-Since"] = validators["last_modified"]
+    return request_headers
+
+
+def _conditional_get(
+    url: str,
+    *,
+    params: Mapping[str, Any] | None,
+    headers: Mapping[str, str],
+    timeout: tuple[float, float],
+    endpoint: str,
+    cache_key: str | None,
+    revalidate: bool,
+    cache_meta: dict[str, Any],
+    stream: bool = False,
+) -> requests.Response | _NotModified:
+    """GET ``url``, revalidating the stale-cache entry's ETag/Last-Modified when present.
+
+    A 304 yields the cached value; validators from a full 200 response are
+    recorded in ``cache_meta`` so they are stored alongside the new entry.
+    With ``stream`` the body is left unread; the caller records body_bytes.
+    """
+    session = get_session(url)
+    enabled = revalidate and CONDITIONAL_GET_ENABLED and bool(cache_key)
+    response = session.get(
+        url,
+        params=params,
+        headers=_conditional_headers(headers, cache_key, enabled),
+        timeout=timeout,
+        stream=stream,
+    )
+    if response.status_code == 304:
+        entry = _cache_peek(cache_key)
+        if entry is not None:
+            _record_not_modified(endpoint, entry["body_bytes"])
+            cache_meta.update(validators=entry["validators"], body_bytes=entry["body_bytes"])
+            return _NotModified(entry["value"])
+        # The entry was evicted between building headers and the reply.
+        response = session.get(url, params=params, headers=dict(headers), timeout=timeout, stream=stream)
+    if stream and not response.ok:
+        response.close()
+    response.raise_for_status()
+    if not stream:
+        _record_body_bytes(endpoint, len(response.content))
+    if enabled:
+        cache_meta["validators"] = {
+            key: value
+            for key, value in (
+                ("etag", response.headers.get("ETag")),
+                ("last_modified", response.headers.get("Last-Modified")),
+            )
+            if value
+        }
+        if not stream:
+            cache_meta["body_bytes"] = len(response.content)
+    return response
+
+
+def _parse_streamed(
+    response: requests.Response,
+    stream_parser: Callable[[Iterable[bytes]], Any],
+    cache_meta: dict[str, Any],
+    endpoint: str,
+) -> Any:
+    body_bytes = 0
+
+    def _chunks() -> Iterator[bytes]:
+        nonlocal body_bytes
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+            body_bytes += len(chunk)
+            yield chunk
+
+    with response:
+        value = stream_parser(_chunks())
+    _record_body_bytes(endpoint, body_bytes)
+    if "validators" in cache_meta:
+        cache_meta["body_bytes"] = body_bytes
+    return value
+
+
 def request_json(
     *,
     url: str,
@@ -239,12 +1059,36 @@ def request_json(
     cache_key: str | None = None,
     default_factory: Callable[[], Any] = dict,
     validator: Callable[[Any], Any] | None = None,
+    revalidate: bool = True,
+    max_stale_seconds: float | None = None,
+    stream_parser: Callable[[Iterable[bytes]], Any] | None = None,
 ) -> tuple[Any, dict[str, Any]]:
+    """GET JSON through the resilience layer.
+
+    ``stream_parser`` decodes the body from raw byte chunks as they arrive
+    (e.g. utils.geojson_stream.parse_feature_collection) instead of buffering
+    the whole response for ``response.json()``.
+    """
     normalized_timeout = _normalize_timeout(timeout)
 
+    cache_meta: dict[str, Any] = {}
+
     def loader() -> Any:
-        response = requests.get(url, params=params, headers=dict(headers), timeout=normalized_timeout)
-        response.raise_for_status()
+        response = _conditional_get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=normalized_timeout,
+            endpoint=endpoint,
+            cache_key=cache_key,
+            revalidate=revalidate,
+            cache_meta=cache_meta,
+            stream=stream_parser is not None,
+        )
+        if isinstance(response, _NotModified):
+            return response
+        if stream_parser is not None:
+            return _parse_streamed(response, stream_parser, cache_meta, endpoint)
         return response.json()
 
     return execute_with_stale_fallback(
@@ -254,6 +1098,8 @@ def request_json(
         loader=loader,
         default_factory=default_factory,
         validator=validator,
+        cache_meta=cache_meta,
+        max_stale_seconds=max_stale_seconds,
     )
 
 
@@ -268,12 +1114,26 @@ def request_text(
     cache_key: str | None = None,
     default_factory: Callable[[], str] | None = None,
     validator: Callable[[str], str] | None = None,
+    revalidate: bool = True,
+    max_stale_seconds: float | None = None,
 ) -> tuple[str, dict[str, Any]]:
     normalized_timeout = _normalize_timeout(timeout)
 
-    def loader() -> str:
-        response = requests.get(url, params=params, headers=dict(headers), timeout=normalized_timeout)
-        response.raise_for_status()
+    cache_meta: dict[str, Any] = {}
+
+    def loader() -> Any:
+        response = _conditional_get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=normalized_timeout,
+            endpoint=endpoint,
+            cache_key=cache_key,
+            revalidate=revalidate,
+            cache_meta=cache_meta,
+        )
+        if isinstance(response, _NotModified):
+            return response
         return response.text
 
     return execute_with_stale_fallback(
@@ -283,6 +1143,8 @@ def request_text(
         loader=loader,
         default_factory=default_factory or (lambda: ""),
         validator=validator,
+        cache_meta=cache_meta,
+        max_stale_seconds=max_stale_seconds,
     )
 
 
@@ -295,11 +1157,12 @@ def probe_url(
     timeout: float | tuple[float, float] | None = None,
     cache_key: str | None = None,
     validator: Callable[[requests.Response], bool] | None = None,
+    max_stale_seconds: float | None = None,
 ) -> tuple[bool, dict[str, Any]]:
     normalized_timeout = _normalize_timeout(timeout)
 
     def loader() -> bool:
-        response = requests.get(url, headers=dict(headers), timeout=normalized_timeout, stream=True)
+        response = get_session(url).get(url, headers=dict(headers), timeout=normalized_timeout, stream=True)
         try:
             response.raise_for_status()
             if validator is not None:
@@ -314,4 +1177,60 @@ def probe_url(
         cache_key=cache_key,
         loader=loader,
         default_factory=lambda: False,
+        max_stale_seconds=max_stale_seconds,
     )
+
+
+def benchmark(payload: Any, reads: int = 10, repeat: int = 3) -> dict[str, dict[str, float]]:
+    """
+    Time the old copy-per-access cache against frozen sharing for one payload.
+
+    "deepcopy" replays the former _copy_value traffic: a copy into the cache,
+    one for the single-flight result and one for the caller on a live load,
+    then one per cache read. "freeze" is today's single _freeze pass with
+    shared reads. Reports the best wall time for a live load plus ``reads``
+    reads and for the live load alone.
+    """
+
+    def deepcopy_path(read_count: int) -> None:
+        stored = copy.deepcopy(payload)
+        copy.deepcopy(stored)
+        copy.deepcopy(stored)
+        for _ in range(read_count):
+            copy.deepcopy(stored)
+
+    def freeze_path(read_count: int) -> None:
+        stored = _freeze(payload)
+        for _ in range(read_count):
+            stored.get("features")
+
+    results: dict[str, dict[str, float]] = {}
+    for name, path in {"deepcopy": deepcopy_path, "freeze": freeze_path}.items():
+        timings = {}
+        for label, read_count in (("live_load_seconds", 0), ("load_and_reads_seconds", reads)):
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                path(read_count)
+                best = min(best, time.perf_counter() - started)
+            timings[label] = best
+        results[name] = timings
+    return results
+
+
+if __name__ == "__main__":
+    # python -m utils.resilience [saved_layer.geojson]
+    import json
+    from utils.geojson_stream import _synthetic_layer
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as handle:
+            sample = json.loads(handle.read())
+    else:
+        sample = json.loads(_synthetic_layer(features=8, vertices=15_000))
+    print(f"payload: {_estimate_bytes(sample) / 1e6:.1f} MB in memory")
+    for label, stats in benchmark(sample).items():
+        print(
+            f"{label:>9}: live load {stats['live_load_seconds'] * 1000:8.1f} ms"
+            f"  live load + 10 reads {stats['load_and_reads_seconds'] * 1000:8.1f} ms"
+        )
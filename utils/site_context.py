@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import json
-from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timezone
 from typing import Any
 from zoneinfo import ZoneInfo
@@ -14,7 +13,9 @@ from utils.external_context import (
     get_external_weather_context,
     merge_internal_and_external_context,
 )
+from utils.fetch_engine import run_fetch_graph
 from utils.nws import get_nws_point_properties
+from utils.nws_alerts import get_alert_snapshot
 from utils.satelite import GOES_BASE, GOES_PRODUCTS, GOES_SATS, GOES_SECTORS
 
 
@@ -253,6 +254,24 @@ def _build_active_user_selection(current_page: str) -> dict[str, Any]:
     }
 
 
+def _build_national_alert_context(*, max_items: int = 5) -> dict[str, Any]:
+    # Read from the in-memory feed snapshot the ticker uses; never fetches.
+    snapshot = get_alert_snapshot()
+    alerts = () if snapshot.had_error else snapshot.alerts
+    counts: dict[str, int] = {}
+    for alert in alerts:
+        counts[alert["event"]] = counts.get(alert["event"], 0) + 1
+    return {
+        "source": "NOAA/NWS alerts (nationwide severe ticker feed)",
+        "feed_version": snapshot.version,
+        "fetched_at": snapshot.fetched_at.isoformat() if snapshot.fetched_at else None,
+        "feed_unavailable": snapshot.had_error,
+        "active_count": len(alerts),
+        "counts_by_event": counts,
+        "examples": [alert["display_text"] for alert in alerts[:max_items]],
+    }
+
+
 def get_home_context(lat: float | None, lon: float | None, location_name: str) -> dict[str, Any]:
     home_page_context = _get_page_context("Home")
     if lat is None or lon is None:
@@ -270,11 +289,19 @@ def get_home_context(lat: float | None, lon: float | None, location_name: str) -
     )
 
     current_year = datetime.now(UTC).year
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        obs_future = executor.submit(get_location_glance, lat, lon)
-        tor_future = executor.submit(tor_count_cached, current_year)
-        svr_future = executor.submit(svr_count_cached, current_year)
-        spc_future = executor.submit(get_spc_location_percents_cached, lat, lon)
+    futures = run_fetch_graph(
+        {
+            "obs": lambda: get_location_glance(lat, lon),
+            "tor": lambda: tor_count_cached(current_year),
+            "svr": lambda: svr_count_cached(current_year),
+            "spc": lambda: get_spc_location_percents_cached(lat, lon),
+        },
+        lanes={"obs": "nws", "tor": "iem", "svr": "iem", "spc": "spc"},
+    )
+    obs_future = futures["obs"]
+    tor_future = futures["tor"]
+    svr_future = futures["svr"]
+    spc_future = futures["spc"]
 
     temp_f, dew_f, wind_text, conditions_text = obs_future.result()
     local_spc = spc_future.result()
@@ -533,20 +560,24 @@ def _build_spc_outlooks_context(lat: float | None, lon: float | None, location_n
         get_day4_8_prob_image_url,
     )
 
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = {
-            "day1": executor.submit(get_day1_categorical_image_url),
-            "day2": executor.submit(get_day2_categorical_image_url),
-            "day3": executor.submit(get_day3_categorical_image_url),
-            "day4": executor.submit(get_day4_8_prob_image_url, 4),
-            "day5": executor.submit(get_day4_8_prob_image_url, 5),
-            "day6": executor.submit(get_day4_8_prob_image_url, 6),
-            "day7": executor.submit(get_day4_8_prob_image_url, 7),
-            "day8": executor.submit(get_day4_8_prob_image_url, 8),
-        }
+    graph = {
+        "day1": get_day1_categorical_image_url,
+        "day2": get_day2_categorical_image_url,
+        "day3": get_day3_categorical_image_url,
+        "day4": lambda: get_day4_8_prob_image_url(4),
+        "day5": lambda: get_day4_8_prob_image_url(5),
+        "day6": lambda: get_day4_8_prob_image_url(6),
+        "day7": lambda: get_day4_8_prob_image_url(7),
+        "day8": lambda: get_day4_8_prob_image_url(8),
+    }
+    for day in (1, 2, 3):
+        graph[f"detail{day}"] = lambda day=day: _build_spc_detail_summary(day)
+    if lat is not None and lon is not None:
+        graph["location"] = lambda: get_spc_location_percents_cached(lat, lon)
 
-        location_future = executor.submit(get_spc_location_percents_cached, lat, lon) if lat is not None and lon is not None else None
-        detail_futures = {day: executor.submit(_build_spc_detail_summary, day) for day in (1, 2, 3)}
+    futures = run_fetch_graph(graph, lane="spc")
+    location_future = futures.get("location")
+    detail_futures = {day: futures[f"detail{day}"] for day in (1, 2, 3)}
 
     location_summary = location_future.result() if location_future is not None else {}
     risk_summary = get_day1_location_risk_summary(location_summary) if location_summary else {"hazards": [], "message": None}
@@ -674,6 +705,7 @@ def build_global_site_context() -> dict[str, Any]:
         "observations_summary": get_observations_context(lat, lon, location_name),
         "forecast_summary": get_forecast_context(lat, lon, location_name),
         "spc_outlooks": _build_spc_outlooks_context(lat, lon, location_name),
+        "national_severe_alerts": _build_national_alert_context(),
         "popup_details": get_popup_context(lat, lon, location_name),
         "about_summary": _build_about_context(),
         "glossary_or_explanations": get_ui_explainer_context(),
@@ -718,6 +750,7 @@ def build_assistant_context() -> dict[str, Any]:
         "observations": external_context.get("external_observations"),
         "spc": external_context.get("external_spc"),
         "fetch_status": external_context.get("external_fetch_status"),
+        "national_severe_alerts": _build_national_alert_context(max_items=3),
     }
 
     return {
@@ -1,19 +1,56 @@
 # utils/spc.py
 
+import hashlib
+import json
+import os
 import re
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import weakref
+import numpy as np
+import pandas as pd
 import streamlit as st
-from typing import List, Optional
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Sequence
+from utils.fetch_engine import run_fetch_graph
+from utils.geojson_stream import parse_feature_collection
 from utils.resilience import request_json
+from utils.spc_geometry import LayerRaster, PreparedLayer, prepare_layer
 
-@st.cache_data(ttl=300, show_spinner=False)
 def get_spc_location_percents_cached(lat: float, lon: float) -> dict:
-    return get_spc_location_percents(lat, lon)
+    return _call_for_issuance(_get_spc_location_percents_for_issuance, lat, lon, spc_issuance_key())
+
+
+@st.cache_data(max_entries=2048, show_spinner=False)
+def _get_spc_location_percents_for_issuance(lat: float, lon: float, issuance: str) -> dict:
+    return _unless_issuance_changed(get_spc_location_percents(lat, lon), issuance, spc_issuance_key)
 
 
-@st.cache_data(ttl=300, show_spinner=False)
 def get_spc_day1_national_summary_cached() -> dict:
-    return get_spc_day1_national_summary()
+    return _call_for_issuance(_get_spc_day1_national_summary_for_issuance, spc_issuance_key(("Day 1",)))
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _get_spc_day1_national_summary_for_issuance(issuance: str) -> dict:
+    return _unless_issuance_changed(
+        get_spc_day1_national_summary(), issuance, lambda: spc_issuance_key(("Day 1",))
+    )
+
+# "local" answers point hazard/probability queries from the cached layer
+# GeoJSON; "query" asks the MapServer to intersect every point remotely.
+SPC_POINT_EVAL_MODE = os.getenv("SPC_POINT_EVAL_MODE", "local").strip().lower()
+# Burn each layer into a CONUS uint8 raster so most point lookups are array
+# indexing; cells near polygon edges still use the exact polygon test.
+SPC_POINT_RASTER = os.getenv("SPC_POINT_RASTER", "1").strip().lower() not in {"0", "false", "no"}
+# SPC caches are keyed on each layer's issuance token instead of a fixed TTL.
+# Tokens are re-polled (attributes only, no geometry) at most this often; when
+# a poll or a layer download fails, the key also rotates every
+# SPC_ISSUANCE_RETRY_SECONDS so degraded results are retried.
+SPC_ISSUANCE_POLL_SECONDS = float(os.getenv("SPC_ISSUANCE_POLL_SECONDS", "60"))
+SPC_ISSUANCE_RETRY_SECONDS = float(os.getenv("SPC_ISSUANCE_RETRY_SECONDS", "300"))
+# The MapServer layer list rarely changes; re-read it on this schedule, or
+# sooner when a layer query reports that the layer id no longer exists.
+SPC_CATALOG_REFRESH_SECONDS = float(os.getenv("SPC_CATALOG_REFRESH_SECONDS", "3600"))
+SPC_CATALOG_MIN_REFRESH_SECONDS = float(os.getenv("SPC_CATALOG_MIN_REFRESH_SECONDS", "60"))
 
 SPC_BASE = "https://mapservices.weather.noaa.gov/vector/rest/services/outlooks/SPC_wx_outlks/MapServer"
 
@@ -30,7 +67,19 @@ def _validate_dict_payload(payload: object) -> dict:
 
 
 def _get_json(url: str, params: Optional[dict] = None, timeout: int = 8, endpoint: str = "spc.json") -> dict:
-    payload, _status = request_json(
+    payload, _status = _get_json_with_status(url, params=params, timeout=timeout, endpoint=endpoint)
+    return payload
+
+
+def _get_json_with_status(
+    url: str,
+    params: Optional[dict] = None,
+    timeout: int = 8,
+    endpoint: str = "spc.json",
+    stream_parser: Optional[Callable[[Iterable[bytes]], Any]] = None,
+    max_stale_seconds: Optional[float] = None,
+) -> tuple[dict, dict]:
+    return request_json(
         url=url,
         params=params,
         headers=HEADERS,
@@ -39,38 +88,286 @@ def _get_json(url: str, params: Optional[dict] = None, timeout: int = 8, endpoin
         source="NOAA/SPC map service",
         cache_key=f"spc:{endpoint}:{url}:{repr(sorted((params or {}).items()))}",
         validator=_validate_dict_payload,
+        stream_parser=stream_parser,
+        max_stale_seconds=max_stale_seconds,
     )
-    return payload
 
-_service_info_cache: Optional[dict] = None
+_LAYER_DAY_RE = re.compile(r"\bday\s*(\d(?:\s*-\s*\d)?)\b")
+_LAYER_PRODUCTS = ("categorical", "probabilistic", "significant")
+_LAYER_HAZARDS = ("tornado", "hail", "wind")
+
+
+def _parse_layer_name(name: str) -> Optional[tuple[str, str, Optional[str]]]:
+    """Map a layer name such as "Day 1 Probabilistic Tornado Outlook" to (day, product, hazard)."""
+    lowered = name.lower()
+    day_match = _LAYER_DAY_RE.search(lowered)
+    if day_match is None:
+        return None
+    day = "Day " + re.sub(r"\s+", "", day_match.group(1))
+    if "significant" in lowered:
+        product = "significant"
+    elif "prob" in lowered:
+        product = "probabilistic"
+    else:
+        product = next((candidate for candidate in _LAYER_PRODUCTS if candidate in lowered), None)
+    if product is None:
+        return None
+    hazard = next((candidate for candidate in _LAYER_HAZARDS if candidate in lowered), None)
+    return day, product, hazard
+
+
+class SpcLayerCatalog:
+    """
+    Parsed MapServer layer list, indexed by (day, product, hazard).
+
+    The service info is fetched once and re-read every SPC_CATALOG_REFRESH_SECONDS,
+    or on the next lookup after invalidate() (a layer query hit a missing id).
+    Substring lookups are memoized per catalog version, so point queries never
+    rescan the layer list. Safe to share across the fetch executor's workers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._service_info: dict = {}
+        self._names: list[tuple[int, str]] = []
+        self._index: dict[tuple[str, str, Optional[str]], int] = {}
+        self._lookups: dict[tuple, Optional[int]] = {}
+        self._loaded_at: Optional[float] = None
+        self._stale = False
+
+    def _due(self, now: float) -> bool:
+        if self._loaded_at is None:
+            return True
+        age = now - self._loaded_at
+        if not self._names or self._stale:
+            return age >= SPC_CATALOG_MIN_REFRESH_SECONDS
+        return age >= SPC_CATALOG_REFRESH_SECONDS
+
+    def _ensure_fresh(self) -> None:
+        if not self._due(time.monotonic()):
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not self._due(now):
+                return
+            # A refresh exists to see the current layer list, so it must not be
+            # answered from the serve-while-revalidating copy.
+            payload, status = _get_json_with_status(
+                SPC_BASE, params={"f": "pjson"}, endpoint="spc.service_info", max_stale_seconds=0
+            )
+            layers = payload.get("layers", []) or []
+            self._loaded_at = now
+            if not layers and self._names:
+                # Keep the last good catalog; try again after the short interval.
+                return
+            names: list[tuple[int, str]] = []
+            index: dict[tuple[str, str, Optional[str]], int] = {}
+            for lyr in layers:
+                try:
+                    layer_id = int(lyr["id"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                name = str(lyr.get("name") or "")
+                names.append((layer_id, name.lower()))
+                parsed = _parse_layer_name(name)
+                if parsed is not None:
+                    index.setdefault(parsed, layer_id)
+            self._service_info = payload
+            self._names = names
+            self._index = index
+            self._lookups = {}
+            # Only a failed fetch ("stale" copy or "unavailable") earns the short
+            # retry interval; a live answer clears it.
+            self._stale = status.get("status") in {"stale", "unavailable"}
+
+    def invalidate(self) -> None:
+        """Re-read the layer list on the next lookup (rate-limited)."""
+        with self._lock:
+            self._stale = True
+
+    @property
+    def service_info(self) -> dict:
+        self._ensure_fresh()
+        return self._service_info
+
+    def layer(self, day: str, product: str, hazard: Optional[str] = None) -> Optional[int]:
+        self._ensure_fresh()
+        return self._index.get((day, product.lower(), hazard.lower() if hazard else None))
+
+    def find(self, day_label: str, keywords: Sequence[str]) -> Optional[int]:
+        """First layer whose name contains the day label and every keyword."""
+        self._ensure_fresh()
+        lookup_key = (day_label.lower(), tuple(k.lower() for k in keywords))
+        lookups = self._lookups
+        if lookup_key in lookups:
+            return lookups[lookup_key]
+        day, keys = lookup_key
+        found = next(
+            (layer_id for layer_id, name in self._names if day in name and all(k in name for k in keys)),
+            None,
+        )
+        lookups[lookup_key] = found
+        return found
+
+
+_catalog = SpcLayerCatalog()
+
+
+def _note_missing_layer(payload: dict, status: dict) -> None:
+    # ArcGIS answers an unknown layer id with HTTP 200 and an error body; the
+    # resilience layer reports a real 404 through error_message.
+    error = payload.get("error") if isinstance(payload, dict) else None
+    code = error.get("code") if isinstance(error, dict) else None
+    if code in (400, 404) or "HTTP 404" in str(status.get("error_message") or ""):
+        _catalog.invalidate()
+
 
 def spc_service_info() -> dict:
-    global _service_info_cache
-    if _service_info_cache is None:
-        _service_info_cache = _get_json(SPC_BASE, params={"f": "pjson"}, endpoint="spc.service_info")
-    return _service_info_cache
+    return _catalog.service_info
 
 def find_layer_id(day_label: str, contains: str) -> Optional[int]:
     """
     Find a layer ID by matching substrings in the layer name.
     Example: day_label="Day 1", contains="Categorical"
     """
-    day = day_label.lower()
-    key = contains.lower()
-    for lyr in spc_service_info().get("layers", []) or []:
-        name = (lyr.get("name") or "").lower()
-        if day in name and key in name:
-            return int(lyr["id"])
+    found = _catalog.find(day_label, [contains])
     # fallback for "probabilistic" naming variations
-    if key == "probabilistic":
-        for lyr in spc_service_info().get("layers", []) or []:
-            name = (lyr.get("name") or "").lower()
-            if day in name and ("prob" in name or "probability" in name):
-                return int(lyr["id"])
-    return None
+    if found is None and contains.lower() == "probabilistic":
+        found = _catalog.find(day_label, ["prob"])
+    return found
+
+
+_issuance_lock = threading.Lock()
+_issuance_tokens: dict[int, tuple[float, Optional[str], Optional[list[dict]]]] = {}
+_layer_healthy: dict[int, bool] = {}
+# Combined keys per day set; every page render asks for one, so they are
+# reused for SPC_ISSUANCE_POLL_SECONDS instead of re-resolving each layer.
+_issuance_keys: dict[tuple[str, ...], tuple[float, str]] = {}
+
+
+class _IssuanceChanged(Exception):
+    """Carries a result out of an issuance-keyed cache without memoizing it.
+
+    A layer download that fails (or recovers) while the result is computed
+    moves the layer to (or off) a retry-bucket key, so the result belongs to
+    the new key; memoizing it under the old one would serve a failed download
+    again once the layer is healthy. Streamlit never memoizes a call that raises.
+    """
+
+    def __init__(self, value: Any) -> None:
+        super().__init__()
+        self.value = value
+
+
+def _unless_issuance_changed(value: Any, issuance: str, current_issuance: Callable[[], str]) -> Any:
+    """Return value from an issuance-keyed cache, or raise _IssuanceChanged to skip the memo."""
+    if current_issuance() != issuance:
+        raise _IssuanceChanged(value)
+    return value
+
+
+def _call_for_issuance(fn: Callable[..., Any], *args: Any) -> Any:
+    """Call an issuance-keyed cached function, unwrapping an _IssuanceChanged result."""
+    try:
+        return fn(*args)
+    except _IssuanceChanged as changed:
+        return changed.value
+
+
+def _poll_layer_issuance(layer_id: int) -> tuple[Optional[str], Optional[list[dict]]]:
+    # Attribute-only query: a few hundred bytes that change whenever SPC
+    # reissues the layer (issue/valid/expire stamps, labels, feature count).
+    # The attributes are kept for layer_attributes().
+    url = f"{SPC_BASE}/{layer_id}/query"
+    params = {
+        "where": "1=1",
+        "outFields": "*",
+        "returnGeometry": "false",
+        "f": "json",
+    }
+    payload, status = _get_json_with_status(url, params=params, endpoint=f"spc.issuance.{layer_id}")
+    _note_missing_layer(payload, status)
+    if "features" not in payload:
+        return None, None
+    attributes = [feat.get("attributes", {}) or {} for feat in payload.get("features", []) or []]
+    if status.get("status") != "live":
+        return None, attributes
+    encoded = sorted(json.dumps(attrs, sort_keys=True, default=str) for attrs in attributes)
+    return hashlib.blake2b("\n".join(encoded).encode("utf-8"), digest_size=12).hexdigest(), attributes
+
+
+def _polled_layer(layer_id: int) -> tuple[float, Optional[str], Optional[list[dict]]]:
+    now = time.monotonic()
+    with _issuance_lock:
+        cached = _issuance_tokens.get(layer_id)
+    if cached is None or now - cached[0] >= SPC_ISSUANCE_POLL_SECONDS:
+        cached = (now, *_poll_layer_issuance(layer_id))
+        with _issuance_lock:
+            _issuance_tokens[layer_id] = cached
+    return cached
+
+
+def layer_issuance(layer_id: int) -> str:
+    """Cache key for the layer's current SPC issuance."""
+    token = _polled_layer(layer_id)[1]
+    if token is None or not _layer_healthy.get(layer_id, True):
+        retry_bucket = int(time.time() // SPC_ISSUANCE_RETRY_SECONDS)
+        return f"{token or 'unknown'}~{retry_bucket}"
+    return token
+
+
+def layer_attributes(layer_id: int) -> list[dict]:
+    """
+    Per-feature attributes of a layer without any geometry (returnGeometry=false).
+
+    Served from the issuance poll, so national summaries never download the
+    full-resolution polygons; those stay reserved for point evaluation.
+    """
+    return _polled_layer(layer_id)[2] or []
+
+
+def _issuance_layer_ids(days: Sequence[str]) -> list[int]:
+    layer_ids: list[int] = []
+    for day in days:
+        layer_ids.append(find_layer_id(day, "Categorical"))
+        layer_ids.extend(hazard_layer_id(day, hazard) for hazard in DAY_HAZARD_LAYER_IDS.get(day, {}))
+        if day == "Day 3":
+            layer_ids.append(find_layer_id(day, "Probabilistic") or find_layer_id(day, "Probability"))
+    return sorted({layer_id for layer_id in layer_ids if layer_id is not None})
+
+
+def spc_issuance_key(days: Sequence[str] = ("Day 1", "Day 2", "Day 3")) -> str:
+    """Combined issuance key for every layer behind the given outlook days."""
+    days = tuple(days)
+    now = time.monotonic()
+    with _issuance_lock:
+        cached = _issuance_keys.get(days)
+    if cached is not None and now - cached[0] < SPC_ISSUANCE_POLL_SECONDS:
+        return cached[1]
+    layer_ids = _issuance_layer_ids(days)
+    futures = run_fetch_graph(
+        {str(layer_id): (lambda layer_id=layer_id: layer_issuance(layer_id)) for layer_id in layer_ids},
+        lane="spc",
+    )
+    key = "|".join(f"{layer_id}:{futures[str(layer_id)].result()}" for layer_id in layer_ids)
+    with _issuance_lock:
+        _issuance_keys[days] = (now, key)
+    return key
+
 
-@st.cache_data(ttl=300, show_spinner=False)
 def layer_geojson(layer_id: int) -> dict:
+    payload, live = _call_for_issuance(_layer_geojson_for_issuance, layer_id, layer_issuance(layer_id))
+    if _layer_healthy.get(layer_id, True) != live:
+        # Health changes the layer's key (retry buckets), so rebuild the
+        # combined keys rather than serve the old one until it expires.
+        with _issuance_lock:
+            _issuance_keys.clear()
+    _layer_healthy[layer_id] = live
+    return payload
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _layer_geojson_for_issuance(layer_id: int, issuance: str) -> tuple[dict, bool]:
     url = f"{SPC_BASE}/{layer_id}/query"
     params = {
         "where": "1=1",
@@ -78,7 +375,98 @@ def layer_geojson(layer_id: int) -> dict:
         "returnGeometry": "true",
         "f": "geojson",
     }
-    return _get_json(url, params=params, endpoint=f"spc.layer_geojson.{layer_id}")
+    # Outbreak-day layers run to several MB; stream them straight into
+    # coordinate arrays instead of nested lists.
+    payload, status = _get_json_with_status(
+        url,
+        params=params,
+        endpoint=f"spc.layer_geojson.{layer_id}",
+        stream_parser=parse_feature_collection,
+    )
+    _note_missing_layer(payload, status)
+    live = status.get("status") == "live"
+    if not live and "~" not in issuance:
+        # A degraded download is only memoized under a retry-bucket key, which
+        # rotates; under the healthy token it would outlive the recovery.
+        raise _IssuanceChanged((payload, live))
+    return payload, live
+
+
+_prepared_layers: dict[int, PreparedLayer] = {}
+
+
+def prepared_layer(layer_id: int) -> PreparedLayer:
+    return _call_for_issuance(_prepared_layer_for_issuance, layer_id, layer_issuance(layer_id))
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _prepared_layer_for_issuance(layer_id: int, issuance: str) -> PreparedLayer:
+    # Shared across reruns (cache_data would re-pickle the arrays on every
+    # hit). A new issuance key only rebuilds the spatial index if the layer
+    # payload actually changed.
+    layer = prepare_layer(layer_geojson(layer_id), previous=_prepared_layers.get(layer_id))
+    _prepared_layers[layer_id] = layer
+    return _unless_issuance_changed(layer, issuance, lambda: layer_issuance(layer_id))
+
+
+def _local_layer(layer_id: int) -> Optional[PreparedLayer]:
+    """Prepared layer for local point evaluation, or None to fall back to a remote query."""
+    if SPC_POINT_EVAL_MODE != "local":
+        return None
+    layer = prepared_layer(layer_id)
+    return layer if layer.loaded else None
+
+
+def _select_fields(props: dict, fields: tuple[str, ...]) -> dict:
+    # Mirror a remote query's outFields so attribute scans see the same keys.
+    return {key: value for key, value in props.items() if key.lower() in fields}
+
+
+def _raster_values(layer: PreparedLayer, kind: str) -> dict[str, np.ndarray]:
+    columns = layer_columns(layer)
+    if kind == "category":
+        return {"rank": columns["rank"]}
+    if kind == "hazard":
+        return {"percent": np.maximum(columns["hazard_percent"], 0), "cig": columns["cig"]}
+    return {"percent": np.maximum(columns["percent"], 0)}
+
+
+_layer_rasters: dict[tuple[int, str], LayerRaster] = {}
+
+
+def layer_raster(layer_id: int, kind: str) -> Optional[LayerRaster]:
+    """CONUS raster of one layer's per-feature values; kind is category, hazard or probability."""
+    return _call_for_issuance(_layer_raster_for_issuance, layer_id, kind, layer_issuance(layer_id))
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _layer_raster_for_issuance(layer_id: int, kind: str, issuance: str) -> Optional[LayerRaster]:
+    try:
+        layer = _prepared_layer_for_issuance(layer_id, issuance)
+    except _IssuanceChanged:
+        # No raster for a layer that is changing key; lookups use the exact test.
+        raise _IssuanceChanged(None)
+    if not layer.loaded:
+        return None
+    previous = _layer_rasters.get((layer_id, kind))
+    if previous is not None and previous.fingerprint == layer.fingerprint:
+        return previous
+    raster = LayerRaster(layer, _raster_values(layer, kind))
+    _layer_rasters[(layer_id, kind)] = raster
+    return raster
+
+
+def _raster_lookup(layer_id: int, kind: str, lon: float, lat: float) -> Optional[dict[str, int]]:
+    """All raster values at the point, or None when the exact polygon test must decide."""
+    if not SPC_POINT_RASTER:
+        return None
+    raster = layer_raster(layer_id, kind)
+    if raster is None:
+        return None
+    values = {name: raster.lookup(name, lon, lat) for name in raster.grids}
+    if any(value is None for value in values.values()):
+        return None
+    return values
 
 
 def _point_in_ring(x: float, y: float, ring: list) -> bool:
@@ -128,6 +516,7 @@ def point_in_geometry(lon: float, lat: float, geom: dict) -> bool:
     return False
 
 _CAT_RANK = {"TSTM": 1, "MRGL": 2, "SLGT": 3, "ENH": 4, "MDT": 5, "HIGH": 6}
+_CAT_LABELS = {rank: label for label, rank in _CAT_RANK.items()}
 
 def _extract_label(props: dict) -> str:
     for k in ("LABEL", "label", "CAT", "cat", "RISK", "risk", "Name", "name"):
@@ -136,19 +525,24 @@ def _extract_label(props: dict) -> str:
             return str(v).strip()
     return ""
 
+_FRACTION_RE = re.compile(r"0?\.\d{2}")
+_PERCENT_RE = re.compile(r"(\d{1,2})\s*%?")
+_CIG_RE = re.compile(r"\b(CIG[1-3])\b")
+_HAZARD_FIELDS = ("dn", "label", "label2")
+
+
 def _extract_percent(props: dict) -> Optional[int]:
-    label = _extract_label(props)
-    if "cig" in label.lower():
+    lab = _extract_label(props)
+    if "cig" in lab.lower():
         return None
 
     # Most services include LABEL like "5%", "15%", or "0.15"
-    lab = _extract_label(props)
-    if re.fullmatch(r"0?\.\d{2}", lab):
+    if _FRACTION_RE.fullmatch(lab):
         val = int(round(float(lab) * 100))
         if 0 < val <= 100:
             return val
 
-    m = re.search(r"(\d{1,2})\s*%?", lab)
+    m = _PERCENT_RE.search(lab)
     if m:
         val = int(m.group(1))
         if 0 < val <= 100:
@@ -162,7 +556,7 @@ def _extract_percent(props: dict) -> Optional[int]:
             s = v.strip().replace("%", "")
             if s.lower().startswith("cig"):
                 continue
-            if re.fullmatch(r"0?\.\d{2}", s):
+            if _FRACTION_RE.fullmatch(s):
                 val = int(round(float(s) * 100))
                 if 0 < val <= 100:
                     return val
@@ -178,36 +572,85 @@ def _extract_cig(props: dict) -> Optional[str]:
         value = props.get(key)
         if not isinstance(value, str):
             continue
-        match = re.search(r"\b(CIG[1-3])\b", value.upper())
+        match = _CIG_RE.search(value.upper())
         if match:
             return match.group(1)
     return None
 
+
+def _feature_columns(attributes: Iterable[dict]) -> dict[str, np.ndarray]:
+    """
+    Parse per-feature attributes once into typed columns.
+
+    rank is the categorical rank (0 = none), percent the probability read from
+    every field (-1 = none), hazard_percent and cig the percent and CIG level
+    read from only dn/label/label2, as the hazard queries request them.
+    """
+    rank: list[int] = []
+    percent: list[int] = []
+    hazard_percent: list[int] = []
+    cig: list[int] = []
+    for props in attributes:
+        props = props or {}
+        hazard_props = _select_fields(props, _HAZARD_FIELDS)
+        rank.append(_CAT_RANK.get(_extract_label(props).upper(), 0))
+        pct = _extract_percent(props)
+        percent.append(-1 if pct is None else pct)
+        pct = _extract_percent(hazard_props)
+        hazard_percent.append(-1 if pct is None else pct)
+        level = _extract_cig(hazard_props)
+        cig.append(int(level[-1]) if level else 0)
+    return {
+        "rank": np.array(rank, dtype=np.int64),
+        "percent": np.array(percent, dtype=np.int64),
+        "hazard_percent": np.array(hazard_percent, dtype=np.int64),
+        "cig": np.array(cig, dtype=np.int64),
+    }
+
+
+_layer_columns: "weakref.WeakKeyDictionary[PreparedLayer, dict[str, np.ndarray]]" = weakref.WeakKeyDictionary()
+
+
+def layer_columns(layer: PreparedLayer) -> dict[str, np.ndarray]:
+    """_feature_columns for a prepared layer, computed once per layer load."""
+    columns = _layer_columns.get(layer)
+    if columns is None:
+        columns = _feature_columns(feat.get("properties", {}) or {} for feat in layer.features)
+        _layer_columns[layer] = columns
+    return columns
+
+
+def _column_max(column: np.ndarray, mask: Optional[np.ndarray] = None) -> int:
+    values = column if mask is None else column[mask]
+    return int(values.max()) if values.size else -1
+
+
+def _percent_or_none(value: int) -> Optional[int]:
+    return value if value > 0 else None
+
 def point_day1_3_category(lat: float, lon: float, day: str) -> str:
     layer_id = find_layer_id(day, "Categorical")
     if layer_id is None:
         return "—"
-    gj = layer_geojson(layer_id)
-
-    best = None
-    best_rank = 0
-
-    for feat in gj.get("features", []) or []:
-        if not point_in_geometry(lon, lat, feat.get("geometry", {})):
-            continue
-        lab = _extract_label(feat.get("properties", {}) or "").upper()
-        rank = _CAT_RANK.get(lab, 0)
-        if rank > best_rank:
-            best_rank = rank
-            best = lab
-
-    return best if best else "NONE"
+    cached = _raster_lookup(layer_id, "category", lon, lat)
+    if cached is not None:
+        return _CAT_LABELS.get(cached["rank"], "NONE")
+    layer = prepared_layer(layer_id)
+    rank = _column_max(layer_columns(layer)["rank"], layer.contains(lon, lat))
+    return _CAT_LABELS.get(rank, "NONE")
 
 def point_day_prob(lat: float, lon: float, day: str) -> Optional[int]:
     layer_id = find_layer_id(day, "Probabilistic") or find_layer_id(day, "Probability")
     if layer_id is None:
         return None
 
+    layer = _local_layer(layer_id)
+    if layer is not None:
+        cached = _raster_lookup(layer_id, "probability", lon, lat)
+        if cached is not None:
+            return cached["percent"] or None
+        return _percent_or_none(_column_max(layer_columns(layer)["percent"], layer.contains(lon, lat)))
+
     url = f"{SPC_BASE}/{layer_id}/query"
     params = {
         "f": "json",
@@ -220,17 +663,11 @@ def point_day_prob(lat: float, lon: float, day: str) -> Optional[int]:
     }
 
     data = _get_json(url, params=params, endpoint=f"spc.day_prob.{day.lower().replace(' ', '_')}")
+    return _best_percent(feat.get("attributes", {}) for feat in data.get("features", []) or [])
 
-    best = None
-    for feat in data.get("features", []) or []:
-        props = feat.get("attributes", {})
-        pct = _extract_percent(props)
-        if pct is None:
-            continue
-        if best is None or pct > best:
-            best = pct
 
-    return best
+def _best_percent(attributes: Iterable[dict]) -> Optional[int]:
+    return _percent_or_none(_column_max(_feature_columns(attributes)["percent"]))
 
 def get_spc_point_summary(lat: float, lon: float) -> dict:
     """
@@ -253,14 +690,9 @@ def _find_layer_id_any(day_label: str, keywords: List[str]) -> Optional[int]:
     """
     More flexible layer finder: all keywords must appear in layer name.
     """
-    day = day_label.lower()
-    keys = [k.lower() for k in keywords]
-    for lyr in spc_service_info().get("layers", []) or []:
-        name = (lyr.get("name") or "").lower()
-        if day in name and all(k in name for k in keys):
-            return int(lyr["id"])
-    return None
+    return _catalog.find(day_label, keywords)
 
+# Known ids, used when the catalog cannot be read or does not list the layer.
 DAY_HAZARD_LAYER_IDS = {
     "Day 1": {
         "tornado": 3,
@@ -274,10 +706,18 @@ DAY_HAZARD_LAYER_IDS = {
     },
 }
 
+
+def hazard_layer_id(day: str, hazard: str) -> Optional[int]:
+    """Layer id of the probabilistic outlook for one Day 1/2 hazard."""
+    hz = hazard.lower()
+    if hz not in DAY_HAZARD_LAYER_IDS.get(day, {}):
+        return None
+    return _catalog.layer(day, "probabilistic", hz) or DAY_HAZARD_LAYER_IDS[day][hz]
+
 def point_hazard_percent(lat: float, lon: float, day: str, hazard: str) -> Optional[int]:
     hz = hazard.lower()
 
-    layer_id = DAY_HAZARD_LAYER_IDS.get(day, {}).get(hz)
+    layer_id = hazard_layer_id(day, hz)
     if layer_id is None:
         return None
 
@@ -309,10 +749,20 @@ def point_hazard_percent(lat: float, lon: float, day: str, hazard: str) -> Optio
 
 def point_hazard_summary(lat: float, lon: float, day: str, hazard: str) -> dict:
     hz = hazard.lower()
-    layer_id = DAY_HAZARD_LAYER_IDS.get(day, {}).get(hz)
+    layer_id = hazard_layer_id(day, hz)
     if layer_id is None:
         return {"percent": None, "cig": None}
 
+    layer = _local_layer(layer_id)
+    if layer is not None:
+        cached = _raster_lookup(layer_id, "hazard", lon, lat)
+        if cached is not None:
+            return {
+                "percent": cached["percent"] or None,
+                "cig": f"CIG{cached['cig']}" if cached["cig"] else None,
+            }
+        return _summarize_hazard_columns(layer_columns(layer), layer.contains(lon, lat))
+
     url = f"{SPC_BASE}/{layer_id}/query"
     params = {
         "f": "json",
@@ -327,26 +777,19 @@ def point_hazard_summary(lat: float, lon: float, day: str, hazard: str) -> dict:
     }
 
     data = _get_json(url, params=params, endpoint=f"spc.point_hazard_summary.{day.lower().replace(' ', '_')}.{hz}")
+    return _summarize_hazard_attributes(feat.get("attributes", {}) or {} for feat in data.get("features", []) or [])
 
-    best_percent = None
-    best_cig = None
-    best_cig_rank = 0
-
-    for feat in data.get("features", []) or []:
-        props = feat.get("attributes", {}) or {}
 
-        pct = _extract_percent(props)
-        if pct is not None and (best_percent is None or pct > best_percent):
-            best_percent = pct
+def _summarize_hazard_attributes(attributes: Iterable[dict]) -> dict:
+    return _summarize_hazard_columns(_feature_columns(attributes))
 
-        cig = _extract_cig(props)
-        if cig:
-            rank = int(cig[-1])
-            if rank > best_cig_rank:
-                best_cig = cig
-                best_cig_rank = rank
 
-    return {"percent": best_percent, "cig": best_cig}
+def _summarize_hazard_columns(columns: dict[str, np.ndarray], mask: Optional[np.ndarray] = None) -> dict:
+    cig_rank = _column_max(columns["cig"], mask)
+    return {
+        "percent": _percent_or_none(_column_max(columns["hazard_percent"], mask)),
+        "cig": f"CIG{cig_rank}" if cig_rank > 0 else None,
+    }
 
 
 def get_day1_location_hazard_labels(location_summary: dict) -> list[str]:
@@ -387,13 +830,16 @@ def get_spc_location_percents(lat: float, lon: float) -> dict:
         "d2_hail": ("Day 2", "hail"),
     }
 
-    with ThreadPoolExecutor(max_workers=len(tasks) + 2) as executor:
-        futures = {
-            key: executor.submit(point_hazard_summary, lat, lon, day, hazard)
-            for key, (day, hazard) in tasks.items()
-        }
-        d3_future = executor.submit(point_day_prob, lat, lon, "Day 3")
-        d1_cat_future = executor.submit(point_day1_3_category, lat, lon, "Day 1")
+    graph = {
+        key: (lambda day=day, hazard=hazard: point_hazard_summary(lat, lon, day, hazard))
+        for key, (day, hazard) in tasks.items()
+    }
+    graph["d3_prob"] = lambda: point_day_prob(lat, lon, "Day 3")
+    graph["day1_cat"] = lambda: point_day1_3_category(lat, lon, "Day 1")
+    futures = run_fetch_graph(graph, lane="spc")
+    d3_future = futures["d3_prob"]
+    d1_cat_future = futures["day1_cat"]
+
     def _future_or_default(key: str) -> dict:
         try:
             return futures[key].result()
@@ -434,8 +880,107 @@ def get_spc_location_percents(lat: float, lon: float) -> dict:
     }
 
 
-@st.cache_data(ttl=300, show_spinner=False)
+def _batch_max(inside: np.ndarray, values: np.ndarray) -> np.ndarray:
+    # Per-point maximum of a layer_columns column over the features containing it; -1 = none.
+    if inside.shape[1] == 0:
+        return np.full(inside.shape[0], -1, dtype=np.int64)
+    return np.where(inside, values[None, :], -1).max(axis=1)
+
+
+def _batch_percent_column(best: np.ndarray, index: pd.Index) -> pd.Series:
+    return pd.Series([int(value) if value > 0 else pd.NA for value in best], index=index, dtype="Int64")
+
+
+def get_spc_location_percents_batch(
+    points: Mapping[str, tuple[float, float]] | Iterable[tuple[float, float]],
+) -> pd.DataFrame:
+    """
+    Evaluate many (lat, lon) points against the SPC layers in one vectorized pass.
+
+    ``points`` is an iterable of (lat, lon) pairs or a mapping of name -> (lat, lon)
+    such as CITY_PRESETS (names become the index). Returns one row per point with
+    day1_cat..day3_cat, the get_spc_location_percents hazard/CIG columns and d3_prob.
+    Layers that could not be loaded leave their columns empty rather than falling
+    back to per-point queries.
+    """
+    if isinstance(points, Mapping):
+        index = list(points.keys())
+        coords = list(points.values())
+    else:
+        coords = list(points)
+        index = None
+    lats = np.array([float(lat) for lat, _lon in coords], dtype=np.float64)
+    lons = np.array([float(lon) for _lat, lon in coords], dtype=np.float64)
+    frame = pd.DataFrame({"lat": lats, "lon": lons}, index=index)
+
+    category_ids = {day: find_layer_id(day, "Categorical") for day in ("Day 1", "Day 2", "Day 3")}
+    d3_prob_id = find_layer_id("Day 3", "Probabilistic") or find_layer_id("Day 3", "Probability")
+    layer_ids = {layer_id for layer_id in category_ids.values() if layer_id is not None}
+    layer_ids |= {hazard_layer_id(day, hazard) for day, hazards in DAY_HAZARD_LAYER_IDS.items() for hazard in hazards}
+    if d3_prob_id is not None:
+        layer_ids.add(d3_prob_id)
+
+    futures = run_fetch_graph(
+        {str(layer_id): (lambda layer_id=layer_id: prepared_layer(layer_id)) for layer_id in layer_ids},
+        lane="spc",
+    )
+
+    def _inside(layer_id: Optional[int]) -> Optional[tuple[PreparedLayer, np.ndarray]]:
+        if layer_id is None:
+            return None
+        try:
+            layer = futures[str(layer_id)].result()
+        except Exception:
+            return None
+        if not layer.loaded:
+            return None
+        return layer, layer.contains_many(lons, lats)
+
+    for day, layer_id in category_ids.items():
+        column = f"{day.lower().replace(' ', '')}_cat"
+        evaluated = _inside(layer_id)
+        if layer_id is None:
+            frame[column] = "—"
+            continue
+        if evaluated is None:
+            frame[column] = None
+            continue
+        layer, inside = evaluated
+        ranks = _batch_max(inside, layer_columns(layer)["rank"])
+        frame[column] = [_CAT_LABELS.get(rank, "NONE") for rank in ranks]
+
+    for day_prefix, day in (("d1", "Day 1"), ("d2", "Day 2")):
+        for short, hazard in (("tor", "tornado"), ("wind", "wind"), ("hail", "hail")):
+            column = f"{day_prefix}_{short}"
+            evaluated = _inside(hazard_layer_id(day, hazard))
+            if evaluated is None:
+                frame[column] = pd.Series(pd.NA, index=frame.index, dtype="Int64")
+                frame[f"{column}_cig"] = None
+                continue
+            layer, inside = evaluated
+            columns = layer_columns(layer)
+            percents = _batch_max(inside, columns["hazard_percent"])
+            cig_ranks = _batch_max(inside, columns["cig"])
+            frame[column] = _batch_percent_column(percents, frame.index)
+            frame[f"{column}_cig"] = [f"CIG{rank}" if rank > 0 else None for rank in cig_ranks]
+
+    evaluated = _inside(d3_prob_id)
+    if evaluated is None:
+        frame["d3_prob"] = pd.Series(pd.NA, index=frame.index, dtype="Int64")
+    else:
+        layer, inside = evaluated
+        percents = _batch_max(inside, layer_columns(layer)["percent"])
+        frame["d3_prob"] = _batch_percent_column(percents, frame.index)
+
+    return frame
+
+
 def get_spc_location_percents_with_status(lat: float, lon: float) -> tuple[dict, dict]:
+    return _call_for_issuance(_get_spc_location_percents_with_status_for_issuance, lat, lon, spc_issuance_key())
+
+
+@st.cache_data(max_entries=2048, show_spinner=False)
+def _get_spc_location_percents_with_status_for_issuance(lat: float, lon: float, issuance: str) -> tuple[dict, dict]:
     summary = get_spc_location_percents(lat, lon)
     hazard_fields = ("d1_tor", "d1_wind", "d1_hail", "d2_tor", "d2_wind", "d2_hail", "d3_prob")
     status = "live" if any(summary.get(field) is not None for field in hazard_fields) else "unavailable"
@@ -445,42 +990,30 @@ def get_spc_location_percents_with_status(lat: float, lon: float) -> tuple[dict,
         "summary": "Point-in-polygon and query-based SPC outlook summary." if status == "live" else "SPC point summary is unavailable right now.",
         "degraded": status != "live",
     }
-    return summary, meta
+    return _unless_issuance_changed((summary, meta), issuance, spc_issuance_key)
 
 
 def get_spc_day1_national_summary() -> dict:
     """Return the highest Day 1 categorical risk and hazard percentages nationwide."""
     category = "NONE"
-    category_rank = 0
-
     categorical_layer_id = find_layer_id("Day 1", "Categorical")
     if categorical_layer_id is not None:
-        gj = layer_geojson(categorical_layer_id)
-        for feat in gj.get("features", []) or []:
-            label = _extract_label(feat.get("properties", {}) or {}).upper()
-            rank = _CAT_RANK.get(label, 0)
-            if rank > category_rank:
-                category = label
-                category_rank = rank
+        rank = _column_max(_feature_columns(layer_attributes(categorical_layer_id))["rank"])
+        category = _CAT_LABELS.get(rank, "NONE")
 
     def _hazard_best_percent(hazard: str) -> Optional[int]:
-        layer_id = DAY_HAZARD_LAYER_IDS.get("Day 1", {}).get(hazard)
+        layer_id = hazard_layer_id("Day 1", hazard)
         if layer_id is None:
             return None
+        return _best_percent(layer_attributes(layer_id))
 
-        best_percent = None
-        gj = layer_geojson(layer_id)
-        for feat in gj.get("features", []) or []:
-            pct = _extract_percent(feat.get("properties", {}) or {})
-            if pct is not None and (best_percent is None or pct > best_percent):
-                best_percent = pct
-        return best_percent
-
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        hazard_futures = {
-            hazard: executor.submit(_hazard_best_percent, hazard)
+    hazard_futures = run_fetch_graph(
+        {
+            hazard: (lambda hazard=hazard: _hazard_best_percent(hazard))
             for hazard in ("tornado", "wind", "hail")
-        }
+        },
+        lane="spc",
+    )
 
     hazard_percents = {hazard: future.result() for hazard, future in hazard_futures.items()}
 
@@ -492,8 +1025,12 @@ def get_spc_day1_national_summary() -> dict:
     }
 
 
-@st.cache_data(ttl=300, show_spinner=False)
 def get_spc_day1_national_summary_with_status() -> tuple[dict, dict]:
+    return _call_for_issuance(_get_spc_day1_national_summary_with_status_for_issuance, spc_issuance_key(("Day 1",)))
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _get_spc_day1_national_summary_with_status_for_issuance(issuance: str) -> tuple[dict, dict]:
     summary = get_spc_day1_national_summary()
     available = any(summary.get(key) is not None for key in ("tornado", "wind", "hail")) or summary.get("category") not in (None, "NONE")
     meta = {
@@ -502,4 +1039,4 @@ def get_spc_day1_national_summary_with_status() -> tuple[dict, dict]:
         "summary": "National Day 1 SPC summary." if available else "National Day 1 SPC summary is unavailable right now.",
         "degraded": not available,
     }
-    return summary, meta
+    return _unless_issuance_changed((summary, meta), issuance, lambda: spc_issuance_key(("Day 1",)))
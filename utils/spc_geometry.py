@@ -0,0 +1,532 @@
+# utils/spc_geometry.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+
+# Grid cell size for the ring bucket index; SPC polygons span a few degrees,
+# so one-degree cells keep buckets short without exploding the cell count.
+GRID_CELL_DEGREES = 1.0
+
+# Upper bound on edge x point pairs evaluated per group in contains_many and
+# LayerRaster.
+_BATCH_CELLS = 4_000_000
+
+
+def _crossing_pairs(y1: np.ndarray, y2: np.ndarray, ys: np.ndarray) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Yield (edge, y index) pairs whose edge spans the sorted latitudes ``ys``.
+
+    (y1 > y) != (y2 > y) holds exactly for min(y1, y2) <= y < max(y1, y2), so
+    each edge pairs only with the latitudes in that span, found by binary
+    search; edges are grouped so each yield holds at most _BATCH_CELLS pairs.
+    """
+    first = np.searchsorted(ys, np.minimum(y1, y2), side="left")
+    counts = np.searchsorted(ys, np.maximum(y1, y2), side="left") - first
+    totals = np.cumsum(counts)
+    edge = 0
+    while edge < counts.size:
+        done = int(totals[edge - 1]) if edge else 0
+        group_end = max(edge + 1, int(np.searchsorted(totals, done + _BATCH_CELLS, side="right")))
+        group_counts = counts[edge:group_end]
+        pairs = int(totals[group_end - 1]) - done
+        if pairs:
+            edges = np.repeat(np.arange(edge, group_end), group_counts)
+            offsets = np.arange(pairs) - np.repeat(np.cumsum(group_counts) - group_counts, group_counts)
+            yield edges, first[edges] + offsets
+        edge = group_end
+
+
+def _geometry_polygons(geom: dict | None) -> list:
+    # Same shape rules as spc.point_in_geometry: only Polygon/MultiPolygon
+    # with non-empty coordinates can contain a point.
+    if not geom:
+        return []
+    coords = geom.get("coordinates")
+    if not coords:
+        return []
+    gtype = geom.get("type")
+    if gtype == "Polygon":
+        return [coords]
+    if gtype == "MultiPolygon":
+        return list(coords)
+    return []
+
+
+class PreparedLayer:
+    """A GeoJSON layer flattened into contiguous edge arrays for point queries.
+
+    Every ring edge (including the closing edge back to the first vertex) is
+    stored once, grouped by ring. A point query looks up the rings whose grid
+    cell and bounding box hold the point, runs the same ray-casting test as
+    ``spc._point_in_ring`` over only those rings' edges, then folds ring
+    parities into polygons (outer ring minus holes) and features.
+    """
+
+    def __init__(self, features: Iterable[dict], *, fingerprint: str | None = None, loaded: bool = True) -> None:
+        self.features: list[dict] = list(features)
+        self.fingerprint = fingerprint
+        # False when the payload had no "features" key at all (upstream
+        # unavailable), as opposed to a layer that is simply empty.
+        self.loaded = loaded
+
+        x1: list[np.ndarray] = []
+        y1: list[np.ndarray] = []
+        x2: list[np.ndarray] = []
+        y2: list[np.ndarray] = []
+        edge_ring: list[np.ndarray] = []
+        ring_polygon: list[int] = []
+        ring_is_hole: list[bool] = []
+        polygon_feature: list[int] = []
+        ring_bounds: list[tuple[float, float, float, float]] = []
+        ring_edge_start: list[int] = []
+        edge_total = 0
+
+        for feature_index, feature in enumerate(self.features):
+            for polygon in _geometry_polygons((feature or {}).get("geometry")):
+                if not polygon:
+                    continue
+                polygon_index = len(polygon_feature)
+                polygon_feature.append(feature_index)
+                for ring_position, ring in enumerate(polygon):
+                    ring_index = len(ring_polygon)
+                    ring_polygon.append(polygon_index)
+                    ring_is_hole.append(ring_position > 0)
+                    ring_edge_start.append(edge_total)
+                    # Rings with fewer than three vertices never contain a point,
+                    # so they keep an entry but contribute no edges.
+                    if len(ring) < 3:
+                        ring_bounds.append((np.inf, np.inf, -np.inf, -np.inf))
+                        continue
+                    if isinstance(ring, np.ndarray):
+                        # Streamed payloads (utils.geojson_stream) already hold float arrays.
+                        vertices = np.ascontiguousarray(ring[:, :2], dtype=np.float64)
+                    else:
+                        vertices = np.array([(point[0], point[1]) for point in ring], dtype=np.float64)
+                    ring_bounds.append(
+                        (vertices[:, 0].min(), vertices[:, 1].min(), vertices[:, 0].max(), vertices[:, 1].max())
+                    )
+                    edge_total += len(vertices)
+                    following = np.roll(vertices, -1, axis=0)
+                    x1.append(vertices[:, 0])
+                    y1.append(vertices[:, 1])
+                    x2.append(following[:, 0])
+                    y2.append(following[:, 1])
+                    edge_ring.append(np.full(len(vertices), ring_index, dtype=np.int64))
+
+        def _concat(parts: list[np.ndarray], dtype: Any) -> np.ndarray:
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+        self.x1 = _concat(x1, np.float64)
+        self.y1 = _concat(y1, np.float64)
+        self.x2 = _concat(x2, np.float64)
+        self.y2 = _concat(y2, np.float64)
+        self.edge_ring = _concat(edge_ring, np.int64)
+        self.ring_polygon = np.asarray(ring_polygon, dtype=np.int64)
+        self.ring_is_hole = np.asarray(ring_is_hole, dtype=bool)
+        self.polygon_feature = np.asarray(polygon_feature, dtype=np.int64)
+        self.ring_bounds = np.asarray(ring_bounds, dtype=np.float64).reshape(-1, 4)
+        self.ring_edge_start = np.asarray(ring_edge_start + [edge_total], dtype=np.int64)
+
+        self.feature_bounds = np.full((len(self.features), 4), [np.inf, np.inf, -np.inf, -np.inf])
+        if self.ring_polygon.size:
+            ring_feature = self.polygon_feature[self.ring_polygon]
+            np.minimum.at(self.feature_bounds[:, 0], ring_feature, self.ring_bounds[:, 0])
+            np.minimum.at(self.feature_bounds[:, 1], ring_feature, self.ring_bounds[:, 1])
+            np.maximum.at(self.feature_bounds[:, 2], ring_feature, self.ring_bounds[:, 2])
+            np.maximum.at(self.feature_bounds[:, 3], ring_feature, self.ring_bounds[:, 3])
+
+        self._grid = self._build_grid()
+
+    @staticmethod
+    def _cell(lon: float, lat: float) -> tuple[int, int]:
+        return int(np.floor(lon / GRID_CELL_DEGREES)), int(np.floor(lat / GRID_CELL_DEGREES))
+
+    def _build_grid(self) -> dict[tuple[int, int], np.ndarray]:
+        buckets: dict[tuple[int, int], list[int]] = {}
+        for ring_index, (min_x, min_y, max_x, max_y) in enumerate(self.ring_bounds):
+            if not np.isfinite(min_x):
+                continue
+            cell_x0, cell_y0 = self._cell(min_x, min_y)
+            cell_x1, cell_y1 = self._cell(max_x, max_y)
+            for cell_x in range(cell_x0, cell_x1 + 1):
+                for cell_y in range(cell_y0, cell_y1 + 1):
+                    buckets.setdefault((cell_x, cell_y), []).append(ring_index)
+        return {cell: np.asarray(rings, dtype=np.int64) for cell, rings in buckets.items()}
+
+    def candidate_rings(self, lon: float, lat: float) -> np.ndarray:
+        """Rings whose grid cell and bounding box contain the point."""
+        rings = self._grid.get(self._cell(lon, lat))
+        if rings is None:
+            return np.empty(0, dtype=np.int64)
+        bounds = self.ring_bounds[rings]
+        keep = (bounds[:, 0] <= lon) & (lon <= bounds[:, 2]) & (bounds[:, 1] <= lat) & (lat <= bounds[:, 3])
+        return rings[keep]
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.x1.size)
+
+    def contains(self, lon: float, lat: float) -> np.ndarray:
+        """Return a boolean array: which features contain (lon, lat)."""
+        inside = np.zeros(len(self.features), dtype=bool)
+        rings = self.candidate_rings(lon, lat)
+        if rings.size == 0:
+            return inside
+
+        starts = self.ring_edge_start[rings]
+        lengths = self.ring_edge_start[rings + 1] - starts
+        edges = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        crossing = edges[(self.y1[edges] > lat) != (self.y2[edges] > lat)]
+        x1 = self.x1[crossing]
+        y1 = self.y1[crossing]
+        # A crossing edge never has y1 == y2, so no zero-division guard is needed.
+        x_intersect = (self.x2[crossing] - x1) * (lat - y1) / (self.y2[crossing] - y1) + x1
+        hits = crossing[lon < x_intersect]
+
+        ring_inside = np.bincount(self.edge_ring[hits], minlength=self.ring_polygon.size) % 2 == 1
+        outer = ~self.ring_is_hole
+        polygon_inside = np.zeros(self.polygon_feature.size, dtype=bool)
+        polygon_inside[self.ring_polygon[outer]] = ring_inside[outer]
+        polygon_inside[self.ring_polygon[self.ring_is_hole & ring_inside]] = False
+
+        inside[self.polygon_feature[polygon_inside]] = True
+        return inside
+
+    def contains_many(self, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+        """Return a (points, features) boolean matrix for many points at once.
+
+        Each ring is tested only against the points inside its bounding box.
+        Those points are sorted by latitude so every edge is paired only with
+        the points whose latitude falls in its span (the only pairs a ray can
+        cross), and edges are taken in groups that keep the pair arrays to
+        _BATCH_CELLS, so 100k-point batches stay within modest memory.
+        """
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        point_count = lons.size
+        polygon_inside = np.zeros((point_count, self.polygon_feature.size), dtype=bool)
+        hole_inside = np.zeros_like(polygon_inside)
+
+        for ring_index, (min_x, min_y, max_x, max_y) in enumerate(self.ring_bounds):
+            start, stop = self.ring_edge_start[ring_index], self.ring_edge_start[ring_index + 1]
+            if stop == start:
+                continue
+            candidates = np.flatnonzero((lons >= min_x) & (lons <= max_x) & (lats >= min_y) & (lats <= max_y))
+            if candidates.size == 0:
+                continue
+            points = candidates[np.argsort(lats[candidates], kind="stable")]
+            px = lons[points]
+            py = lats[points]
+            x1, y1 = self.x1[start:stop], self.y1[start:stop]
+            x2, y2 = self.x2[start:stop], self.y2[start:stop]
+            crossings = np.zeros(points.size, dtype=np.int64)
+            for edges, at in _crossing_pairs(y1, y2, py):
+                x_intersect = (x2[edges] - x1[edges]) * (py[at] - y1[edges]) / (y2[edges] - y1[edges]) + x1[edges]
+                crossings += np.bincount(at[px[at] < x_intersect], minlength=points.size)
+            target = hole_inside if self.ring_is_hole[ring_index] else polygon_inside
+            target[points, self.ring_polygon[ring_index]] |= crossings % 2 == 1
+
+        polygon_inside &= ~hole_inside
+        feature_inside = np.zeros((point_count, len(self.features)), dtype=bool)
+        for polygon_index, feature_index in enumerate(self.polygon_feature):
+            feature_inside[:, feature_index] |= polygon_inside[:, polygon_index]
+        return feature_inside
+
+    def features_containing(self, lon: float, lat: float) -> list[dict]:
+        return [self.features[index] for index in np.flatnonzero(self.contains(lon, lat))]
+
+
+def _fingerprint_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16).hexdigest()
+        return f"ndarray:{value.dtype}:{value.shape}:{digest}"
+    return str(value)
+
+
+def layer_fingerprint(geojson: dict) -> str:
+    encoded = json.dumps(geojson or {}, sort_keys=True, separators=(",", ":"), default=_fingerprint_default)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def prepare_layer(geojson: dict, previous: PreparedLayer | None = None) -> PreparedLayer:
+    """Build the index for ``geojson``, reusing ``previous`` if the payload is unchanged."""
+    fingerprint = layer_fingerprint(geojson)
+    if previous is not None and previous.fingerprint == fingerprint:
+        return previous
+    geojson = geojson or {}
+    return PreparedLayer(geojson.get("features", []) or [], fingerprint=fingerprint, loaded="features" in geojson)
+
+
+# CONUS lon/lat window covered by LayerRaster; points outside it use the
+# exact polygon test.
+CONUS_BOUNDS = (-125.0, 24.0, -66.0, 50.0)
+RASTER_RESOLUTION_DEGREES = 0.05
+
+
+class LayerRaster:
+    """Per-feature values of a PreparedLayer burned into uint8 lat/lon grids.
+
+    Each grid cell holds the maximum value among the features containing the
+    cell centre (0 = none), computed with the same even-odd crossing rule as
+    the exact test. Cells near polygon boundaries are flagged so lookups there
+    defer to the exact test, which keeps answers identical to PreparedLayer
+    away from sub-cell slivers.
+    """
+
+    def __init__(
+        self,
+        layer: PreparedLayer,
+        values: dict[str, list[int | None]],
+        *,
+        bounds: tuple[float, float, float, float] = CONUS_BOUNDS,
+        resolution: float = RASTER_RESOLUTION_DEGREES,
+    ) -> None:
+        self.layer = layer
+        self.fingerprint = layer.fingerprint
+        self.min_x, self.min_y, max_x, max_y = bounds
+        self.resolution = resolution
+        self.cols = int(round((max_x - self.min_x) / resolution))
+        self.rows = int(round((max_y - self.min_y) / resolution))
+        self.col_x = self.min_x + (np.arange(self.cols) + 0.5) * resolution
+        self.row_y = self.min_y + (np.arange(self.rows) + 0.5) * resolution
+
+        self.grids = {name: np.zeros((self.rows, self.cols), dtype=np.uint8) for name in values}
+        self.boundary = np.zeros((self.rows, self.cols), dtype=bool)
+        feature_values = {
+            name: np.clip(np.array([value or 0 for value in per_feature], dtype=np.int64), 0, 255).astype(np.uint8)
+            for name, per_feature in values.items()
+        }
+
+        for feature_index, mask in self._feature_masks():
+            for name, grid in self.grids.items():
+                value = feature_values[name][feature_index]
+                if value:
+                    np.maximum(grid, np.where(mask, value, 0).astype(np.uint8), out=grid)
+
+        # Any cell whose 3x3 neighbourhood disagrees on some value is also
+        # treated as a boundary cell.
+        for grid in self.grids.values():
+            padded = np.pad(grid, 1, mode="edge")
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    if d_row or d_col:
+                        shifted = padded[1 + d_row : 1 + d_row + self.rows, 1 + d_col : 1 + d_col + self.cols]
+                        self.boundary |= shifted != grid
+        self.boundary = self._dilate(self.boundary)
+
+    @staticmethod
+    def _dilate(mask: np.ndarray) -> np.ndarray:
+        grown = mask.copy()
+        grown[1:, :] |= mask[:-1, :]
+        grown[:-1, :] |= mask[1:, :]
+        grown[:, 1:] |= grown[:, :-1].copy()
+        grown[:, :-1] |= grown[:, 1:].copy()
+        return grown
+
+    def _ring_mask(self, ring_index: int) -> tuple[slice, slice, np.ndarray] | None:
+        layer = self.layer
+        start, stop = layer.ring_edge_start[ring_index], layer.ring_edge_start[ring_index + 1]
+        if stop == start:
+            return None
+        min_x, min_y, max_x, max_y = layer.ring_bounds[ring_index]
+        row_lo = max(int(np.floor((min_y - self.min_y) / self.resolution)), 0)
+        row_hi = min(int(np.ceil((max_y - self.min_y) / self.resolution)) + 1, self.rows)
+        col_lo = max(int(np.floor((min_x - self.min_x) / self.resolution)), 0)
+        col_hi = min(int(np.ceil((max_x - self.min_x) / self.resolution)) + 1, self.cols)
+        if row_lo >= row_hi or col_lo >= col_hi:
+            return None
+
+        rows = slice(row_lo, row_hi)
+        cols = slice(col_lo, col_hi)
+        y = self.row_y[rows]
+        x1, y1 = layer.x1[start:stop], layer.y1[start:stop]
+        x2, y2 = layer.x2[start:stop], layer.y2[start:stop]
+
+        # A cell centre is inside when an odd number of crossings lie strictly
+        # to its right; toggle every cell left of each crossing via a prefix sum.
+        width = col_hi - col_lo
+        toggles = np.zeros((row_hi - row_lo, width + 1), dtype=np.int32)
+        for edges, row_ids in _crossing_pairs(y1, y2, y):
+            x_hits = (x2[edges] - x1[edges]) * (y[row_ids] - y1[edges]) / (y2[edges] - y1[edges]) + x1[edges]
+            first_outside = np.searchsorted(self.col_x[cols], x_hits, side="left")
+            np.add.at(toggles, (row_ids, 0), 1)
+            np.add.at(toggles, (row_ids, first_outside), -1)
+        inside = np.cumsum(toggles[:, :width], axis=1) % 2 == 1
+
+        self._mark_edges(start, stop)
+        return rows, cols, inside
+
+    def _mark_edges(self, start: int, stop: int) -> None:
+        # Flag every cell an edge passes through by sampling it at half-cell
+        # spacing; the later dilation covers the corners sampling can skip.
+        layer = self.layer
+        x1, y1 = layer.x1[start:stop], layer.y1[start:stop]
+        dx, dy = layer.x2[start:stop] - x1, layer.y2[start:stop] - y1
+        steps = np.ceil(np.hypot(dx, dy) / (self.resolution * 0.5)).astype(np.int64) + 1
+        edge = np.repeat(np.arange(stop - start), steps)
+        offsets = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+        fraction = offsets / np.repeat(steps, steps)
+        sample_rows = np.floor((y1[edge] + dy[edge] * fraction - self.min_y) / self.resolution).astype(np.int64)
+        sample_cols = np.floor((x1[edge] + dx[edge] * fraction - self.min_x) / self.resolution).astype(np.int64)
+        on_grid = (sample_rows >= 0) & (sample_rows < self.rows) & (sample_cols >= 0) & (sample_cols < self.cols)
+        self.boundary[sample_rows[on_grid], sample_cols[on_grid]] = True
+
+    def _feature_masks(self) -> Iterable[tuple[int, np.ndarray]]:
+        layer = self.layer
+        for feature_index in range(len(layer.features)):
+            feature_mask = None
+            for polygon_index in np.flatnonzero(layer.polygon_feature == feature_index):
+                polygon_mask = np.zeros((self.rows, self.cols), dtype=bool)
+                for ring_index in np.flatnonzero(layer.ring_polygon == polygon_index):
+                    ring = self._ring_mask(int(ring_index))
+                    if layer.ring_is_hole[ring_index]:
+                        if ring is not None:
+                            rows, cols, inside = ring
+                            polygon_mask[rows, cols] &= ~inside
+                    elif ring is not None:
+                        rows, cols, inside = ring
+                        polygon_mask[rows, cols] |= inside
+                feature_mask = polygon_mask if feature_mask is None else feature_mask | polygon_mask
+            if feature_mask is not None:
+                yield feature_index, feature_mask
+
+    def cell(self, lon: float, lat: float) -> tuple[int, int] | None:
+        col = int(np.floor((lon - self.min_x) / self.resolution))
+        row = int(np.floor((lat - self.min_y) / self.resolution))
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        return row, col
+
+    def lookup(self, name: str, lon: float, lat: float) -> int | None:
+        """Grid value at the point, or None when the exact test should decide."""
+        cell = self.cell(lon, lat)
+        if cell is None or self.boundary[cell]:
+            return None
+        return int(self.grids[name][cell])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(grid.nbytes for grid in self.grids.values()) + self.boundary.nbytes
+
+
+def _synthetic_outlook(features: int = 6, vertices: int = 2_000, seed: int = 0) -> dict:
+    # Nested, jagged risk areas like an SPC categorical layer: every feature is
+    # a MultiPolygon with a concave main area, a detached second area and, on
+    # the outer risk levels, a hole.
+    rng = np.random.default_rng(seed)
+    collection: dict = {"type": "FeatureCollection", "features": []}
+    for index in range(features):
+        radius = 9.0 - index * 1.3
+        angles = np.linspace(0, 2 * np.pi, vertices)
+        wobble = radius * (0.8 + 0.2 * np.sin(angles * (5 + index))) + rng.random(vertices) * 0.3
+        outer = np.column_stack((-96 + 1.4 * wobble * np.cos(angles), 37 + wobble * np.sin(angles)))
+        outer[-1] = outer[0]
+        polygon = [outer.round(4).tolist()]
+        if index < features - 2:
+            hole_angles = np.linspace(0, 2 * np.pi, max(vertices // 10, 4))
+            hole = np.column_stack((-96 + 0.6 * np.cos(hole_angles), 37 - radius * 0.55 + 0.4 * np.sin(hole_angles)))
+            hole[-1] = hole[0]
+            polygon.append(hole.round(4).tolist())
+        detached = np.column_stack((-83 + index * 0.4 + np.cos(angles[::8]), 30 + np.sin(angles[::8])))
+        detached[-1] = detached[0]
+        collection["features"].append(
+            {
+                "type": "Feature",
+                "geometry": {"type": "MultiPolygon", "coordinates": [polygon, [detached.round(4).tolist()]]},
+                "properties": {"dn": index + 2},
+            }
+        )
+    return collection
+
+
+def benchmark(geojson: dict, points: int = 500, repeat: int = 3, seed: int = 1) -> dict[str, float]:
+    """
+    Best wall time for ``points`` single-point queries against every feature.
+
+    "point_in_geometry" is the pure-Python ray cast from utils.spc run over
+    each feature, "prepare" is the one-time PreparedLayer build and
+    "contains" answers the same queries through the prepared arrays.
+    """
+    from utils.spc import point_in_geometry
+
+    rng = np.random.default_rng(seed)
+    lons = rng.uniform(-110, -78, points)
+    lats = rng.uniform(26, 48, points)
+    features = geojson.get("features", [])
+
+    def reference() -> None:
+        for lon, lat in zip(lons, lats):
+            for feature in features:
+                point_in_geometry(lon, lat, feature.get("geometry"))
+
+    layer = PreparedLayer(features)
+
+    def prepared() -> None:
+        for lon, lat in zip(lons, lats):
+            layer.contains(lon, lat)
+
+    candidates = {
+        "point_in_geometry": reference,
+        "prepare": lambda: PreparedLayer(features),
+        "contains": prepared,
+    }
+    results: dict[str, float] = {}
+    for name, run in candidates.items():
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+        results[name] = best
+    return results
+
+
+def benchmark_batch(
+    geojson: dict, sizes: tuple[int, ...] = (10, 1_000, 100_000), repeat: int = 3, seed: int = 1
+) -> dict[int, dict[str, float]]:
+    """Best wall time per batch size: a contains() loop against one contains_many() call."""
+    rng = np.random.default_rng(seed)
+    layer = PreparedLayer(geojson.get("features", []))
+    results: dict[int, dict[str, float]] = {}
+    for size in sizes:
+        lons = rng.uniform(-110, -78, size)
+        lats = rng.uniform(26, 48, size)
+        candidates = {
+            "contains_loop": lambda: [layer.contains(lon, lat) for lon, lat in zip(lons, lats)],
+            "contains_many": lambda: layer.contains_many(lons, lats),
+        }
+        results[size] = {}
+        for name, run in candidates.items():
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - started)
+            results[size][name] = best
+    return results
+
+
+if __name__ == "__main__":
+    # python -m utils.spc_geometry [saved_layer.geojson]
+    import sys
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as handle:
+            sample = json.loads(handle.read())
+    else:
+        sample = _synthetic_outlook()
+    edges = PreparedLayer(sample.get("features", [])).edge_count
+    print(f"layer: {len(sample.get('features', []))} features, {edges} edges")
+    for label, seconds in benchmark(sample).items():
+        print(f"{label:>18}: {seconds * 1000:9.1f} ms")
+    for size, timings in benchmark_batch(sample).items():
+        print(
+            f"{size:>7} points: contains loop {timings['contains_loop'] * 1000:9.1f} ms"
+            f"  contains_many {timings['contains_many'] * 1000:8.1f} ms"
+        )
@@ -4,7 +4,7 @@ from html import unescape
 from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
 import streamlit as st
-from utils.resilience import probe_url, request_text
+from utils.resilience import call_with_status, probe_url, request_text, unless_refreshing
 
 USER_AGENT = "Antonio Severe Dashboard (contact: mcelfreshantonio@ou.edu)"
 HEADERS = {
@@ -50,9 +50,12 @@ def _with_cache_bust(url: str, bucket: int | None = None) -> str:
     return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
 
 
+# The cached *_with_status functions raise RefreshingResult for values served
+# while a background refresh runs, so those are never memoized for a full TTL;
+# call them through call_with_status.
 @st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
-def _fetch_text(url: str) -> str:
-    text, _status = request_text(
+def _fetch_text_with_status(url: str) -> tuple[str, dict]:
+    text, status = request_text(
         url=url,
         headers=HEADERS,
         timeout=REQUEST_TIMEOUT,
@@ -60,12 +63,16 @@ def _fetch_text(url: str) -> str:
         source="NOAA/SPC outlook page",
         cache_key=f"spc:text:{url}",
     )
-    return text
+    return unless_refreshing(text, status)
+
+
+def _fetch_text(url: str) -> str:
+    return call_with_status(_fetch_text_with_status, url)[0]
 
 
 @st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
-def _is_image_available(url: str) -> bool:
-    available, _status = probe_url(
+def _image_available_with_status(url: str) -> tuple[bool, dict]:
+    available, status = probe_url(
         url=url,
         headers=IMAGE_HEADERS,
         timeout=REQUEST_TIMEOUT,
@@ -74,7 +81,7 @@ def _is_image_available(url: str) -> bool:
         cache_key=f"spc:image_probe:{url}",
         validator=lambda response: ((response.headers.get("Content-Type") or "").lower()).startswith("image/"),
     )
-    return available
+    return unless_refreshing(available, status)
 
 
 def _extract_print_page_url(day: int, html: str) -> str | None:
@@ -92,30 +99,34 @@ def _extract_print_image_url(day: int, html: str, base_url: str) -> str | None:
     return None
 
 
-def _resolve_print_fallback(day: int) -> str | None:
+def _resolve_print_fallback(day: int) -> tuple[str | None, dict | None]:
     page_url = OUTLOOK_PAGE_URLS[day]
     try:
         html = _fetch_text(page_url)
     except Exception:
-        return None
+        return None, None
 
     direct_from_page = _extract_print_image_url(day, html, page_url)
-    if direct_from_page and _is_image_available(direct_from_page):
-        return direct_from_page
+    if direct_from_page:
+        available, status = call_with_status(_image_available_with_status, direct_from_page)
+        if available:
+            return direct_from_page, status
 
     print_page_url = _extract_print_page_url(day, html)
     if not print_page_url:
-        return None
+        return None, None
 
     try:
         print_html = _fetch_text(print_page_url)
     except Exception:
-        return None
+        return None, None
 
     print_image_url = _extract_print_image_url(day, print_html, print_page_url)
-    if print_image_url and _is_image_available(print_image_url):
-        return print_image_url
-    return None
+    if print_image_url:
+        available, status = call_with_status(_image_available_with_status, print_image_url)
+        if available:
+            return print_image_url, status
+    return None, None
 
 
 def _strip_tags(raw_html: str) -> str:
@@ -201,57 +212,68 @@ def _extract_detail_maps(day: int, html: str, base_url: str) -> list[dict]:
     return maps
 
 
-def _resolve_day_1_3_image(day: int) -> str | None:
+def get_day1_3_categorical_image_with_status(day: int) -> tuple[str | None, dict]:
+    """Image URL for a Day 1-3 categorical outlook plus the status of the probe that found it."""
     bucket = int(time.time() // CACHE_TTL_SECONDS)
     partner_url = f"{PARTNERS_BASE}/swody{day}.png"
-    if _is_image_available(partner_url):
-        return _with_cache_bust(partner_url, bucket)
+    available, status = call_with_status(_image_available_with_status, partner_url)
+    if available:
+        return _with_cache_bust(partner_url, bucket), status
 
-    fallback_url = _resolve_print_fallback(day)
+    fallback_url, fallback_status = _resolve_print_fallback(day)
     if fallback_url:
-        return _with_cache_bust(fallback_url, bucket)
-    return None
+        return _with_cache_bust(fallback_url, bucket), fallback_status or status
+    return None, status
 
 
 def get_day1_categorical_image_url() -> str | None:
-    return _resolve_day_1_3_image(1)
+    return get_day1_3_categorical_image_with_status(1)[0]
 
 
 def get_day2_categorical_image_url() -> str | None:
-    return _resolve_day_1_3_image(2)
+    return get_day1_3_categorical_image_with_status(2)[0]
 
 
 def get_day3_categorical_image_url() -> str | None:
-    return _resolve_day_1_3_image(3)
+    return get_day1_3_categorical_image_with_status(3)[0]
 
 
-def get_day4_8_prob_image_url(day: int) -> str | None:
+def get_day4_8_prob_image_with_status(day: int) -> tuple[str | None, dict]:
     if day < 4 or day > 8:
         raise ValueError("day must be between 4 and 8")
 
     bucket = int(time.time() // CACHE_TTL_SECONDS)
     image_url = f"{DAY4_8_IMAGE_BASE}/day{day}prob.gif"
-    if _is_image_available(image_url):
-        return _with_cache_bust(image_url, bucket)
-    return None
+    available, status = call_with_status(_image_available_with_status, image_url)
+    if available:
+        return _with_cache_bust(image_url, bucket), status
+    return None, status
+
+
+def get_day4_8_prob_image_url(day: int) -> str | None:
+    return get_day4_8_prob_image_with_status(day)[0]
 
 
 @st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
-def get_day1_3_detail_payload(day: int) -> dict:
+def _day1_3_detail_payload_with_status(day: int) -> tuple[dict, dict]:
     if day not in OUTLOOK_PAGE_URLS:
         raise ValueError("day must be 1, 2, or 3")
 
     page_url = OUTLOOK_PAGE_URLS[day]
-    page_html = _fetch_text(page_url)
+    page_html, status = call_with_status(_fetch_text_with_status, page_url)
     print_page_url = _extract_print_page_url(day, page_html) or page_url
-    print_html = _fetch_text(print_page_url) if print_page_url != page_url else page_html
+    print_html = page_html
+    if print_page_url != page_url:
+        print_html, print_status = call_with_status(_fetch_text_with_status, print_page_url)
+        if print_status.get("status") != "live":
+            status = print_status
 
     maps = _extract_detail_maps(day, print_html, print_page_url)
     discussion = _extract_discussion_text(print_html)
     updated = _extract_updated_text(page_html) or _extract_updated_text(print_html)
     valid_period = _extract_valid_text(discussion)
 
-    return {
+    payload = {
         "day": day,
         "title": f"Day {day} Severe Weather Details",
         "page_url": page_url,
@@ -261,3 +283,8 @@ def get_day1_3_detail_payload(day: int) -> dict:
         "maps": maps,
         "discussion": discussion,
     }
+    return unless_refreshing(payload, status)
+
+
+def get_day1_3_detail_payload(day: int) -> dict:
+    return call_with_status(_day1_3_detail_payload_with_status, day)[0]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from html import escape
 from typing import Any, Dict, List, Optional
 
@@ -7,6 +8,12 @@ import streamlit as st
 
 from utils.nws_alerts import get_cached_severe_alerts_payload
 
+# How often the live ticker re-reads the alert poller's snapshot. Only the
+# ticker fragment reruns, so this costs a memory read, not a page rerun.
+TICKER_REFRESH_SECONDS = float(os.getenv("TICKER_REFRESH_SECONDS", "5"))
+
+fragment_api = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
 
 def _event_css_class(event: str) -> str:
     mapping = {
@@ -52,11 +59,31 @@ def _inject_pds_outbreak(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 
 def render_severe_ticker(alerts: Optional[List[Dict[str, Any]]] = None) -> None:
-    """Render severe-only nationwide ticker with color-coded alert pills."""
-    had_error = False
-    if alerts is None:
-        alerts, had_error = get_cached_severe_alerts_payload()
+    """Render severe-only nationwide ticker with color-coded alert pills.
+
+    Without explicit alerts the ticker follows the live feed: it runs as a
+    fragment that reruns on its own every TICKER_REFRESH_SECONDS, so new
+    warnings show up within seconds without rerunning the rest of the page.
+    """
+    if alerts is not None:
+        _render_ticker(alerts, had_error=False)
+    elif fragment_api is not None:
+        _live_severe_ticker()
+    else:
+        _render_live_ticker()
+
+
+def _render_live_ticker() -> None:
+    alerts, had_error = get_cached_severe_alerts_payload()
+    _render_ticker(alerts, had_error=had_error)
+
+
+_live_severe_ticker = (
+    fragment_api(run_every=TICKER_REFRESH_SECONDS)(_render_live_ticker) if fragment_api is not None else _render_live_ticker
+)
+
 
+def _render_ticker(alerts: List[Dict[str, Any]], *, had_error: bool) -> None:
     if had_error:
         fallback = [{
             "event": "Fallback",
@@ -781,6 +781,11 @@ def summarize_freshness(status: dict | None, *, fallback: str) -> str:
         if cached_at:
             return f"Last updated: {cached_at}. Live refresh failed, so cached data is shown."
         return "Live refresh failed, so cached data is shown."
+    if status.get("status") == "refreshing":
+        cached_at = status.get("cached_at")
+        if cached_at:
+            return f"Last updated: {cached_at}. Refreshing in the background."
+        return "Showing recent data while it refreshes in the background."
     if status.get("status") == "unavailable":
         error = status.get("error_message")
         if error: